@@ -9,17 +9,21 @@ from .exceptions import (
     FlaskReactError,
     JavaScriptEngineError,
     RenderError,
+    RenderTimeoutError,
 )
 from .extension import FlaskReact
 from .node_renderer import NodeRenderer
+from .socket_renderer import SocketRenderer
 
 __version__ = "0.1.3"
 __all__ = [
     "FlaskReact",
     "NodeRenderer",
+    "SocketRenderer",
     "FlaskReactError",
     "ComponentNotFoundError",
     "RenderError",
+    "RenderTimeoutError",
     "JavaScriptEngineError",
     "ComponentCompileError",
 ]
@@ -0,0 +1,633 @@
+"""
+Asyncio transports for Flask-React extension.
+Lets async views keep many renders in flight without a thread per render.
+"""
+
+import abc
+import asyncio
+import json
+import os
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import JavaScriptEngineError, RenderError
+from .node_worker import _FRAME_HEADER, WaitTracker, WorkerLimits, encode_frame
+
+
+class _Channel:
+    """Pipelined framed requests over an asyncio stream pair.
+
+    Every request is written as soon as it is made and its response is
+    matched by id, so many requests can share one worker or connection.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: Any,
+        closed_error: Callable[[], Awaitable[Exception]],
+    ):
+        """
+        Initialize the channel and start dispatching responses.
+
+        Args:
+            reader: Stream the responses arrive on
+            writer: Stream the requests are written to
+            closed_error: Coroutine describing why the reader reached its end
+        """
+        self._reader = reader
+        self._writer = writer
+        self._closed_error = closed_error
+        self._pending: Dict[int, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._next_id = 0
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for their response."""
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the response stream has ended."""
+        return self._dispatcher.done()
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a message and wait for its response."""
+        return await self.submit(message)
+
+    def submit(self, message: Dict[str, Any]) -> Awaitable[Dict[str, Any]]:
+        """Write a message right away, returning an awaitable of its response."""
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        # Checked after registering, so the dispatcher either fails the
+        # future on its way out or has already finished
+        if self.closed:
+            self._pending.pop(request_id, None)
+            raise self._dispatcher.result()
+
+        self._writer.write(encode_frame(dict(message, id=request_id)))
+        return self._response(request_id, future)
+
+    async def _response(
+        self, request_id: int, future: "asyncio.Future[Dict[str, Any]]"
+    ) -> Dict[str, Any]:
+        """Wait for the response of a submitted message."""
+        try:
+            try:
+                await self._writer.drain()
+            except OSError:
+                pass  # The dispatcher reports why the other end went away
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _dispatch(self) -> Exception:
+        """Resolve pending requests with their responses until the stream ends."""
+        try:
+            while True:
+                header = await self._reader.readexactly(_FRAME_HEADER.size)
+                (length,) = _FRAME_HEADER.unpack(header)
+                response = json.loads(await self._reader.readexactly(length))
+                future = self._pending.get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (asyncio.IncompleteReadError, OSError, ValueError):
+            pass
+
+        self._writer.close()
+        error = await self._closed_error()
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(error)
+        return error
+
+    def close(self):
+        """Close the request stream."""
+        self._writer.close()
+
+    async def wait_closed(self):
+        """Wait until pending requests have been resolved or failed."""
+        await asyncio.wait([self._dispatcher])
+
+    async def wait_idle(self):
+        """Wait until every request pending now was answered or given up."""
+        pending = list(self._pending.values())
+        if pending:
+            await asyncio.wait(pending)
+
+
+class _AsyncTransport(abc.ABC):
+    """Base for transports that run on a private event loop thread.
+
+    Pipes and sockets belong to the event loop that opened them, while async
+    Flask views get a fresh loop for every request. Keeping the transport on
+    its own loop lets callers on any loop share the same warm workers.
+    """
+
+    #: Number of workers or connections requests are spread over
+    size: int
+
+    def __init__(self):
+        self._loop_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._owner_pid: Optional[int] = None
+        self._in_flight = WaitTracker()
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests in flight beyond one per worker or connection."""
+        return max(self._in_flight.count - self.size, 0)
+
+    @property
+    def longest_wait(self) -> float:
+        """Seconds the longest of those requests has been in flight."""
+        return self._in_flight.longest(skip=self.size)
+
+    @abc.abstractmethod
+    def _reset(self):
+        """Forget all workers or connections."""
+
+    @abc.abstractmethod
+    async def _request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a message from the private event loop."""
+
+    @abc.abstractmethod
+    async def _close(self):
+        """Close all workers or connections from the private event loop."""
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the private event loop, starting its thread on first use."""
+        with self._loop_lock:
+            # The loop thread of a forked parent does not run in the child
+            if self._loop is None or self._owner_pid != os.getpid():
+                self._reset()
+                self._owner_pid = os.getpid()
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._run_loop,
+                    args=(self._loop,),
+                    name="flask-react-aio",
+                    daemon=True,
+                ).start()
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        """Run the private event loop until close() stops it."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a message and wait for its response without blocking the caller's loop.
+
+        Args:
+            message: JSON-serializable message for ssr_server.js
+            timeout: Seconds to wait for the response
+
+        Returns:
+            Decoded response message
+
+        Raises:
+            subprocess.TimeoutExpired: If no response arrives in time
+        """
+        with self._in_flight.wait():
+            future = asyncio.run_coroutine_threadsafe(
+                self._request(message, timeout), self._get_loop()
+            )
+            return await asyncio.wrap_future(future)
+
+    @abc.abstractmethod
+    async def _broadcast(self, message: Dict[str, Any], timeout: float):
+        """Send a message to every running worker from the private event loop."""
+
+    def broadcast(self, message: Dict[str, Any], timeout: float):
+        """
+        Send a message to every running worker, blocking until it is delivered.
+
+        Nothing is sent before the transport has been used.
+        """
+        with self._loop_lock:
+            if self._loop is None or self._owner_pid != os.getpid():
+                return
+            loop = self._loop
+
+        asyncio.run_coroutine_threadsafe(
+            self._broadcast(message, timeout), loop
+        ).result()
+
+    def close(self):
+        """Close all workers or connections and stop the private event loop."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+            if loop is None or self._owner_pid != os.getpid():
+                return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=5)
+        except Exception:
+            pass  # Ignore cleanup errors
+        loop.call_soon_threadsafe(loop.stop)
+
+
+class AsyncNodeWorker:
+    """A long-lived ssr_server.js process driven over asyncio pipes."""
+
+    def __init__(
+        self,
+        script_path: Path,
+        node_executable: str = "node",
+        cache_enabled: bool = True,
+        cwd: Optional[str] = None,
+        script_args: Sequence[str] = (),
+        limits: Optional[WorkerLimits] = None,
+    ):
+        """
+        Initialize the worker. The Node.js process is started on first use.
+
+        Args:
+            script_path: Path to the ssr_server.js script
+            node_executable: Path to Node.js executable
+            cache_enabled: Whether Node.js should keep required modules cached
+            cwd: Working directory for the Node.js process
+            script_args: Extra arguments for ssr_server.js
+            limits: Limits after which the process is replaced
+        """
+        self.script_path = Path(script_path)
+        self.node_executable = node_executable
+        self.cache_enabled = cache_enabled
+        self.cwd = cwd
+        self.script_args = list(script_args)
+        self.limits = limits or WorkerLimits()
+        # Number of processes replaced for reaching a limit
+        self.recycled = 0
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._channel: Optional[_Channel] = None
+        self._requests = 0
+        # Recycled processes still answering their in-flight requests
+        self._draining: List[Tuple[asyncio.subprocess.Process, _Channel]] = []
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id of the running Node.js worker, if any."""
+        return self._process.pid if self._process is not None else None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for their response."""
+        return self._channel.in_flight if self._channel is not None else 0
+
+    def is_alive(self) -> bool:
+        """Check whether the Node.js process is running."""
+        return (
+            self._channel is not None
+            and not self._channel.closed
+            and self._process.returncode is None
+        )
+
+    def _args(self) -> List[str]:
+        """Command line of the Node.js worker."""
+        args = [self.node_executable, *self.limits.node_args()]
+        args.extend([str(self.script_path), "--worker"])
+        if not self.cache_enabled:
+            args.append("--no-cache")
+        args.extend(self.script_args)
+        return args
+
+    async def start(self):
+        """Start the Node.js worker process."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._args(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.cwd,
+            )
+        except OSError as e:
+            raise JavaScriptEngineError(f"Failed to start Node.js worker: {str(e)}")
+
+        stderr: deque = deque(maxlen=100)
+        stderr_reader = asyncio.ensure_future(self._read_stderr(process, stderr))
+
+        async def exit_error() -> Exception:
+            try:
+                returncode = await asyncio.wait_for(process.wait(), 5)
+            except asyncio.TimeoutError:
+                returncode = None
+            await asyncio.wait([stderr_reader], timeout=1)
+            details = "".join(stderr).strip() or "Unknown Node.js error"
+            return RenderError(
+                f"Node.js worker exited unexpectedly: {details}. "
+                f"Return code: {returncode}"
+            )
+
+        self._process = process
+        self._channel = _Channel(process.stdout, process.stdin, exit_error)
+        self._requests = 0
+
+    def stop(self):
+        """Kill the Node.js worker process, failing its pending requests."""
+        # Detach first: the process looks alive until its exit is noticed
+        process, self._process = self._process, None
+        self._channel = None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+    def _recycle(self):
+        """Send new requests to a fresh process while the old one drains."""
+        self.recycled += 1
+        self._drain()
+
+    def _drain(self):
+        """Detach the running process, letting it answer its in-flight requests."""
+        process, channel = self._process, self._channel
+        self._process = None
+        self._channel = None
+
+        # ssr_server.js answers what it has read, then exits when stdin closes
+        channel.close()
+        self._draining = [
+            (old_process, old_channel)
+            for old_process, old_channel in self._draining
+            if not old_channel.closed
+        ]
+        self._draining.append((process, channel))
+
+    async def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a message to the worker and wait for its response.
+
+        Raises:
+            subprocess.TimeoutExpired: If no response arrives in time
+            RenderError: If the worker process dies
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        submitted = None
+        try:
+            submitted = await asyncio.wait_for(self._submit(message), timeout)
+            process, channel, response = submitted
+            return await asyncio.wait_for(response, max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            # Only this request fails, others may be in flight on the process
+            if submitted is not None:
+                self._retire(submitted[0], submitted[1])
+            raise subprocess.TimeoutExpired(self._args(), timeout)
+
+    def _retire(self, process: asyncio.subprocess.Process, channel: _Channel):
+        """
+        Replace a process that may be stuck in a render.
+
+        New requests go to a fresh process right away. The old one answers
+        its other in-flight requests, if it can, and is killed once they are
+        all answered or timed out.
+        """
+        if process is self._process:
+            self._drain()
+        asyncio.ensure_future(self._kill_when_idle(process, channel))
+
+    @staticmethod
+    async def _kill_when_idle(process: asyncio.subprocess.Process, channel: _Channel):
+        """Kill a retired process once none of its requests is waiting."""
+        await channel.wait_idle()
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _submit(
+        self, message: Dict[str, Any]
+    ) -> Tuple[asyncio.subprocess.Process, _Channel, Awaitable[Dict[str, Any]]]:
+        """Write a message to the running process, replacing it if needed.
+
+        The process is restarted if it died and recycled if it reached a
+        limit. Messages are written under the lock, so a recycled process
+        has received every message sent to it before its stdin is closed.
+        """
+        async with self._start_lock:
+            if not self.is_alive():
+                self.stop()
+                await self.start()
+            elif self.limits.exceeded(self._requests, self._process.pid):
+                self._recycle()
+                await self.start()
+            self._requests += 1
+            return self._process, self._channel, self._channel.submit(message)
+
+    async def close(self):
+        """Stop the Node.js worker process and wait for it to exit."""
+        process, channel = self._process, self._channel
+        self.stop()
+        draining, self._draining = self._draining, []
+        for old_process, _ in draining:
+            if old_process.returncode is None:
+                old_process.kill()
+        if process is not None:
+            await process.wait()
+        channels = [channel] + [old_channel for _, old_channel in draining]
+        for each in channels:
+            if each is not None:
+                await each.wait_closed()
+
+    @staticmethod
+    async def _read_stderr(process: asyncio.subprocess.Process, lines: deque):
+        """Keep the tail of the worker's stderr for error reporting."""
+        try:
+            async for line in process.stderr:
+                lines.append(line.decode("utf-8", errors="replace"))
+        except (OSError, ValueError):
+            pass
+
+
+class AsyncNodeWorkerPool(_AsyncTransport):
+    """A fixed-size pool of AsyncNodeWorker processes."""
+
+    def __init__(
+        self,
+        script_path: Path,
+        size: Optional[int] = None,
+        node_executable: str = "node",
+        cache_enabled: bool = True,
+        cwd: Optional[str] = None,
+        script_args: Sequence[str] = (),
+        limits: Optional[WorkerLimits] = None,
+    ):
+        """
+        Initialize the pool. Workers are started on first use.
+
+        Args:
+            script_path: Path to the ssr_server.js script
+            size: Number of workers, defaults to the CPU count
+            node_executable: Path to Node.js executable
+            cache_enabled: Whether Node.js should keep required modules cached
+            cwd: Working directory for the Node.js processes
+            script_args: Extra arguments for ssr_server.js
+            limits: Limits after which a worker's process is replaced
+        """
+        super().__init__()
+        self.script_path = Path(script_path)
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.node_executable = node_executable
+        self.cache_enabled = cache_enabled
+        self.cwd = cwd
+        self.script_args = list(script_args)
+        self.limits = limits
+        self._workers: List[AsyncNodeWorker] = []
+
+    def _reset(self):
+        """Create fresh workers owned by this process."""
+        self._workers = [
+            AsyncNodeWorker(
+                self.script_path,
+                node_executable=self.node_executable,
+                cache_enabled=self.cache_enabled,
+                cwd=self.cwd,
+                script_args=self.script_args,
+                limits=self.limits,
+            )
+            for _ in range(self.size)
+        ]
+
+    @property
+    def workers(self) -> List[AsyncNodeWorker]:
+        """All workers in the pool."""
+        return list(self._workers)
+
+    async def _request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a message to the least busy worker."""
+        # Ties go to the first worker, so under light load the rest stay unstarted
+        worker = min(self._workers, key=lambda worker: worker.in_flight)
+        return await worker.request(message, timeout)
+
+    async def _broadcast(self, message: Dict[str, Any], timeout: float):
+        """Send a message to every running worker."""
+        requests = [
+            worker.request(message, timeout)
+            for worker in self._workers
+            if worker.is_alive()
+        ]
+        # A replaced worker starts with fresh modules too
+        await asyncio.gather(*requests, return_exceptions=True)
+
+    async def _close(self):
+        """Stop all worker processes."""
+        for worker in self._workers:
+            await worker.close()
+
+
+class AsyncSocketClient(_AsyncTransport):
+    """Multiplexed asyncio connections to the SSR daemon's Unix socket."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        size: Optional[int] = None,
+        connect_timeout: float = 5,
+    ):
+        """
+        Initialize the client. Connections are opened on first use.
+
+        Args:
+            socket_path: Path of the daemon's Unix domain socket
+            size: Maximum number of open connections
+            connect_timeout: Seconds to wait when connecting
+        """
+        super().__init__()
+        self.socket_path = str(socket_path)
+        self.size = max(1, size or 4)
+        self.connect_timeout = connect_timeout
+        self._connections: List[_Channel] = []
+        self._connect_lock = asyncio.Lock()
+
+    def _reset(self):
+        """Forget all connections."""
+        self._connections = []
+        self._connect_lock = asyncio.Lock()
+
+    async def _request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a message over the least busy connection."""
+        # The daemon kills a worker still busy with the message after this
+        message = dict(message, timeoutMs=round(timeout * 1000))
+        try:
+            return await asyncio.wait_for(self._send(message), timeout)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(["ssr-server", self.socket_path], timeout)
+
+    async def _send(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a message, retrying once if the connection was dropped."""
+        for attempt in range(2):
+            channel = await self._get_channel()
+            try:
+                return await channel.request(message)
+            except OSError as e:
+                # Renders have no side effects, so a fresh connection may retry
+                if attempt:
+                    raise JavaScriptEngineError(
+                        f"Lost connection to SSR server at {self.socket_path}: {str(e)}"
+                    )
+        raise JavaScriptEngineError(f"SSR server at {self.socket_path} unavailable")
+
+    async def _get_channel(self) -> _Channel:
+        """Pick an idle connection, opening another while below the size limit."""
+        async with self._connect_lock:
+            self._connections = [
+                channel for channel in self._connections if not channel.closed
+            ]
+            channel = min(
+                self._connections, key=lambda channel: channel.in_flight, default=None
+            )
+            if channel is not None and (
+                not channel.in_flight or len(self._connections) >= self.size
+            ):
+                return channel
+
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_unix_connection(self.socket_path), self.connect_timeout
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                raise JavaScriptEngineError(
+                    f"Cannot connect to SSR server at {self.socket_path}: {str(e)}"
+                )
+
+            channel = _Channel(reader, writer, self._connection_closed)
+            self._connections.append(channel)
+            return channel
+
+    async def _broadcast(self, message: Dict[str, Any], timeout: float):
+        """Send a message the daemon relays to all of its workers."""
+        if self._connections:
+            try:
+                await self._request(message, timeout)
+            except (JavaScriptEngineError, subprocess.TimeoutExpired):
+                pass  # A daemon that is down starts with fresh modules
+
+    @staticmethod
+    async def _connection_closed() -> Exception:
+        return ConnectionResetError("SSR daemon closed the connection")
+
+    async def _close(self):
+        """Close all connections."""
+        for channel in self._connections:
+            channel.close()
+        for channel in self._connections:
+            await channel.wait_closed()
+        self._connections = []
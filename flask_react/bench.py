@@ -0,0 +1,464 @@
+"""
+Render benchmarks for Flask-React extension.
+Times components across renderer backends, props sizes, caching and concurrency.
+
+Run from a checkout with the Node.js dependencies installed:
+
+    python -m flask_react.bench --output bench.json
+
+Results are written as JSON so runs can be compared between releases.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import __version__
+from .exceptions import JavaScriptEngineError
+from .index import ComponentIndex
+from .metrics import QUANTILES, percentile
+from .node_renderer import NodeRenderer
+from .socket_renderer import SocketRenderer
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_COMPONENTS_DIR = PROJECT_ROOT / "examples" / "components"
+
+# "node" is the persistent worker pool, "oneshot" a process per render and
+# "socket" a shared SSR daemon started for the run
+BACKENDS = ("node", "oneshot", "socket")
+
+_CATEGORIES = ("Electronics", "Furniture", "Education")
+
+
+def _users(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"User {i}",
+            "email": f"user{i}@example.com",
+            "role": "admin" if i % 5 == 1 else "user",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _products(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"Product {i}",
+            "price": round(9.99 + i, 2),
+            "category": _CATEGORIES[i % len(_CATEGORIES)],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _fields(count: int) -> List[Dict[str, Any]]:
+    types = ("text", "email", "textarea")
+    return [
+        {
+            "name": f"field{i}",
+            "type": types[i % len(types)],
+            "label": f"Field {i}",
+            "required": i % 2 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+# Props for each example component, with lists of `size` items. Components
+# without list props get `size` times longer text instead. The data is fixed
+# so that runs are comparable.
+EXAMPLE_PROPS: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "HomePage": lambda size: {
+        "title": "Welcome to Flask-React",
+        "subtitle": "Server-side React rendering with Flask",
+        "features": [f"Feature {i}" for i in range(size)],
+    },
+    "UserList": lambda size: {
+        "users": _users(size),
+        "current_user": {"id": 1, "name": "User 1", "role": "admin"},
+        "can_edit": True,
+        "page_title": "User Management",
+    },
+    "UserProfile": lambda size: {
+        "user": dict(_users(1)[0], bio="Writes components. " * size),
+        "current_user": {"id": 1, "role": "admin"},
+        "is_own_profile": True,
+        "can_edit": True,
+    },
+    "ProductList": lambda size: {
+        "products": _products(size),
+        "categories": list(_CATEGORIES),
+        "current_category": None,
+        "search_query": "",
+        "total_products": size,
+        "filtered_count": size,
+    },
+    "Dashboard": lambda size: {
+        "current_user": {"id": 1, "name": "User 1", "role": "admin"},
+        "stats": {
+            "total_users": size,
+            "total_products": size,
+            "admin_users": (size + 4) // 5,
+            "categories": len(_CATEGORIES),
+        },
+        "recent_users": _users(size),
+        "recent_products": _products(size),
+        "is_admin": True,
+    },
+    "ContactForm": lambda size: {"title": "Contact Us", "fields": _fields(size)},
+    "NotFound": lambda size: {"message": "Page not found. " * size},
+}
+
+
+def make_props(component_name: str, size: int) -> Dict[str, Any]:
+    """Build benchmark props for a component, with `size` list items."""
+    builder = EXAMPLE_PROPS.get(component_name)
+    if builder is None:
+        return {"items": [{"id": i, "label": f"Item {i}"} for i in range(size)]}
+    return builder(size)
+
+
+def available_backends() -> List[str]:
+    """Renderer backends that can run on this platform."""
+    # The SSR daemon listens on a Unix domain socket
+    return [
+        backend
+        for backend in BACKENDS
+        if backend != "socket" or hasattr(socket, "AF_UNIX")
+    ]
+
+
+@contextmanager
+def ssr_daemon(workers: int, node_executable: str = "node") -> Iterator[str]:
+    """Run an SSR daemon on a temporary socket, yielding the socket path."""
+    directory = tempfile.mkdtemp(prefix="flask-react-bench-")
+    socket_path = os.path.join(directory, "ssr.sock")
+    command = [
+        node_executable,
+        str(Path(__file__).parent / "ssr_server.js"),
+        "--socket",
+        socket_path,
+        "--workers",
+        str(workers),
+    ]
+    process = subprocess.Popen(
+        command,
+        cwd=str(PROJECT_ROOT),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(socket_path):
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise JavaScriptEngineError("SSR server did not start")
+            time.sleep(0.05)
+        yield socket_path
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _timed_render(
+    renderer: NodeRenderer, component_name: str, props: Dict[str, Any]
+) -> Tuple[float, Optional[str]]:
+    """Render once, returning the wall time and the error message if it failed."""
+    started = time.perf_counter()
+    try:
+        renderer.render_component(component_name, props)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return time.perf_counter() - started, error
+
+
+def _summarize(
+    samples: Sequence[Tuple[float, Optional[str]]], wall_seconds: float
+) -> Dict[str, Any]:
+    """Latency percentiles, throughput and errors of a set of timed renders."""
+    ordered = sorted(seconds for seconds, _ in samples)
+    errors = [error for _, error in samples if error is not None]
+    return {
+        "iterations": len(samples),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "latency_ms": {
+            "mean": sum(ordered) * 1000 / len(ordered) if ordered else 0.0,
+            "min": ordered[0] * 1000 if ordered else 0.0,
+            "max": ordered[-1] * 1000 if ordered else 0.0,
+            **{
+                f"p{int(quantile * 100)}": percentile(ordered, quantile) * 1000
+                for quantile in QUANTILES
+            },
+        },
+        "throughput_per_s": len(samples) / wall_seconds if wall_seconds else 0.0,
+    }
+
+
+def _bench_component(
+    renderer: NodeRenderer,
+    component_name: str,
+    sizes: Sequence[int],
+    iterations: int,
+    concurrency: int,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the cold, sequential and concurrent results of one component."""
+    # The first render on a fresh renderer pays for starting Node.js and
+    # compiling the component
+    props = make_props(component_name, sizes[0])
+    sample = _timed_render(renderer, component_name, props)
+    yield dict(
+        _summarize([sample], sample[0]),
+        mode="cold",
+        props_items=sizes[0],
+        props_bytes=len(json.dumps(props)),
+    )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for size in sizes:
+            props = make_props(component_name, size)
+            details = {"props_items": size, "props_bytes": len(json.dumps(props))}
+
+            def render_all(count: int) -> List[Tuple[float, Optional[str]]]:
+                return list(
+                    executor.map(
+                        lambda _: _timed_render(renderer, component_name, props),
+                        range(count),
+                    )
+                )
+
+            # Start every pool worker and, with caching on, fill the cache so
+            # that timed renders are all warm
+            render_all(concurrency)
+
+            started = time.perf_counter()
+            samples = [
+                _timed_render(renderer, component_name, props)
+                for _ in range(iterations)
+            ]
+            wall_seconds = time.perf_counter() - started
+            yield dict(_summarize(samples, wall_seconds), mode="sequential", **details)
+
+            started = time.perf_counter()
+            samples = render_all(iterations)
+            wall_seconds = time.perf_counter() - started
+            yield dict(_summarize(samples, wall_seconds), mode="concurrent", **details)
+
+
+def _create_renderer(
+    backend: str,
+    components_dir: Path,
+    cache: bool,
+    concurrency: int,
+    node_executable: str,
+    socket_path: Optional[str],
+) -> NodeRenderer:
+    """Create a fresh renderer for a backend."""
+    if backend == "socket":
+        return SocketRenderer(
+            components_dir=str(components_dir),
+            socket_path=socket_path,
+            cache_enabled=cache,
+            pool_size=concurrency,
+        )
+    return NodeRenderer(
+        components_dir=str(components_dir),
+        cache_enabled=cache,
+        node_executable=node_executable,
+        persistent=backend == "node",
+        pool_size=concurrency,
+    )
+
+
+def _node_version(node_executable: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            [node_executable, "--version"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(
+    components_dir: Path = DEFAULT_COMPONENTS_DIR,
+    components: Optional[Sequence[str]] = None,
+    backends: Optional[Sequence[str]] = None,
+    sizes: Sequence[int] = (1, 10, 100),
+    iterations: int = 20,
+    concurrency: int = 4,
+    node_executable: str = "node",
+    log: Callable[[str], None] = lambda message: None,
+) -> Dict[str, Any]:
+    """
+    Benchmark rendering every component on every backend.
+
+    Each component gets a fresh renderer per backend and cache setting, so
+    its first render is cold. Then it is rendered `iterations` times per
+    props size, one render at a time and from `concurrency` threads.
+
+    Args:
+        components_dir: Directory containing the components
+        components: Names of the components to render, defaults to all
+        backends: Renderer backends to compare, defaults to all available
+        sizes: Numbers of list items in the props
+        iterations: Timed renders per component, size and mode
+        concurrency: Threads rendering at once, and the pool size
+        node_executable: Path to Node.js executable
+        log: Called with a progress message before each component
+
+    Returns:
+        Environment details under "meta" and one entry per measurement
+        under "results"
+    """
+    components_dir = Path(components_dir)
+    backends = list(backends or available_backends())
+    sizes = list(sizes)
+    if components is None:
+        components = ComponentIndex(components_dir).names()
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "flask_react": __version__,
+            "python": platform.python_version(),
+            "node": _node_version(node_executable),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "components_dir": str(components_dir),
+            "sizes": sizes,
+            "iterations": iterations,
+            "concurrency": concurrency,
+        },
+        "results": [],
+    }
+
+    for backend in backends:
+        with _backend_socket(backend, concurrency, node_executable) as socket_path:
+            for component_name in components:
+                for cache in (False, True):
+                    log(f"{backend} {component_name} cache={'on' if cache else 'off'}")
+                    renderer = _create_renderer(
+                        backend,
+                        components_dir,
+                        cache,
+                        concurrency,
+                        node_executable,
+                        socket_path,
+                    )
+                    try:
+                        for result in _bench_component(
+                            renderer, component_name, sizes, iterations, concurrency
+                        ):
+                            report["results"].append(
+                                dict(
+                                    backend=backend,
+                                    component=component_name,
+                                    cache=cache,
+                                    **result,
+                                )
+                            )
+                    finally:
+                        renderer.close()
+    return report
+
+
+@contextmanager
+def _backend_socket(
+    backend: str, workers: int, node_executable: str
+) -> Iterator[Optional[str]]:
+    """Start the SSR daemon for the socket backend."""
+    if backend != "socket":
+        yield None
+        return
+    with ssr_daemon(workers, node_executable) as socket_path:
+        yield socket_path
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m flask_react.bench",
+        description="Benchmark Flask-React server-side rendering",
+    )
+    parser.add_argument(
+        "--dir",
+        default=str(DEFAULT_COMPONENTS_DIR),
+        help="Components directory (default: examples/components)",
+    )
+    parser.add_argument(
+        "--component",
+        action="append",
+        default=None,
+        help="Component to render (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=BACKENDS,
+        default=None,
+        help="Renderer backend (repeatable, default: all available)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_int_list,
+        default=[1, 10, 100],
+        help="Comma-separated numbers of list items in the props",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=20, help="Timed renders per measurement"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Threads for concurrent renders"
+    )
+    parser.add_argument("--node", default="node", help="Node.js executable")
+    parser.add_argument(
+        "--output", default=None, help="Write JSON results here instead of stdout"
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        components_dir=Path(args.dir),
+        components=args.component,
+        backends=args.backend,
+        sizes=args.sizes,
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        node_executable=args.node,
+        log=lambda message: print(message, file=sys.stderr),
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
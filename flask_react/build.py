@@ -0,0 +1,228 @@
+"""
+Ahead-of-time component compilation for Flask-React extension.
+Compiles JSX/TSX components to plain CommonJS so workers never load Babel.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import ComponentCompileError
+from .index import COMPONENT_EXTENSIONS
+
+DEFAULT_PRESETS = ["@babel/preset-react"]
+MANIFEST_NAME = "manifest.json"
+
+
+def _source_hash(source: Path, presets: Sequence[Any]) -> str:
+    """Hash a component's source together with the presets that compile it."""
+    digest = hashlib.sha256(json.dumps(list(presets)).encode("utf-8"))
+    digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_manifest(out_dir: Path) -> Dict[str, str]:
+    """Load the source hashes recorded by the previous build."""
+    try:
+        with open(out_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(out_dir: Path, manifest: Dict[str, str]):
+    """Atomically replace the build manifest."""
+    temp_path = out_dir / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, out_dir / MANIFEST_NAME)
+
+
+def _compile_chunk(
+    files: List[Path],
+    components_dir: Path,
+    out_dir: Path,
+    presets: Sequence[Any],
+    node_executable: str,
+) -> Dict[str, Any]:
+    """Compile a group of files in a single Node.js process."""
+    script_path = Path(__file__).parent / "ssr_server.js"
+    command = [
+        node_executable,
+        str(script_path),
+        "--build",
+        str(out_dir),
+        "--root",
+        str(components_dir),
+        "--presets",
+        json.dumps(list(presets)),
+        "--",
+        *(str(path) for path in files),
+    ]
+
+    # Run from the project root like NodeRenderer so Babel presets resolve the same way
+    try:
+        process = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            cwd=str(Path(__file__).parent.parent),
+        )
+    except OSError as e:
+        raise ComponentCompileError(f"Failed to start Node.js: {str(e)}")
+
+    try:
+        return json.loads(process.stdout)
+    except json.JSONDecodeError:
+        raise ComponentCompileError(
+            f"Component build failed: {process.stderr.strip() or 'no output'}"
+        )
+
+
+def _plan_build(
+    components_path: Path,
+    out_path: Path,
+    presets: Sequence[Any],
+    previous: Dict[str, str],
+    force: bool,
+) -> Tuple[Dict[str, str], List[Path], List[str]]:
+    """
+    Hash every component and find those that need compiling.
+
+    Returns:
+        The new manifest, the sources to compile and the skipped components
+    """
+    manifest: Dict[str, str] = {}
+    pending: List[Path] = []
+    skipped: List[str] = []
+
+    for source in sorted(components_path.rglob("*")):
+        if source.suffix not in COMPONENT_EXTENSIONS or not source.is_file():
+            continue
+        # Don't recompile our own output if it lives inside the components dir
+        if out_path == source.parent or out_path in source.parents:
+            continue
+
+        relative = source.relative_to(components_path).as_posix()
+        manifest[relative] = _source_hash(source, presets)
+        output = out_path / Path(relative).with_suffix(".js")
+        unchanged = previous.get(relative) == manifest[relative] and output.exists()
+        if unchanged and not force:
+            skipped.append(relative)
+        else:
+            pending.append(source)
+    return manifest, pending, skipped
+
+
+def _compile_all(
+    pending: List[Path],
+    components_path: Path,
+    out_path: Path,
+    presets: Sequence[Any],
+    jobs: int,
+    node_executable: str,
+) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Compile sources on up to `jobs` Node.js processes, returning what failed."""
+    # Spread files over a few long-lived processes rather than one per file
+    chunks = [chunk for chunk in (pending[i::jobs] for i in range(jobs)) if chunk]
+    compiled: List[str] = []
+    errors: List[Dict[str, str]] = []
+    with ThreadPoolExecutor(max_workers=len(chunks) or 1) as executor:
+        results = executor.map(
+            lambda chunk: _compile_chunk(
+                chunk, components_path, out_path, presets, node_executable
+            ),
+            chunks,
+        )
+        for result in results:
+            compiled.extend(
+                Path(path).relative_to(components_path).as_posix()
+                for path in result.get("compiled", [])
+            )
+            for error in result.get("errors", []):
+                relative = Path(error["file"]).relative_to(components_path).as_posix()
+                errors.append({"file": relative, "message": error["message"]})
+    return compiled, errors
+
+
+def _remove_deleted(
+    previous: Dict[str, str],
+    manifest: Dict[str, str],
+    components_path: Path,
+    out_path: Path,
+) -> List[str]:
+    """Remove the outputs of components deleted since the last build."""
+    removed: List[str] = []
+    for relative in set(previous) - set(manifest):
+        if (components_path / relative).exists():
+            continue
+        output = out_path / Path(relative).with_suffix(".js")
+        if output.exists():
+            output.unlink()
+        removed.append(relative)
+    return removed
+
+
+def build_components(
+    components_dir: str = "components",
+    out_dir: str = "build/components",
+    presets: Optional[Sequence[Any]] = None,
+    jobs: Optional[int] = None,
+    node_executable: str = "node",
+    force: bool = False,
+) -> Dict[str, List[Any]]:
+    """
+    Compile every component in a directory to CommonJS.
+
+    Files whose content and presets are unchanged since the last build are
+    skipped, and outputs of deleted components are removed.
+
+    Args:
+        components_dir: Directory containing React components
+        out_dir: Directory receiving the compiled components
+        presets: Babel presets, defaults to @babel/preset-react
+        jobs: Number of parallel Node.js processes, defaults to the CPU count
+        node_executable: Path to Node.js executable
+        force: Recompile all components
+
+    Returns:
+        Lists of compiled, skipped and removed components and compile errors
+
+    Raises:
+        ComponentCompileError: If Node.js or Babel cannot run at all
+    """
+    components_path = Path(components_dir).absolute()
+    out_path = Path(out_dir).absolute()
+    presets = list(presets or DEFAULT_PRESETS)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    if not components_path.exists():
+        raise ComponentCompileError(
+            f"Components directory '{components_dir}' not found"
+        )
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    previous = _load_manifest(out_path)
+    manifest, pending, skipped = _plan_build(
+        components_path, out_path, presets, previous, force
+    )
+    compiled, errors = _compile_all(
+        pending, components_path, out_path, presets, jobs, node_executable
+    )
+    for error in errors:
+        # Retry failed files on the next build
+        manifest.pop(error["file"], None)
+    removed = _remove_deleted(previous, manifest, components_path, out_path)
+
+    _write_manifest(out_path, manifest)
+    return {
+        "compiled": sorted(compiled),
+        "skipped": skipped,
+        "removed": sorted(removed),
+        "errors": errors,
+    }
@@ -0,0 +1,560 @@
+"""
+Rendered output cache for Flask-React extension.
+Keeps HTML for repeated renders of the same component and props, in memory or
+in a filesystem or SQLite store shared by all processes on a host.
+"""
+
+import abc
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class CacheBackend(abc.ABC):
+    """Store of rendered HTML, limited by entry count and size.
+
+    Subclasses implement `_load`, `_store`, `_usage` and `clear`; hit and miss
+    counting, expiry and write times are handled here.
+    """
+
+    # Name of the backend in `FLASK_REACT_CACHE_BACKEND` and in `stats()`
+    name = ""
+
+    def __init__(
+        self,
+        max_entries: int = 100,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached renders
+            max_bytes: Maximum total size of cached HTML in bytes
+            ttl: Seconds a render stays cached, None to keep it until evicted
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(component_name: str, props: Dict[str, Any], version: str) -> str:
+        """
+        Build a cache key from the component, its props and its source version.
+
+        Props are serialized canonically, so dicts with the same content in a
+        different order share an entry.
+        """
+        props_json = json.dumps(
+            props, sort_keys=True, separators=(",", ":"), default=str
+        )
+        props_hash = hashlib.sha256(props_json.encode("utf-8")).hexdigest()
+        return f"{component_name}:{version}:{props_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get cached HTML unless it is missing or expired."""
+        entry = self.get_with_age(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_age(
+        self, key: str, max_age: Optional[float] = None
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Get cached HTML with the seconds since it was stored.
+
+        Args:
+            key: Key from `make_key`
+            max_age: Treat entries stored longer ago than this as missing
+
+        Returns:
+            The HTML and its age, or None if it is missing, expired or too old
+        """
+        entry = self._load(key)
+        if entry is not None:
+            html, stored_at = entry
+            age = max(time.time() - stored_at, 0.0)
+            entry = (html, age) if max_age is None or age <= max_age else None
+        with self._counter_lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def record_miss(self):
+        """Count a lookup that could not be made, such as one without a key yet."""
+        with self._counter_lock:
+            self.misses += 1
+
+    def set(self, key: str, html: str, ttl: Optional[float] = None):
+        """
+        Store rendered HTML, evicting other entries if needed.
+
+        Args:
+            key: Key from `make_key`
+            html: Rendered HTML
+            ttl: Seconds to keep this entry, overriding the cache's `ttl`
+        """
+        size = len(html.encode("utf-8"))
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        if ttl is None:
+            ttl = self.ttl
+        # Wall clock time, entries may be read by other processes
+        stored_at = time.time()
+        expires = stored_at + ttl if ttl is not None else None
+        self._store(key, html, size, stored_at, expires)
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove all entries."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache usage counters, counting hits and misses of this process."""
+        entries, size = self._usage()
+        with self._counter_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": self.name,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _expired(expires: Optional[float]) -> bool:
+        """Check whether an expiry time has passed."""
+        return expires is not None and expires <= time.time()
+
+    @abc.abstractmethod
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        """Read an entry's HTML and write time, None if it is missing or expired."""
+
+    @abc.abstractmethod
+    def _store(
+        self,
+        key: str,
+        html: str,
+        size: int,
+        stored_at: float,
+        expires: Optional[float],
+    ):
+        """Write an entry of `size` bytes that expires at `expires`, if set."""
+
+    @abc.abstractmethod
+    def _usage(self) -> Tuple[int, int]:
+        """Count the entries and their total size in bytes."""
+
+
+class RenderCache(CacheBackend):
+    """Bounded LRU cache of rendered HTML in this process's memory."""
+
+    name = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = 100,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        super().__init__(max_entries, max_bytes, ttl)
+        # HTML, write time and expiry time by key
+        self._entries: "OrderedDict[str, Tuple[str, float, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        """Read an entry, marking it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            html, stored_at, expires = entry
+            if self._expired(expires):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return html, stored_at
+
+    def _store(
+        self,
+        key: str,
+        html: str,
+        size: int,
+        stored_at: float,
+        expires: Optional[float],
+    ):
+        """Write an entry, evicting least recently used entries if needed."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (html, stored_at, expires)
+            self._sizes[key] = size
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        """Remove an entry. Caller must hold the lock."""
+        del self._entries[key]
+        self._bytes -= self._sizes.pop(key)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+
+class FileSystemCache(CacheBackend):
+    """Cache of rendered HTML in files, shared by the processes using a directory.
+
+    Each entry is a file in a directory sharded by the first two hex digits of
+    its key's hash, written to a temporary file and renamed into place so
+    readers never see a partial entry. Limits are enforced every
+    `PRUNE_INTERVAL` writes of a process by removing expired entries, then
+    the least recently written ones.
+    """
+
+    name = "filesystem"
+
+    # Writes between scans for expired and excess entries
+    PRUNE_INTERVAL = 64
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_entries: int = 100,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the entries, created if missing
+                and then only accessible to its owner
+            max_entries: Maximum number of cached renders
+            max_bytes: Maximum total size of cached HTML in bytes
+            ttl: Seconds a render stays cached, None to keep it until evicted
+        """
+        super().__init__(max_entries, max_bytes, ttl)
+        self.directory = Path(directory)
+        _make_private_dir(self.directory)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        """Get the file of an entry."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / digest[2:]
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header["key"] != key:
+                    return None
+                if self._expired(header["expires"]):
+                    path.unlink()
+                    return None
+                return f.read(), header["stored"]
+        except (OSError, ValueError, KeyError):
+            # Missing, removed while reading or not an entry
+            return None
+
+    def _store(
+        self,
+        key: str,
+        html: str,
+        size: int,
+        stored_at: float,
+        expires: Optional[float],
+    ):
+        path = self._path(key)
+        header = json.dumps({"key": key, "stored": stored_at, "expires": expires})
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(header + "\n" + html)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            # A full or read-only disk costs renders, not requests
+            return
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_INTERVAL == 0
+        if prune:
+            self.prune()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """List the (modification time, size, path) of all entry files."""
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for shard in self.directory.iterdir():
+            if not shard.is_dir():
+                continue
+            for path in shard.iterdir():
+                if path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def prune(self):
+        """Remove expired entries, then the oldest ones beyond the limits."""
+        kept = []
+        for entry in self._entries():
+            path = entry[2]
+            try:
+                with open(path, encoding="utf-8") as f:
+                    expires = json.loads(f.readline())["expires"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if self._expired(expires):
+                _unlink(path)
+            else:
+                kept.append(entry)
+
+        kept.sort()
+        total = sum(size for _, size, _ in kept)
+        while kept and (len(kept) > self.max_entries or total > self.max_bytes):
+            _, size, path = kept.pop(0)
+            _unlink(path)
+            total -= size
+
+    def clear(self):
+        """Remove all entries."""
+        if not self.directory.is_dir():
+            return
+        for shard in self.directory.iterdir():
+            if shard.is_dir():
+                shutil.rmtree(shard, ignore_errors=True)
+
+    def _usage(self) -> Tuple[int, int]:
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+
+class SQLiteCache(CacheBackend):
+    """Cache of rendered HTML in a SQLite database, shared by its processes.
+
+    The database uses write-ahead logging, so readers in other processes are
+    not blocked by a write. Each thread of each process opens its own
+    connection. Beyond the limits the least recently written entries are
+    removed.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 100,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Database file, created if missing along with a directory
+                only accessible to its owner
+            max_entries: Maximum number of cached renders
+            max_bytes: Maximum total size of cached HTML in bytes
+            ttl: Seconds a render stays cached, None to keep it until evicted
+        """
+        super().__init__(max_entries, max_bytes, ttl)
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        # A connection inherited from a forked parent must not be shared
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            _make_private_dir(self.path.parent)
+            connection = sqlite3.connect(
+                str(self.path), timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS renders ("
+                "key TEXT PRIMARY KEY, html TEXT NOT NULL, "
+                "size INTEGER NOT NULL, stored REAL NOT NULL, expires REAL)"
+            )
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT html, stored, expires FROM renders WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[2]):
+                connection.execute(
+                    "DELETE FROM renders WHERE key = ? AND expires <= ?",
+                    (key, time.time()),
+                )
+                return None
+            return row[0], row[1]
+        except sqlite3.Error:
+            return None
+
+    def _store(
+        self,
+        key: str,
+        html: str,
+        size: int,
+        stored_at: float,
+        expires: Optional[float],
+    ):
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                # Replacing gives the entry a new rowid, the most recent write
+                connection.execute(
+                    "INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?, ?)",
+                    (key, html, size, stored_at, expires),
+                )
+                connection.execute(
+                    "DELETE FROM renders WHERE expires <= ?", (time.time(),)
+                )
+                connection.execute(
+                    "DELETE FROM renders WHERE rowid NOT IN "
+                    "(SELECT rowid FROM renders ORDER BY rowid DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                connection.execute(
+                    "DELETE FROM renders WHERE rowid IN (SELECT rowid FROM "
+                    "(SELECT rowid, SUM(size) OVER (ORDER BY rowid DESC) AS total "
+                    "FROM renders) WHERE total > ?)",
+                    (self.max_bytes,),
+                )
+        except sqlite3.Error:
+            # A locked or broken database costs renders, not requests
+            return
+
+    def clear(self):
+        """Remove all entries."""
+        try:
+            self._connection().execute("DELETE FROM renders")
+        except sqlite3.Error:
+            pass
+
+    def _usage(self) -> Tuple[int, int]:
+        try:
+            row = (
+                self._connection()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM renders")
+                .fetchone()
+            )
+        except sqlite3.Error:
+            return 0, 0
+        return row[0], row[1]
+
+
+def create_cache_backend(
+    backend: Union[str, CacheBackend] = "memory",
+    max_entries: int = 100,
+    max_bytes: int = 32 * 1024 * 1024,
+    directory: Optional[Union[str, Path]] = None,
+    ttl: Optional[float] = None,
+) -> CacheBackend:
+    """
+    Create the rendered HTML cache named by `FLASK_REACT_CACHE_BACKEND`.
+
+    Args:
+        backend: `'memory'`, `'filesystem'`, `'sqlite'` or a ready backend,
+            which is returned as is
+        max_entries: Maximum number of cached renders
+        max_bytes: Maximum total size of cached HTML in bytes
+        directory: Directory of the shared store of `filesystem` and `sqlite`,
+            required by them
+        ttl: Seconds a render stays cached, None to keep it until evicted
+
+    Raises:
+        ValueError: If the backend name is unknown or a shared store has no
+            directory
+    """
+    if isinstance(backend, CacheBackend):
+        return backend
+
+    if backend == "memory":
+        return RenderCache(max_entries, max_bytes, ttl)
+    if backend not in ("filesystem", "sqlite"):
+        raise ValueError(
+            f"Unknown cache backend '{backend}', "
+            "expected 'memory', 'filesystem' or 'sqlite'"
+        )
+    if not directory:
+        raise ValueError(f"The '{backend}' cache backend needs a directory")
+    if backend == "filesystem":
+        return FileSystemCache(directory, max_entries, max_bytes, ttl)
+    return SQLiteCache(Path(directory) / "renders.sqlite3", max_entries, max_bytes, ttl)
+
+
+def _make_private_dir(directory: Path):
+    """Create a directory only its owner can access, unless it exists."""
+    try:
+        # Parents get the default mode, like `mkdir -p`
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError:
+        pass  # Read-only disk: entries are not stored, see `_store`
+
+
+def _unlink(path: Path):
+    """Remove a file unless another process already did."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
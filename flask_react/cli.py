@@ -4,7 +4,10 @@ Provides commands to manage React components.
 """
 
 import argparse
+import importlib
+import json
 import os
+import subprocess
 import sys
 from pathlib import Path
 
@@ -239,6 +242,192 @@ PyExecJS>=1.5.1
     print("  3. Open http://localhost:5000 in your browser")
 
 
+def load_app(import_name):
+    """Import a Flask app from 'module:attribute', calling it if it's a factory."""
+    sys.path.insert(0, os.getcwd())
+    module_name, _, attribute = import_name.partition(":")
+    app = getattr(importlib.import_module(module_name), attribute or "app")
+    if not hasattr(app, "config") and callable(app):
+        app = app()
+    return app
+
+
+def build(
+    components_dir="components",
+    out_dir=None,
+    presets=None,
+    jobs=None,
+    force=False,
+    node_executable="node",
+    app_import=None,
+):
+    """Compile components to CommonJS ahead of time."""
+    from .build import build_components
+    from .exceptions import ComponentCompileError
+
+    # Read directories and presets from the app's Flask-React configuration
+    if app_import:
+        app = load_app(app_import)
+        config = app.config
+        components_dir = config.get("FLASK_REACT_COMPONENTS_DIR", components_dir)
+        if not os.path.isabs(components_dir):
+            components_dir = os.path.join(app.root_path, components_dir)
+        out_dir = out_dir or config.get("FLASK_REACT_BUILD_DIR") or "build/components"
+        if not os.path.isabs(out_dir):
+            out_dir = os.path.join(app.root_path, out_dir)
+        presets = presets or config.get("FLASK_REACT_BABEL_PRESETS")
+        node_executable = config.get("FLASK_REACT_NODE_EXECUTABLE", node_executable)
+
+    try:
+        result = build_components(
+            components_dir,
+            out_dir or "build/components",
+            presets=presets,
+            jobs=jobs,
+            node_executable=node_executable,
+            force=force,
+        )
+    except ComponentCompileError as e:
+        print(f"Build failed: {e}")
+        return False
+
+    for error in result["errors"]:
+        print(f"  ! {error['file']}: {error['message']}")
+    print(
+        f"Compiled {len(result['compiled'])}, skipped {len(result['skipped'])} "
+        f"unchanged, removed {len(result['removed'])} components"
+    )
+    return not result["errors"]
+
+
+def load_object(import_name):
+    """Import an object from 'module:attribute'."""
+    sys.path.insert(0, os.getcwd())
+    module_name, _, attribute = import_name.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def export(
+    app_import,
+    out_dir=None,
+    urls=None,
+    endpoints=None,
+    generator=None,
+    jobs=None,
+    force=False,
+    compress=True,
+):
+    """Pre-render pages of a Flask app to static HTML files."""
+    from .export import collect_urls, export_pages
+
+    app = load_app(app_import)
+    if "flask-react" not in app.extensions:
+        print(f"Flask-React is not initialized on '{app_import}'.")
+        return False
+
+    out_dir = out_dir or "build/static"
+    if not os.path.isabs(out_dir):
+        out_dir = os.path.join(app.root_path, out_dir)
+    pages = collect_urls(
+        app,
+        urls or (),
+        endpoints or (),
+        load_object(generator) if generator else None,
+    )
+    result = export_pages(
+        app, pages, out_dir, jobs=jobs, force=force, compress=compress
+    )
+
+    for error in result["errors"]:
+        print(f"  ! {error['url']}: {error['message']}")
+    print(
+        f"Exported {len(result['exported'])}, skipped {len(result['skipped'])} "
+        f"unchanged, removed {len(result['removed'])} pages to {out_dir}"
+    )
+    return not result["errors"]
+
+
+def _daemon_args(workers, cache, max_requests, max_rss_mb):
+    """ssr_server.js options sizing and recycling the daemon's workers."""
+    args = []
+    for option, value in (
+        ("--workers", workers),
+        ("--max-requests", max_requests),
+        ("--max-rss-mb", max_rss_mb),
+    ):
+        if value:
+            args.extend([option, str(value)])
+    if not cache:
+        args.append("--no-cache")
+    return args
+
+
+def _babel_args(babel, presets, transpile_cache, transpile_cache_max_bytes):
+    """ssr_server.js options choosing how components are transpiled."""
+    if not babel:
+        return ["--no-babel"]
+    args = []
+    if presets:
+        args.extend(["--presets", json.dumps(presets)])
+    if transpile_cache:
+        args.extend(["--transpile-cache", os.path.abspath(transpile_cache)])
+        if transpile_cache_max_bytes:
+            args.extend(["--transpile-cache-bytes", str(transpile_cache_max_bytes)])
+    return args
+
+
+def run_ssr_server(
+    socket_path,
+    workers=None,
+    cache=True,
+    node_executable="node",
+    babel=True,
+    presets=None,
+    max_requests=None,
+    max_rss_mb=None,
+    max_old_space_size=None,
+    transpile_cache=None,
+    transpile_cache_max_bytes=None,
+):
+    """Run the shared SSR daemon on a Unix domain socket."""
+    from .exceptions import JavaScriptEngineError
+    from .node_worker import WorkerLimits
+    from .socket_renderer import default_socket_path
+
+    try:
+        socket_path = os.path.abspath(socket_path or default_socket_path())
+    except JavaScriptEngineError as e:
+        print(str(e))
+        return 1
+
+    script_path = Path(__file__).parent / "ssr_server.js"
+    command = [
+        node_executable,
+        # Cluster workers inherit the primary's Node.js options
+        *WorkerLimits(max_old_space_size=max_old_space_size).node_args(),
+        str(script_path),
+        # Resolved before changing to the project root
+        "--socket",
+        socket_path,
+        *_daemon_args(workers, cache, max_requests, max_rss_mb),
+        *_babel_args(babel, presets, transpile_cache, transpile_cache_max_bytes),
+    ]
+
+    # Run from the project root like NodeRenderer so dependencies resolve the same way
+    project_root = str(Path(__file__).parent.parent)
+    try:
+        if os.name == "posix":
+            # Replace this process so signals from process managers reach Node.js
+            os.chdir(project_root)
+            os.execvp(command[0], command)
+        return subprocess.call(command, cwd=project_root)
+    except FileNotFoundError:
+        print(f"Node.js executable '{node_executable}' not found.")
+        return 1
+    except KeyboardInterrupt:
+        return 0
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="Flask-React CLI tool")
@@ -274,6 +463,112 @@ def main():
     )
     init_parser.add_argument("--dir", default=".", help="Project directory")
 
+    # SSR daemon command
+    server_parser = subparsers.add_parser(
+        "ssr-server", help="Run a shared SSR server on a Unix domain socket"
+    )
+    server_parser.add_argument("--socket", default=None, help="Socket path")
+    server_parser.add_argument(
+        "--workers", type=int, default=None, help="Number of Node.js workers"
+    )
+    server_parser.add_argument(
+        "--no-cache", action="store_true", help="Reload components on every render"
+    )
+    server_parser.add_argument(
+        "--no-babel",
+        action="store_true",
+        help="Serve components prebuilt with 'flask-react build'",
+    )
+    server_parser.add_argument(
+        "--preset", action="append", default=None, help="Babel preset (repeatable)"
+    )
+    server_parser.add_argument("--node", default="node", help="Node.js executable")
+    server_parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=None,
+        help="Replace a worker after this many requests",
+    )
+    server_parser.add_argument(
+        "--max-rss-mb",
+        type=int,
+        default=None,
+        help="Replace a worker whose resident memory exceeds this many MB",
+    )
+    server_parser.add_argument(
+        "--max-old-space-size",
+        type=int,
+        default=None,
+        help="V8 heap limit of each worker in MB",
+    )
+    server_parser.add_argument(
+        "--transpile-cache",
+        default=None,
+        help="Directory of transpiled components shared by workers and deploys",
+    )
+    server_parser.add_argument(
+        "--transpile-cache-max-bytes",
+        type=int,
+        default=None,
+        help="Size of the transpile cache before old entries are removed",
+    )
+
+    # Build components command
+    build_parser = subparsers.add_parser(
+        "build", help="Compile components to CommonJS ahead of time"
+    )
+    build_parser.add_argument(
+        "--app", default=None, help="Flask app to read configuration from (module:app)"
+    )
+    build_parser.add_argument(
+        "--dir", default="components", help="Components directory"
+    )
+    build_parser.add_argument(
+        "--out", default=None, help="Output directory (default: build/components)"
+    )
+    build_parser.add_argument(
+        "--preset", action="append", default=None, help="Babel preset (repeatable)"
+    )
+    build_parser.add_argument(
+        "--jobs", type=int, default=None, help="Parallel Node.js processes"
+    )
+    build_parser.add_argument(
+        "--force", action="store_true", help="Recompile unchanged components"
+    )
+    build_parser.add_argument("--node", default="node", help="Node.js executable")
+
+    # Export pages command
+    export_parser = subparsers.add_parser(
+        "export", help="Pre-render pages to static HTML files"
+    )
+    export_parser.add_argument("--app", required=True, help="Flask app (module:app)")
+    export_parser.add_argument(
+        "--out", default=None, help="Output directory (default: build/static)"
+    )
+    export_parser.add_argument(
+        "--url", action="append", default=None, help="URL path to export (repeatable)"
+    )
+    export_parser.add_argument(
+        "--endpoint",
+        action="append",
+        default=None,
+        help="Endpoint of a rule without arguments to export (repeatable)",
+    )
+    export_parser.add_argument(
+        "--generator",
+        default=None,
+        help="Function returning URLs to export (module:function)",
+    )
+    export_parser.add_argument(
+        "--jobs", type=int, default=None, help="Pages rendered in parallel"
+    )
+    export_parser.add_argument(
+        "--force", action="store_true", help="Export pages with unchanged components"
+    )
+    export_parser.add_argument(
+        "--no-gzip", action="store_true", help="Skip writing .html.gz files"
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -288,6 +583,45 @@ def main():
         remove_component(args.name, args.dir)
     elif args.command == "init":
         init_project(args.dir)
+    elif args.command == "ssr-server":
+        sys.exit(
+            run_ssr_server(
+                args.socket,
+                args.workers,
+                not args.no_cache,
+                args.node,
+                not args.no_babel,
+                args.preset,
+                args.max_requests,
+                args.max_rss_mb,
+                args.max_old_space_size,
+                args.transpile_cache,
+                args.transpile_cache_max_bytes,
+            )
+        )
+    elif args.command == "build":
+        success = build(
+            args.dir,
+            args.out,
+            args.preset,
+            args.jobs,
+            args.force,
+            args.node,
+            args.app,
+        )
+        sys.exit(0 if success else 1)
+    elif args.command == "export":
+        success = export(
+            args.app,
+            args.out,
+            args.url,
+            args.endpoint,
+            args.generator,
+            args.jobs,
+            args.force,
+            not args.no_gzip,
+        )
+        sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
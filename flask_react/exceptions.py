@@ -21,6 +21,12 @@ class RenderError(FlaskReactError):
     pass
 
 
+class RenderTimeoutError(RenderError):
+    """Raised when a render does not finish before its deadline."""
+
+    pass
+
+
 class JavaScriptEngineError(FlaskReactError):
     """Raised when there's an error with the JavaScript engine."""
 
@@ -0,0 +1,313 @@
+"""
+Static page export for Flask-React extension.
+Pre-renders routes to HTML files that a web server can serve without Flask.
+"""
+
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import unquote, urlsplit
+
+from flask import Flask, url_for
+
+from . import signals
+
+MANIFEST_NAME = "export-manifest.json"
+
+
+def collect_urls(
+    app: Flask,
+    urls: Sequence[str] = (),
+    endpoints: Sequence[str] = (),
+    generator: Optional[Callable[[], Iterable[str]]] = None,
+) -> List[str]:
+    """
+    Gather the URLs to export, without duplicates.
+
+    Args:
+        app: Flask application
+        urls: URL paths
+        endpoints: Endpoints of rules without arguments
+        generator: Called in a request context, returns more URLs, for
+            example `url_for` of every product page
+
+    Returns:
+        The URLs in order, or every GET rule without arguments if no source
+        is given
+    """
+    found = list(urls)
+    with app.test_request_context():
+        found.extend(url_for(endpoint) for endpoint in endpoints)
+        if generator is not None:
+            found.extend(generator())
+        if not (urls or endpoints or generator):
+            found.extend(
+                url_for(rule.endpoint)
+                for rule in app.url_map.iter_rules()
+                if "GET" in (rule.methods or ()) and not rule.arguments
+                if rule.endpoint != "static"
+            )
+    return list(dict.fromkeys(found))
+
+
+def output_path(url: str) -> str:
+    """
+    Map a URL to the file serving it, relative to the export directory.
+
+    `/` becomes `index.html`, `/blog/` becomes `blog/index.html` and
+    `/about` becomes `about.html`.
+
+    Raises:
+        ValueError: If the URL has a query string or leaves the directory
+    """
+    parts = urlsplit(url)
+    if parts.query:
+        raise ValueError(f"Cannot export '{url}', query strings have no file")
+    path = unquote(parts.path).lstrip("/")
+    if ".." in path.split("/"):
+        raise ValueError(f"Cannot export '{url}' outside the export directory")
+    if not path or path.endswith("/"):
+        return path + "index.html"
+    if path.endswith(".html"):
+        return path
+    return path + ".html"
+
+
+def _load_manifest(out_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the pages recorded by the previous export."""
+    try:
+        with open(out_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Replace a file so the web server never serves a partial page."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _write_page(path: Path, html: bytes, compress: bool):
+    """Write a page, and a gzipped copy next to it if `compress` is set."""
+    _write_atomic(path, html)
+    if compress:
+        compressed = gzip.compress(html, compresslevel=9, mtime=0)
+        _write_atomic(path.with_name(f"{path.name}.gz"), compressed)
+
+
+def export_pages(
+    app: Flask,
+    urls: Sequence[str],
+    out_dir: str = "build/static",
+    jobs: Optional[int] = None,
+    force: bool = False,
+    compress: bool = True,
+) -> Dict[str, List[Any]]:
+    """
+    Render pages through the test client and write them as HTML files.
+
+    Each page records the components it rendered and their versions.
+    Pages whose components are all unchanged since the last export are
+    skipped; pages that rendered no component through `FlaskReact` are
+    always exported again, and so is every page when render signals are
+    unavailable (Flask before 2.3 without blinker). Responses that are not
+    HTML are skipped without writing a file. Files of pages no longer in
+    `urls` are removed.
+
+    Args:
+        app: Flask application with Flask-React initialized
+        urls: URLs to export, see `collect_urls`
+        out_dir: Directory receiving the HTML files
+        jobs: Number of pages rendered in parallel, defaults to
+            FLASK_REACT_POOL_SIZE
+        force: Export unchanged pages too
+        compress: Also write a gzipped `.html.gz` next to each file
+
+    Returns:
+        Lists of exported, skipped and removed URLs and export errors
+    """
+    react = app.extensions["flask-react"]
+    out_path = Path(out_dir).absolute()
+    out_path.mkdir(parents=True, exist_ok=True)
+    jobs = max(1, jobs or app.config.get("FLASK_REACT_POOL_SIZE") or 1)
+
+    previous = _load_manifest(out_path)
+    manifest, pending, skipped, errors = _plan_export(
+        react, out_path, urls, previous, force
+    )
+
+    exporter = _PageExporter(app, out_path, compress)
+    recording = _connect(exporter.record, app)
+    try:
+        exported = _export_all(exporter, pending, jobs, manifest, skipped, errors)
+    finally:
+        if recording:
+            signals.before_render.disconnect(exporter.record, app)
+
+    removed = _remove_stale(out_path, previous, urls)
+    _write_atomic(
+        out_path / MANIFEST_NAME,
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    return {
+        "exported": exported,
+        "skipped": skipped,
+        "removed": removed,
+        "errors": errors,
+    }
+
+
+class _PageExporter:
+    """Renders pages into files, recording the components each one renders."""
+
+    def __init__(self, app: Flask, out_path: Path, compress: bool):
+        self.app = app
+        self.out_path = out_path
+        self.compress = compress
+        # Components rendered by the request running on each export thread
+        self._rendering = threading.local()
+
+    def record(self, sender: Flask, component_name: str, **kwargs: Any):
+        """Receive `before_render`, adding the component to the current page."""
+        components = getattr(self._rendering, "components", None)
+        if components is not None:
+            components.add(component_name)
+
+    def export(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Render a page and write its file.
+
+        Returns:
+            The page's manifest entry, or None if it is not HTML, such as
+            JSON or metrics endpoints found among the rules
+
+        Raises:
+            ValueError: If the page does not answer 200
+        """
+        self._rendering.components = set()
+        try:
+            response = self.app.test_client().get(url)
+        finally:
+            components = self._rendering.components
+            self._rendering.components = None
+        if response.status_code != 200:
+            raise ValueError(f"HTTP {response.status_code}")
+        if response.mimetype != "text/html":
+            return None
+
+        relative = output_path(url)
+        _write_page(self.out_path / relative, response.get_data(), self.compress)
+        renderer = self.app.extensions["flask-react"].renderer
+        return {
+            "file": relative,
+            "components": {
+                name: renderer.component_version(name) for name in sorted(components)
+            },
+        }
+
+
+def _export_all(
+    exporter: _PageExporter,
+    urls: List[str],
+    jobs: int,
+    manifest: Dict[str, Dict[str, Any]],
+    skipped: List[str],
+    errors: List[Dict[str, str]],
+) -> List[str]:
+    """Export pages in parallel, filling in the manifest, skipped URLs and errors."""
+    exported: List[str] = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [(url, executor.submit(exporter.export, url)) for url in urls]
+        for url, future in futures:
+            try:
+                entry = future.result()
+            except Exception as e:
+                errors.append({"url": url, "message": str(e)})
+                continue
+            if entry is None:
+                skipped.append(url)
+            else:
+                manifest[url] = entry
+                exported.append(url)
+    return exported
+
+
+def _plan_export(
+    react: Any,
+    out_path: Path,
+    urls: Sequence[str],
+    previous: Dict[str, Dict[str, Any]],
+    force: bool,
+) -> Tuple[Dict[str, Dict[str, Any]], List[str], List[str], List[Dict[str, str]]]:
+    """
+    Sort URLs into pages to export and unchanged pages to skip.
+
+    Returns:
+        The manifest entries of skipped pages, the URLs to export, the
+        skipped URLs and the errors of URLs that have no file
+    """
+    manifest: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+    skipped: List[str] = []
+    errors: List[Dict[str, str]] = []
+    for url in urls:
+        try:
+            relative = output_path(url)
+        except ValueError as e:
+            errors.append({"url": url, "message": str(e)})
+            continue
+        entry = previous.get(url)
+        if not force and _unchanged(react, out_path, relative, entry):
+            skipped.append(url)
+            manifest[url] = entry
+        else:
+            pending.append(url)
+    return manifest, pending, skipped, errors
+
+
+def _unchanged(
+    react: Any, out_path: Path, relative: str, entry: Optional[Dict[str, Any]]
+) -> bool:
+    """Check whether a page's file exists and its components are unchanged."""
+    return bool(
+        entry
+        and entry["file"] == relative
+        and entry["components"]
+        and (out_path / relative).exists()
+        and all(
+            react.renderer.component_version(name) == version
+            for name, version in entry["components"].items()
+        )
+    )
+
+
+def _connect(receiver: Callable[..., None], app: Flask) -> bool:
+    """Connect a `before_render` receiver, returning whether signals are available."""
+    try:
+        signals.before_render.connect(receiver, app)
+    except RuntimeError:
+        # Flask before 2.3 without blinker: no components are recorded
+        return False
+    return True
+
+
+def _remove_stale(
+    out_path: Path, previous: Dict[str, Dict[str, Any]], urls: Sequence[str]
+) -> List[str]:
+    """Remove the files of previously exported pages no longer in `urls`."""
+    removed = sorted(set(previous) - set(urls))
+    for url in removed:
+        for name in (previous[url]["file"], previous[url]["file"] + ".gz"):
+            try:
+                (out_path / name).unlink()
+            except FileNotFoundError:
+                pass
+    return removed
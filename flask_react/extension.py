@@ -3,14 +3,46 @@ Flask-React extension main class.
 Provides Flask integration for server-side React component rendering.
 """
 
+import json
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from functools import lru_cache, wraps
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from flask import Flask, current_app, render_template_string, request
-from jinja2 import Template
+from flask import (
+    Flask,
+    Response,
+    current_app,
+    g,
+    has_request_context,
+    render_template_string,
+    request,
+    send_file,
+)
+from jinja2 import Environment, Template
 
-from .exceptions import FlaskReactError
+from . import signals
+from .cache import RenderCache, create_cache_backend
+from .exceptions import FlaskReactError, JavaScriptEngineError, RenderError
+from .fallback import FallbackPolicy, render_placeholder
+from .isr import StaticPages
 from .node_renderer import NodeRenderer
+from .socket_renderer import SocketRenderer
+
+# First characters of a JSON document, after leading whitespace
+_JSON_START = frozenset('{["-0123456789tfn')
 
 
 class FlaskReact:
@@ -25,6 +57,14 @@ class FlaskReact:
         """
         self.app = app
         self._renderer = None
+        self._fallback: Optional[FallbackPolicy] = None
+        self._static_pages: Optional[StaticPages] = None
+        # URL of the page regenerated by the current thread, if any
+        self._regeneration = threading.local()
+        self._props_environment: Optional[Environment] = None
+        self._prop_template: Callable[[str], Template] = lru_cache(maxsize=256)(
+            self._compile_prop_template
+        )
 
         if app is not None:
             self.init_app(app)
@@ -42,17 +82,79 @@ class FlaskReact:
         app.config.setdefault("FLASK_REACT_COMPONENTS_DIR", "components")
         app.config.setdefault("FLASK_REACT_CACHE_COMPONENTS", True)
         app.config.setdefault("FLASK_REACT_PERFORMANCE_MONITORING", app.debug)
+        app.config.setdefault("FLASK_REACT_METRICS_ENDPOINT", None)
         app.config.setdefault("FLASK_REACT_MAX_CACHE_SIZE", 100)
+        app.config.setdefault("FLASK_REACT_MAX_CACHE_BYTES", 32 * 1024 * 1024)
+        app.config.setdefault("FLASK_REACT_CACHE_BACKEND", "memory")
+        app.config.setdefault("FLASK_REACT_CACHE_DIR", None)
+        app.config.setdefault("FLASK_REACT_CACHE_TTL", None)
         app.config.setdefault("FLASK_REACT_BABEL_PRESETS", ["@babel/preset-react"])
+        app.config.setdefault("FLASK_REACT_BUILD_DIR", None)
+        app.config.setdefault("FLASK_REACT_TRANSPILE_CACHE_DIR", None)
+        app.config.setdefault(
+            "FLASK_REACT_TRANSPILE_CACHE_MAX_BYTES", 256 * 1024 * 1024
+        )
         app.config.setdefault("FLASK_REACT_AUTO_RELOAD", app.debug)
+        app.config.setdefault("FLASK_REACT_WATCH_INTERVAL", 1.0)
         app.config.setdefault("FLASK_REACT_NODE_TIMEOUT", 30)
+        app.config.setdefault("FLASK_REACT_COMPONENT_TIMEOUTS", {})
         app.config.setdefault("FLASK_REACT_NODE_EXECUTABLE", "node")
+        app.config.setdefault("FLASK_REACT_PERSISTENT_WORKER", True)
+        app.config.setdefault("FLASK_REACT_POOL_SIZE", os.cpu_count() or 1)
+        app.config.setdefault("FLASK_REACT_MAX_REQUESTS_PER_WORKER", None)
+        app.config.setdefault("FLASK_REACT_MAX_WORKER_RSS_MB", None)
+        app.config.setdefault("FLASK_REACT_MAX_OLD_SPACE_SIZE", None)
+        app.config.setdefault("FLASK_REACT_RENDERER", "node")
+        app.config.setdefault("FLASK_REACT_SOCKET_PATH", None)
+        app.config.setdefault("FLASK_REACT_CSR_FALLBACK", False)
+        app.config.setdefault("FLASK_REACT_FALLBACK_QUEUE_DEPTH", None)
+        app.config.setdefault("FLASK_REACT_FALLBACK_QUEUE_WAIT", None)
+        app.config.setdefault("FLASK_REACT_CIRCUIT_BREAKER_THRESHOLD", 5)
+        app.config.setdefault("FLASK_REACT_CIRCUIT_BREAKER_RESET", 30.0)
+        app.config.setdefault("FLASK_REACT_TEMPLATE_CACHE_SIZE", 256)
+        app.config.setdefault("FLASK_REACT_JSON_PROPS", {})
+        app.config.setdefault("FLASK_REACT_REQUEST_MEMO", True)
+        app.config.setdefault("FLASK_REACT_COALESCE_RENDERS", True)
+        app.config.setdefault("FLASK_REACT_STATIC_PAGES_DIR", None)
+        app.config.setdefault("FLASK_REACT_STATIC_PAGES_MAX", 1000)
         # Initialize renderer
         self._init_renderer()
 
+        # Templated props are a small fixed set, so each is compiled once
+        self._props_environment = None
+        self._prop_template = lru_cache(
+            maxsize=app.config["FLASK_REACT_TEMPLATE_CACHE_SIZE"]
+        )(self._compile_prop_template)
+
+        # Serve client-side rendering placeholders while SSR is saturated
+        if app.config["FLASK_REACT_CSR_FALLBACK"]:
+            self._fallback = FallbackPolicy(
+                max_queue_depth=app.config["FLASK_REACT_FALLBACK_QUEUE_DEPTH"],
+                max_queue_wait=app.config["FLASK_REACT_FALLBACK_QUEUE_WAIT"],
+                breaker_threshold=app.config["FLASK_REACT_CIRCUIT_BREAKER_THRESHOLD"],
+                breaker_reset_timeout=app.config["FLASK_REACT_CIRCUIT_BREAKER_RESET"],
+            )
+
+        # Pages of `static_route` views, kept across restarts
+        static_pages_dir = app.config["FLASK_REACT_STATIC_PAGES_DIR"]
+        if not static_pages_dir:
+            static_pages_dir = os.path.join(app.instance_path, "flask-react-pages")
+        elif not os.path.isabs(static_pages_dir):
+            static_pages_dir = os.path.join(app.root_path, static_pages_dir)
+        self._static_pages = StaticPages(
+            static_pages_dir, app.config["FLASK_REACT_STATIC_PAGES_MAX"]
+        )
+
         # Add template globals and filters
         self._add_template_globals()
 
+        # Expose render metrics for Prometheus to scrape
+        metrics_endpoint = app.config["FLASK_REACT_METRICS_ENDPOINT"]
+        if metrics_endpoint and app.config["FLASK_REACT_PERFORMANCE_MONITORING"]:
+            app.add_url_rule(
+                metrics_endpoint, "flask_react_metrics", self._metrics_view
+            )
+
         # Store extension in app extensions
         app.extensions["flask-react"] = self
 
@@ -65,15 +167,86 @@ class FlaskReact:
         if not os.path.isabs(components_dir):
             components_dir = os.path.join(self.app.root_path, components_dir)
 
-            # Node.js-based renderer
-        node_executable = self.app.config["FLASK_REACT_NODE_EXECUTABLE"]
+        # Components prebuilt with `flask-react build`
+        build_dir = self.app.config["FLASK_REACT_BUILD_DIR"]
+        if build_dir and not os.path.isabs(build_dir):
+            build_dir = os.path.join(self.app.root_path, build_dir)
+
         timeout = self.app.config["FLASK_REACT_NODE_TIMEOUT"]
+        pool_size = self.app.config["FLASK_REACT_POOL_SIZE"]
+        max_cache_size = self.app.config["FLASK_REACT_MAX_CACHE_SIZE"]
+        max_cache_bytes = self.app.config["FLASK_REACT_MAX_CACHE_BYTES"]
+        auto_reload = self.app.config["FLASK_REACT_AUTO_RELOAD"]
+        watch_interval = self.app.config["FLASK_REACT_WATCH_INTERVAL"]
+        performance_monitoring = self.app.config["FLASK_REACT_PERFORMANCE_MONITORING"]
+        component_timeouts = self.app.config["FLASK_REACT_COMPONENT_TIMEOUTS"]
+        coalesce_renders = self.app.config["FLASK_REACT_COALESCE_RENDERS"]
+
+        # Rendered HTML, optionally in a store shared by all processes on the host
+        cache_dir = self.app.config["FLASK_REACT_CACHE_DIR"]
+        if not cache_dir:
+            # Not a shared temporary directory, where other users could plant HTML
+            cache_dir = os.path.join(self.app.instance_path, "flask-react-cache")
+        elif not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(self.app.root_path, cache_dir)
+        cache_backend = create_cache_backend(
+            self.app.config["FLASK_REACT_CACHE_BACKEND"],
+            max_entries=max_cache_size,
+            max_bytes=max_cache_bytes,
+            directory=cache_dir,
+            ttl=self.app.config["FLASK_REACT_CACHE_TTL"],
+        )
+
+        # Shared SSR daemon reached over a Unix domain socket
+        if self.app.config["FLASK_REACT_RENDERER"] == "socket":
+            self._renderer = SocketRenderer(
+                components_dir=components_dir,
+                socket_path=self.app.config["FLASK_REACT_SOCKET_PATH"],
+                cache_enabled=cache_enabled,
+                timeout=timeout,
+                pool_size=pool_size,
+                max_cache_size=max_cache_size,
+                max_cache_bytes=max_cache_bytes,
+                build_dir=build_dir,
+                auto_reload=auto_reload,
+                watch_interval=watch_interval,
+                performance_monitoring=performance_monitoring,
+                component_timeouts=component_timeouts,
+                coalesce_renders=coalesce_renders,
+                cache_backend=cache_backend,
+            )
+            return
+
+        # Node.js-based renderer
+        node_executable = self.app.config["FLASK_REACT_NODE_EXECUTABLE"]
+        persistent = self.app.config["FLASK_REACT_PERSISTENT_WORKER"]
 
         self._renderer = NodeRenderer(
             components_dir=components_dir,
             cache_enabled=cache_enabled,
             node_executable=node_executable,
             timeout=timeout,
+            persistent=persistent,
+            pool_size=pool_size,
+            max_cache_size=max_cache_size,
+            max_cache_bytes=max_cache_bytes,
+            build_dir=build_dir,
+            babel_presets=self.app.config["FLASK_REACT_BABEL_PRESETS"],
+            transpile_cache_dir=self.app.config["FLASK_REACT_TRANSPILE_CACHE_DIR"],
+            transpile_cache_max_bytes=self.app.config[
+                "FLASK_REACT_TRANSPILE_CACHE_MAX_BYTES"
+            ],
+            auto_reload=auto_reload,
+            watch_interval=watch_interval,
+            performance_monitoring=performance_monitoring,
+            max_requests_per_worker=self.app.config[
+                "FLASK_REACT_MAX_REQUESTS_PER_WORKER"
+            ],
+            max_worker_rss_mb=self.app.config["FLASK_REACT_MAX_WORKER_RSS_MB"],
+            max_old_space_size=self.app.config["FLASK_REACT_MAX_OLD_SPACE_SIZE"],
+            component_timeouts=component_timeouts,
+            coalesce_renders=coalesce_renders,
+            cache_backend=cache_backend,
         )
 
     def _add_template_globals(self):
@@ -106,6 +279,10 @@ class FlaskReact:
         component_name: str,
         props: Optional[Dict[str, Any]] = None,
         template_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        json_props: Optional[Collection[str]] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
     ) -> str:
         """
         Render a React component to HTML string.
@@ -114,6 +291,335 @@ class FlaskReact:
             component_name: Name of the component to render
             props: Props to pass to the component
             template_data: Additional template data for Jinja2 processing
+            timeout: Deadline of this render in seconds, defaults to the
+                component's FLASK_REACT_COMPONENT_TIMEOUTS entry or
+                FLASK_REACT_NODE_TIMEOUT
+            json_props: Templated props whose rendered value is JSON, defaults
+                to the component's FLASK_REACT_JSON_PROPS entry. When neither
+                is set, values that look like JSON are parsed if they can be
+            max_age: Seconds cached HTML is served as fresh
+            stale_while_revalidate: Seconds after `max_age` that cached HTML
+                is still served while it is re-rendered in the background
+
+        Returns:
+            Rendered HTML string, or a client-side rendering placeholder when
+            FLASK_REACT_CSR_FALLBACK is on and SSR is saturated
+        """
+        if self._renderer is None:
+            self._init_renderer()
+
+        # Process props through Jinja2 for template-like functionality
+        if template_data:
+            processed_props = self._process_props_with_jinja(
+                props or {}, template_data, self._json_props(component_name, json_props)
+            )
+        else:
+            processed_props = props or {}
+
+        if self._renderer is None:
+            raise RuntimeError("Flask-React not properly initialized")
+
+        options = {
+            "timeout": timeout,
+            "max_age": max_age,
+            "stale_while_revalidate": stale_while_revalidate,
+        }
+
+        # Repeated renders within a request, such as a header and footer
+        # sharing a component, are answered from the request's memo
+        memo = self._request_memo()
+        if memo is None:
+            return self._render_or_fall_back(component_name, processed_props, options)
+        key = RenderCache.make_key(component_name, processed_props, "")
+        html = memo.get(key)
+        if html is None:
+            html = memo[key] = self._render_or_fall_back(
+                component_name, processed_props, options
+            )
+        return html
+
+    def _render_or_fall_back(
+        self, component_name: str, props: Dict[str, Any], options: Dict[str, Any]
+    ) -> str:
+        """
+        Render a component, falling back to client-side rendering if enabled.
+
+        `options` are the keyword arguments of the renderer's `render_component`.
+        """
+        if self._fallback is None:
+            return self._render(component_name, props, options)
+
+        shed = self._shed(component_name, props)
+        if shed is not None:
+            return shed
+        try:
+            html = self._render(component_name, props, options)
+        except (RenderError, JavaScriptEngineError) as e:
+            return self._fall_back(component_name, props, e)
+        self._fallback.breaker.record_success()
+        return html
+
+    def _request_memo(self) -> Optional[Dict[str, str]]:
+        """Get the renders memoized for the current request, if memoization is on."""
+        if not has_request_context() or not self.app.config["FLASK_REACT_REQUEST_MEMO"]:
+            return None
+        memo = g.get("_flask_react_memo")
+        if memo is None:
+            memo = g._flask_react_memo = {}
+        return memo
+
+    def _render(
+        self, component_name: str, props: Dict[str, Any], options: Dict[str, Any]
+    ) -> str:
+        """Render a component on the server."""
+        if not signals.has_receivers():
+            html = self._renderer.render_component(component_name, props, **options)
+            return str(html)
+        return self._render_with_signals(component_name, props, options)
+
+    def _shed(self, component_name: str, props: Dict[str, Any]) -> Optional[str]:
+        """
+        Answer without Node.js while SSR is saturated.
+
+        Returns:
+            Cached HTML or a client-side rendering placeholder, or None if
+            the component should be rendered on the server
+        """
+        reason = self._fallback.shed_reason(*self._renderer.queue_stats())
+        if reason is None:
+            return None
+        html = self._renderer.cached_render(component_name, props)
+        if html is not None:
+            return html
+        self._fallback.record(reason)
+        return render_placeholder(component_name, props)
+
+    def _fall_back(
+        self, component_name: str, props: Dict[str, Any], error: Exception
+    ) -> str:
+        """Count a failed render and serve its client-side rendering placeholder."""
+        self._fallback.breaker.record_failure()
+        self._fallback.record("render_error")
+        self.app.logger.warning(
+            "Rendering %s on the client, server rendering failed: %s",
+            component_name,
+            error,
+        )
+        return render_placeholder(component_name, props)
+
+    def _render_with_signals(
+        self,
+        component_name: str,
+        props: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Render a component, sending the render signals around it."""
+        payload = self._before_render(component_name, props)
+        started = time.perf_counter()
+        try:
+            details = self._renderer.render_component_details(
+                component_name, props, **(options or {})
+            )
+        except Exception as e:
+            self._render_failed(payload, started, e)
+            raise
+        self._after_render(
+            payload, started, details.html, details.cached, details.worker
+        )
+        return details.html
+
+    def _before_render(
+        self, component_name: str, props: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Send `before_render`, returning the payload shared by the render's signals."""
+        payload = {
+            "component_name": component_name,
+            "props": props,
+            "props_bytes": len(json.dumps(props, default=str).encode("utf-8")),
+        }
+        signals.before_render.send(self.app, **payload)
+        return payload
+
+    def _after_render(
+        self,
+        payload: Dict[str, Any],
+        started: float,
+        html: str,
+        cached: Optional[bool] = None,
+        worker: Optional[int] = None,
+    ):
+        """Send `after_render` for a render that started at `started`."""
+        signals.after_render.send(
+            self.app,
+            duration=time.perf_counter() - started,
+            cached=cached,
+            worker=worker,
+            html=html,
+            **payload,
+        )
+
+    def _render_failed(
+        self, payload: Dict[str, Any], started: float, exception: Exception
+    ):
+        """Send `render_failed` for a render that started at `started`."""
+        signals.render_failed.send(
+            self.app,
+            duration=time.perf_counter() - started,
+            exception=exception,
+            **payload,
+        )
+
+    def _signal_many(
+        self, payloads: List[Dict[str, Any]], started: float, results: List[Any]
+    ):
+        """Send `after_render` or `render_failed` for each item of a batch."""
+        for payload, result in zip(payloads, results):
+            if isinstance(result, Exception):
+                self._render_failed(payload, started, result)
+            else:
+                self._after_render(payload, started, result)
+
+    def _stream_with_signals(
+        self, component_name: str, props: Dict[str, Any], timeout: Optional[float]
+    ) -> Iterator[str]:
+        """Stream a component, sending `after_render` once the stream is complete."""
+        payload = self._before_render(component_name, props)
+        started = time.perf_counter()
+        try:
+            stream = self._renderer.stream_component(
+                component_name, props, timeout=timeout
+            )
+        except Exception as e:
+            self._render_failed(payload, started, e)
+            raise
+        return self._signal_stream(payload, started, stream)
+
+    def _signal_stream(
+        self, payload: Dict[str, Any], started: float, stream: Iterator[str]
+    ) -> Iterator[str]:
+        """
+        Pass a stream's chunks through and send the signal that ends it.
+
+        A stream closed early, as by a client that disconnected, sends neither.
+        """
+        parts = []
+        try:
+            for chunk in stream:
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._render_failed(payload, started, e)
+            raise
+        finally:
+            # Release the worker producing the stream
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        self._after_render(payload, started, "".join(parts))
+
+    def stream_component(
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        template_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        json_props: Optional[Collection[str]] = None,
+    ) -> Iterator[str]:
+        """
+        Render a React component as a stream of HTML chunks.
+
+        Args:
+            component_name: Name of the component to render
+            props: Props to pass to the component
+            template_data: Additional template data for Jinja2 processing
+            timeout: Deadline of the complete stream in seconds
+            json_props: Templated props whose rendered value is JSON
+
+        Returns:
+            Iterator over HTML chunks, suitable for a streaming Response
+        """
+        if self._renderer is None:
+            self._init_renderer()
+
+        # Process props through Jinja2 for template-like functionality
+        if template_data:
+            processed_props = self._process_props_with_jinja(
+                props or {}, template_data, self._json_props(component_name, json_props)
+            )
+        else:
+            processed_props = props or {}
+
+        if self._renderer is None:
+            raise RuntimeError("Flask-React not properly initialized")
+
+        if signals.has_receivers():
+            return self._stream_with_signals(component_name, processed_props, timeout)
+        return self._renderer.stream_component(
+            component_name, processed_props, timeout=timeout
+        )
+
+    def render_many(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Render several React components in a single Node.js round-trip.
+
+        Args:
+            items: Sequence of (component_name, props) pairs
+            return_exceptions: Return failed items' exceptions in place
+                instead of raising the first one
+            timeout: Deadline of the whole batch in seconds
+
+        Returns:
+            Rendered HTML strings in the order of `items`
+        """
+        if self._renderer is None:
+            self._init_renderer()
+
+        if self._renderer is None:
+            raise RuntimeError("Flask-React not properly initialized")
+
+        if not signals.has_receivers():
+            return self._renderer.render_many(
+                items, return_exceptions=return_exceptions, timeout=timeout
+            )
+        payloads = [self._before_render(name, props or {}) for name, props in items]
+        started = time.perf_counter()
+        try:
+            results = self._renderer.render_many(
+                items, return_exceptions=True, timeout=timeout
+            )
+        except Exception as e:
+            self._signal_many(payloads, started, [e] * len(payloads))
+            raise
+        self._signal_many(payloads, started, results)
+        return NodeRenderer._finish_many(results, return_exceptions)
+
+    async def render_component_async(
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        template_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        json_props: Optional[Collection[str]] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+    ) -> str:
+        """
+        Render a React component to HTML string from an async view.
+
+        Args:
+            component_name: Name of the component to render
+            props: Props to pass to the component
+            template_data: Additional template data for Jinja2 processing
+            timeout: Deadline of this render in seconds
+            json_props: Templated props whose rendered value is JSON
+            max_age: Seconds cached HTML is served as fresh
+            stale_while_revalidate: Seconds after `max_age` that cached HTML
+                is still served while it is re-rendered in the background
 
         Returns:
             Rendered HTML string
@@ -123,15 +629,113 @@ class FlaskReact:
 
         # Process props through Jinja2 for template-like functionality
         if template_data:
-            processed_props = self._process_props_with_jinja(props or {}, template_data)
+            processed_props = self._process_props_with_jinja(
+                props or {}, template_data, self._json_props(component_name, json_props)
+            )
         else:
             processed_props = props or {}
 
         if self._renderer is None:
             raise RuntimeError("Flask-React not properly initialized")
 
-        result = self._renderer.render_component(component_name, processed_props)
-        return str(result)
+        options = {
+            "timeout": timeout,
+            "max_age": max_age,
+            "stale_while_revalidate": stale_while_revalidate,
+        }
+
+        memo = self._request_memo()
+        if memo is None:
+            return await self._render_or_fall_back_async(
+                component_name, processed_props, options
+            )
+        key = RenderCache.make_key(component_name, processed_props, "")
+        html = memo.get(key)
+        if html is None:
+            html = memo[key] = await self._render_or_fall_back_async(
+                component_name, processed_props, options
+            )
+        return html
+
+    async def _render_or_fall_back_async(
+        self, component_name: str, props: Dict[str, Any], options: Dict[str, Any]
+    ) -> str:
+        """Awaitable version of `_render_or_fall_back`."""
+        if self._fallback is None:
+            return await self._render_async(component_name, props, options)
+
+        shed = self._shed(component_name, props)
+        if shed is not None:
+            return shed
+        try:
+            html = await self._render_async(component_name, props, options)
+        except (RenderError, JavaScriptEngineError) as e:
+            return self._fall_back(component_name, props, e)
+        self._fallback.breaker.record_success()
+        return html
+
+    async def _render_async(
+        self, component_name: str, props: Dict[str, Any], options: Dict[str, Any]
+    ) -> str:
+        """Awaitable version of `_render`."""
+        if not signals.has_receivers():
+            return await self._renderer.render_component_async(
+                component_name, props, **options
+            )
+
+        payload = self._before_render(component_name, props)
+        started = time.perf_counter()
+        try:
+            details = await self._renderer.render_component_details_async(
+                component_name, props, **options
+            )
+        except Exception as e:
+            self._render_failed(payload, started, e)
+            raise
+        self._after_render(
+            payload, started, details.html, details.cached, details.worker
+        )
+        return details.html
+
+    async def render_many_async(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Render several React components in one round-trip from an async view.
+
+        Args:
+            items: Sequence of (component_name, props) pairs
+            return_exceptions: Return failed items' exceptions in place
+                instead of raising the first one
+            timeout: Deadline of the whole batch in seconds
+
+        Returns:
+            Rendered HTML strings in the order of `items`
+        """
+        if self._renderer is None:
+            self._init_renderer()
+
+        if self._renderer is None:
+            raise RuntimeError("Flask-React not properly initialized")
+
+        if not signals.has_receivers():
+            return await self._renderer.render_many_async(
+                items, return_exceptions=return_exceptions, timeout=timeout
+            )
+        payloads = [self._before_render(name, props or {}) for name, props in items]
+        started = time.perf_counter()
+        try:
+            results = await self._renderer.render_many_async(
+                items, return_exceptions=True, timeout=timeout
+            )
+        except Exception as e:
+            self._signal_many(payloads, started, [e] * len(payloads))
+            raise
+        self._signal_many(payloads, started, results)
+        return NodeRenderer._finish_many(results, return_exceptions)
 
     def render_template(self, component_name: str, **context) -> str:
         """
@@ -147,8 +751,118 @@ class FlaskReact:
         """
         return self.render_component(component_name, context)
 
+    def static_route(
+        self, revalidate: Optional[float] = None, query_args: Iterable[str] = ()
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Serve a view's page from disk, regenerating it once it is old.
+
+        The first GET of a URL renders the view and, if it answers 200 with
+        HTML, writes the page to FLASK_REACT_STATIC_PAGES_DIR keyed by the
+        path and the `query_args` arguments. Later requests are answered
+        from the file. Once it is older than `revalidate` seconds it is
+        still served while a background thread renders the URL again
+        through the test client, with the host of the request that found
+        it stale. Requests with other query arguments always reach the
+        view. Only use it for pages that are the same for every visitor.
+
+        Args:
+            revalidate: Seconds a page is served before it is regenerated,
+                None to keep it until `clear_static_pages`
+            query_args: Names of the query arguments that select a page
+
+        Example:
+            @app.route('/products')
+            @react.static_route(revalidate=120)
+            def products():
+                return react.render_template('ProductList', products=load())
+        """
+
+        query_args = frozenset(query_args)
+
+        def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+            @wraps(view)
+            def static_view(*args, **kwargs):
+                return self._serve_static_page(
+                    view, args, kwargs, revalidate, query_args
+                )
+
+            return static_view
+
+        return decorator
+
+    def _serve_static_page(
+        self,
+        view: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        revalidate: Optional[float],
+        query_args: Collection[str],
+    ) -> Response:
+        """Answer a `static_route` request from disk or by rendering the view."""
+        pages = self._static_pages
+        key = pages.page_key(request.path, request.args, query_args)
+        if request.method not in ("GET", "HEAD") or key is None:
+            return self.app.make_response(self.app.ensure_sync(view)(*args, **kwargs))
+
+        if getattr(self._regeneration, "key", None) != key:
+            age = pages.age(key)
+            if age is not None:
+                if revalidate is not None and age > revalidate:
+                    self._regenerate_page(key, request.url_root)
+                return send_file(pages.file_for(key), mimetype="text/html")
+
+        response = self.app.make_response(self.app.ensure_sync(view)(*args, **kwargs))
+        if (
+            response.status_code == 200
+            and response.mimetype == "text/html"
+            and not response.is_streamed
+        ):
+            try:
+                pages.store(key, response.get_data())
+            except OSError as e:
+                # A full or read-only disk costs renders, not requests
+                self.app.logger.warning("Not storing page %s: %s", key, e)
+        return response
+
+    def _regenerate_page(self, key: str, base_url: str):
+        """Render a stale page again in a background thread, one per URL."""
+        if not self._static_pages.claim(key):
+            return
+
+        def regenerate():
+            # Marks the request as the regeneration, so it renders the view
+            self._regeneration.key = key
+            try:
+                # Keeps the scheme, host and script root of external URLs
+                response = self.app.test_client().get(key, base_url=base_url)
+                if response.status_code != 200:
+                    self.app.logger.warning(
+                        "Keeping stale page %s, regenerating it answered %s",
+                        key,
+                        response.status,
+                    )
+            except Exception as e:
+                self.app.logger.warning(
+                    "Keeping stale page %s, regenerating it failed: %s", key, e
+                )
+            finally:
+                self._regeneration.key = None
+                self._static_pages.release(key)
+
+        threading.Thread(
+            target=regenerate, name="flask-react-regenerate", daemon=True
+        ).start()
+
+    def clear_static_pages(self):
+        """Remove the pages stored by `static_route` views, such as after a deploy."""
+        self._static_pages.clear()
+
     def _process_props_with_jinja(
-        self, props: Dict[str, Any], template_data: Dict[str, Any]
+        self,
+        props: Dict[str, Any],
+        template_data: Dict[str, Any],
+        json_props: Optional[Collection[str]] = None,
     ) -> Dict[str, Any]:
         """
         Process props using Jinja2 template engine for dynamic values.
@@ -156,30 +870,55 @@ class FlaskReact:
         Args:
             props: Original props
             template_data: Template context data
+            json_props: Templated props whose rendered value is JSON; the
+                others stay strings. If None, values are parsed when they
+                look like JSON and kept as strings when that fails
 
         Returns:
             Processed props
         """
-        import json
-
         processed_props = {}
 
         for key, value in props.items():
             if isinstance(value, str) and ("{{" in value or "{%" in value):
                 # Process as Jinja2 template
-                template = Template(value)
-                processed_value = template.render(**template_data)
+                processed_value = self._prop_template(value).render(**template_data)
+
+                if json_props is not None:
+                    processed_props[key] = (
+                        json.loads(processed_value)
+                        if key in json_props
+                        else processed_value
+                    )
+                    continue
 
                 # Try to parse as JSON if it looks like structured data
-                try:
-                    processed_props[key] = json.loads(processed_value)
-                except (json.JSONDecodeError, ValueError):
-                    processed_props[key] = processed_value
+                processed_props[key] = processed_value
+                if processed_value.lstrip()[:1] in _JSON_START:
+                    try:
+                        processed_props[key] = json.loads(processed_value)
+                    except ValueError:
+                        pass
             else:
                 processed_props[key] = value
 
         return processed_props
 
+    def _json_props(
+        self, component_name: str, json_props: Optional[Collection[str]]
+    ) -> Optional[Collection[str]]:
+        """Get the props declared as JSON for a render, or None if undeclared."""
+        if json_props is not None:
+            return json_props
+        return self.app.config["FLASK_REACT_JSON_PROPS"].get(component_name)
+
+    def _compile_prop_template(self, source: str) -> Template:
+        """Compile a templated prop in the app's Jinja environment."""
+        if self._props_environment is None:
+            # App filters and globals, but props are not HTML so no autoescaping
+            self._props_environment = self.app.jinja_env.overlay(autoescape=False)
+        return self._props_environment.from_string(source)
+
     def list_components(self):
         """List all available React components."""
         if self._renderer is None:
@@ -191,6 +930,43 @@ class FlaskReact:
         if self._renderer is not None:
             self._renderer.clear_cache()
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get rendered HTML cache usage, including hit and miss counters."""
+        if self._renderer is None:
+            self._init_renderer()
+        return self._renderer.cache_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get render metrics of every component.
+
+        Metrics are only recorded when FLASK_REACT_PERFORMANCE_MONITORING is on.
+
+        Returns:
+            Whether monitoring is enabled, per-component metrics, the
+            rendered HTML cache statistics and the client-side rendering
+            fallback counts, None unless FLASK_REACT_CSR_FALLBACK is on
+        """
+        if self._renderer is None:
+            self._init_renderer()
+        metrics = self._renderer.metrics
+        return {
+            "enabled": metrics is not None,
+            "components": metrics.stats() if metrics is not None else {},
+            "cache": self._renderer.cache_stats(),
+            "fallback": self._fallback.stats() if self._fallback is not None else None,
+        }
+
+    def _metrics_view(self) -> Response:
+        """Serve render metrics in the Prometheus text format."""
+        if self._renderer is None:
+            self._init_renderer()
+        text = self._renderer.metrics.prometheus(
+            self._renderer.cache_stats(),
+            self._fallback.stats() if self._fallback is not None else None,
+        )
+        return Response(text, mimetype="text/plain; version=0.0.4")
+
     def get_component_info(self, component_name: str):
         """Get information about a specific component."""
         if self._renderer is None:
@@ -214,6 +990,10 @@ def react_response(
     props: Optional[Dict[str, Any]] = None,
     status_code: int = 200,
     headers: Optional[Dict[str, str]] = None,
+    stream: bool = False,
+    timeout: Optional[float] = None,
+    max_age: Optional[float] = None,
+    stale_while_revalidate: Optional[float] = None,
 ):
     """
     Create a Flask response with rendered React component.
@@ -223,6 +1003,12 @@ def react_response(
         props: Props to pass to the component
         status_code: HTTP status code
         headers: Additional headers
+        stream: Send HTML chunks as React produces them instead of
+            buffering the whole page
+        timeout: Deadline of the render in seconds
+        max_age: Seconds cached HTML is served as fresh, ignored when streaming
+        stale_while_revalidate: Seconds after `max_age` that cached HTML is
+            still served while it is re-rendered in the background
 
     Returns:
         Flask Response object
@@ -235,7 +1021,16 @@ def react_response(
         raise FlaskReactError("Flask-React extension not initialized")
 
     # Render component
-    html = flask_react.render_component(component_name, props)
+    if stream:
+        html = flask_react.stream_component(component_name, props, timeout=timeout)
+    else:
+        html = flask_react.render_component(
+            component_name,
+            props,
+            timeout=timeout,
+            max_age=max_age,
+            stale_while_revalidate=stale_while_revalidate,
+        )
 
     # Create response
     response = Response(html, status=status_code, mimetype="text/html")
@@ -0,0 +1,154 @@
+"""
+Client-side rendering fallback for Flask-React extension.
+Serves hydration placeholders instead of failing pages while SSR is saturated.
+"""
+
+import html
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Why a placeholder was served instead of server-rendered HTML
+FALLBACK_REASONS = ("queue_depth", "queue_wait", "circuit_open", "render_error")
+
+
+def render_placeholder(component_name: str, props: Dict[str, Any]) -> str:
+    """
+    Build the container a client-side script renders a component into.
+
+    Args:
+        component_name: Name of the component
+        props: Props to hydrate the component with
+
+    Returns:
+        An empty element carrying the component name and its JSON props
+    """
+    return (
+        f'<div data-react-component="{html.escape(component_name)}" '
+        f'data-react-props="{html.escape(json.dumps(props, default=str))}"></div>'
+    )
+
+
+class CircuitBreaker:
+    """Stops sending renders to Node.js after repeated consecutive failures.
+
+    After `threshold` failures in a row the breaker opens and renders are
+    refused for `reset_timeout` seconds. Then a single trial render is let
+    through: its success closes the breaker, its failure opens it again. A
+    trial that never reports back is replaced after another `reset_timeout`.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Current state, `'closed'`, `'open'` or `'half-open'`."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial_at is not None or self._expired(self._opened_at):
+                return "half-open"
+            return "open"
+
+    def _expired(self, since: float) -> bool:
+        """Check whether `reset_timeout` passed since a moment."""
+        return time.monotonic() - since >= self.reset_timeout
+
+    def allow(self) -> bool:
+        """Check whether a render may go to Node.js, claiming the trial if so."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_at is not None:
+                if not self._expired(self._trial_at):
+                    return False
+            elif not self._expired(self._opened_at):
+                return False
+            self._trial_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        """Record a successful render, closing the breaker."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_at = None
+
+    def record_failure(self):
+        """Record a failed render, opening the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial_at = None
+
+
+class FallbackPolicy:
+    """Decides when to serve a client-side rendering placeholder and counts it."""
+
+    def __init__(
+        self,
+        max_queue_depth: Optional[int] = None,
+        max_queue_wait: Optional[float] = None,
+        breaker_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_queue_depth: Fall back while more callers than this wait for
+                a Node.js worker
+            max_queue_wait: Fall back while a caller has waited longer than
+                this many seconds for a Node.js worker
+            breaker_threshold: Consecutive failed renders that open the
+                circuit breaker
+            breaker_reset_timeout: Seconds the open breaker refuses renders
+        """
+        self.max_queue_depth = max_queue_depth
+        self.max_queue_wait = max_queue_wait
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset_timeout)
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(FALLBACK_REASONS, 0)
+
+    def shed_reason(self, waiting: int, longest_wait: float) -> Optional[str]:
+        """
+        Check whether a render should be replaced by a placeholder.
+
+        Args:
+            waiting: Callers currently waiting for a Node.js worker
+            longest_wait: Seconds the longest of them has waited
+
+        Returns:
+            The reason to fall back, or None to render on the server
+        """
+        if self.max_queue_depth is not None and waiting > self.max_queue_depth:
+            return "queue_depth"
+        if self.max_queue_wait is not None and longest_wait > self.max_queue_wait:
+            return "queue_wait"
+        # Checked last, a render let through may be the breaker's trial
+        if not self.breaker.allow():
+            return "circuit_open"
+        return None
+
+    def record(self, reason: str):
+        """Count a placeholder served for `reason`."""
+        with self._lock:
+            self._counts[reason] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of placeholders served per reason and the breaker state."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "total": sum(counts.values()),
+            "reasons": counts,
+            "circuit": self.breaker.state,
+        }
@@ -0,0 +1,93 @@
+"""
+Single-flight render coalescing for Flask-React extension.
+Concurrent identical renders share one Node.js call and all receive its result.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class SingleFlight:
+    """Runs one call per key at a time, handing its outcome to every caller.
+
+    Unlike a cache nothing is kept: the key is forgotten as soon as its call
+    finishes, so later callers start a fresh call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        # Callers that shared another caller's call instead of making their own
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Get the call in flight for a key, or register a new one to lead."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _finish(
+        self, key: str, future: Future, result: Any, error: Optional[BaseException]
+    ):
+        """Forget a finished call and hand its outcome to the waiting callers."""
+        with self._lock:
+            del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, function: Callable[[], Any], timeout: float) -> Any:
+        """
+        Make a call, or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            function: Makes the call
+            timeout: Seconds to wait for a call made by another caller
+
+        Raises:
+            TimeoutError: If another caller's call does not finish in time
+        """
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                raise TimeoutError(f"Shared call did not finish in {timeout} seconds")
+
+        try:
+            result = function()
+        except BaseException as e:
+            self._finish(key, future, None, e)
+            raise
+        self._finish(key, future, result, None)
+        return result
+
+    async def do_async(
+        self, key: str, function: Callable[[], Awaitable[Any]], timeout: float
+    ) -> Any:
+        """Awaitable version of `do`, sharing calls with sync and async callers."""
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                # Shielded, giving up must not cancel the call for the others
+                shared = asyncio.shield(asyncio.wrap_future(future))
+                return await asyncio.wait_for(shared, timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Shared call did not finish in {timeout} seconds")
+
+        try:
+            result = await function()
+        except BaseException as e:
+            self._finish(key, future, None, e)
+            raise
+        self._finish(key, future, result, None)
+        return result
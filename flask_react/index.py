@@ -0,0 +1,265 @@
+"""
+Component file index for Flask-React extension.
+Resolves component names without probing the filesystem on every render.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+# Component file extensions, in resolution order when names collide
+COMPONENT_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx")
+
+# Files a component may import, watched for changes in the whole tree
+SOURCE_EXTENSIONS = COMPONENT_EXTENSIONS + (".mjs", ".cjs", ".json")
+
+# Directory timestamps this close to a scan may hide a change made right after
+# it on filesystems with coarse timestamps
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class ComponentEntry(NamedTuple):
+    """A resolved component file and its stat at the last scan."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+class ComponentIndex:
+    """In-memory map of component names to files in a directory.
+
+    The directory is scanned once up front. Lookups of unknown names rescan
+    it, so new components are found without a watcher, and `names()` rescans
+    only when the directory itself changed. With `watch()` a polling thread
+    also notices edits to existing files, including modules in
+    subdirectories that components import, and reports them to listeners.
+    Imported files outside the directory are watched once `track()` is told
+    about them.
+    """
+
+    def __init__(
+        self, directory: Path, extensions: Sequence[str] = COMPONENT_EXTENSIONS
+    ):
+        """
+        Initialize the index and scan the directory.
+
+        Args:
+            directory: Directory containing component files
+            extensions: Component file extensions, in resolution order
+        """
+        self.directory = Path(directory)
+        self.extensions = tuple(extensions)
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ComponentEntry] = {}
+        self._files: Dict[Path, Tuple[int, int]] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._scanned_at_ns = 0
+        self._listeners: List[Callable[[List[Path]], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._recursive = False
+        # Imported files outside the directory, polled along with it
+        self._tracked: Set[Path] = set()
+        self._root = os.path.realpath(self.directory)
+
+        self.refresh()
+
+    def get(self, name: str) -> Optional[ComponentEntry]:
+        """Look up a component, rescanning once if the name is unknown."""
+        entry = self._entries.get(name)
+        if entry is None:
+            # Pick up components added since the last scan
+            self.refresh()
+            entry = self._entries.get(name)
+        return entry
+
+    def names(self) -> List[str]:
+        """Names of all components, sorted."""
+        if self._watcher is None and self._is_stale():
+            self.refresh()
+        return sorted(self._entries)
+
+    def add_listener(self, callback: Callable[[List[Path]], None]):
+        """Call `callback(changed_paths)` whenever a refresh finds changes."""
+        self._listeners.append(callback)
+
+    def refresh(self, notify: bool = True) -> List[Path]:
+        """
+        Rescan the directory.
+
+        Args:
+            notify: Report changes to listeners
+
+        Returns:
+            Paths of component files added, removed or modified since the
+            previous scan
+        """
+        with self._lock:
+            scanned_at_ns = time.time_ns()
+            dir_mtime_ns = self._stat_dir()
+            entries, files = self._scan()
+            self._stat_files(self._tracked, files)
+
+            initial = not self._scanned_at_ns
+            previous = self._files
+            changed = [
+                path
+                for path in set(previous) | set(files)
+                if previous.get(path) != files.get(path)
+            ]
+            self._entries = entries
+            self._files = files
+            self._dir_mtime_ns = dir_mtime_ns
+            self._scanned_at_ns = scanned_at_ns
+
+        if changed and notify and not initial:
+            for callback in list(self._listeners):
+                callback(sorted(changed))
+        return changed
+
+    def track(self, paths: Iterable[Path]):
+        """
+        Watch files outside the directory that components import.
+
+        Their current stat is taken as the baseline, so only later edits are
+        reported. Files inside the directory are watched anyway.
+        """
+        new = {
+            Path(path)
+            for path in paths
+            if os.path.commonpath([self._root, os.path.realpath(path)]) != self._root
+        }
+        with self._lock:
+            new -= self._tracked
+            if not new:
+                return
+            self._tracked |= new
+            self._stat_files(new, self._files)
+
+    def watch(self, interval: float = 1.0):
+        """Poll the directory for changes in a background thread."""
+        if self._watcher is not None:
+            return
+        # Start tracking the whole tree without reporting it as new
+        self._recursive = True
+        self.refresh(notify=False)
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._poll, args=(interval,), name="flask-react-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self):
+        """Stop the polling thread."""
+        self._stop.set()
+        self._watcher = None
+
+    def _poll(self, interval: float):
+        """Refresh the index every `interval` seconds until stopped."""
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception:
+                pass  # Keep watching, a listener error must not stop reloads
+
+    def _is_stale(self) -> bool:
+        """Check whether files may have been added or removed since the scan."""
+        dir_mtime_ns = self._stat_dir()
+        if dir_mtime_ns != self._dir_mtime_ns:
+            return True
+        return dir_mtime_ns is not None and (
+            dir_mtime_ns >= self._scanned_at_ns - _RACY_WINDOW_NS
+        )
+
+    def _stat_dir(self) -> Optional[int]:
+        """Modification time of the directory, or None if it does not exist."""
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _scan(self) -> Tuple[Dict[str, ComponentEntry], Dict[Path, Tuple[int, int]]]:
+        """List component files, returning the index and every watched file's stat."""
+        entries: Dict[str, ComponentEntry] = {}
+        files: Dict[Path, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.directory) as scan:
+                candidates = list(scan)
+        except OSError:
+            return entries, files
+
+        for entry in candidates:
+            name, extension = os.path.splitext(entry.name)
+            try:
+                if self._recursive and self._is_source_dir(entry):
+                    self._scan_tree(Path(entry.path), files)
+                    continue
+                if extension not in self.extensions or not entry.is_file():
+                    if self._recursive and extension in SOURCE_EXTENSIONS:
+                        stat = entry.stat()
+                        files[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue  # Removed while scanning
+
+            path = Path(entry.path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+            current = entries.get(name)
+            if current is None or self.extensions.index(
+                extension
+            ) < self.extensions.index(current.path.suffix):
+                entries[name] = ComponentEntry(path, stat.st_size, stat.st_mtime_ns)
+        return entries, files
+
+    @staticmethod
+    def _stat_files(paths: Iterable[Path], files: Dict[Path, Tuple[int, int]]):
+        """Record the stat of each existing file."""
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Deleted, reported as a change
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _is_source_dir(entry: os.DirEntry) -> bool:
+        """Check whether a directory may hold modules components import."""
+        # Symlinked directories are not followed, they may form cycles
+        return (
+            entry.is_dir(follow_symlinks=False)
+            and entry.name != "node_modules"
+            and not entry.name.startswith(".")
+        )
+
+    def _scan_tree(self, directory: Path, files: Dict[Path, Tuple[int, int]]):
+        """Record the stat of every source file below a subdirectory."""
+        try:
+            with os.scandir(directory) as scan:
+                candidates = list(scan)
+        except OSError:
+            return
+
+        for entry in candidates:
+            try:
+                if self._is_source_dir(entry):
+                    self._scan_tree(Path(entry.path), files)
+                elif os.path.splitext(entry.name)[1] in SOURCE_EXTENSIONS:
+                    stat = entry.stat()
+                    files[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
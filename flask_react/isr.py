@@ -0,0 +1,145 @@
+"""
+Incremental static regeneration for Flask-React extension.
+Keeps rendered pages on disk so they outlive the process and can be served
+as files, regenerating them in the background once they are old.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Collection, Iterator, Optional, Set, Tuple, Union
+from urllib.parse import urlencode
+
+from werkzeug.datastructures import MultiDict
+
+
+class StaticPages:
+    """Directory of rendered pages keyed by their path and query.
+
+    The number of pages is bounded: every `PRUNE_INTERVAL` writes of a
+    process, the least recently written pages beyond `max_pages` are removed.
+    """
+
+    # Writes between scans for excess pages
+    PRUNE_INTERVAL = 64
+
+    def __init__(self, directory: Union[str, Path], max_pages: int = 1000):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the pages, created on first write
+            max_pages: Maximum number of stored pages
+        """
+        self.directory = Path(directory)
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._regenerating: Set[str] = set()
+        self._writes = 0
+
+    @staticmethod
+    def page_key(
+        path: str, args: "MultiDict[str, str]", query_args: Collection[str] = ()
+    ) -> Optional[str]:
+        """
+        Build the URL identifying a page, with its query arguments sorted.
+
+        Returns:
+            The key, or None if the query has arguments not in `query_args`,
+            so arbitrary query strings cannot add pages
+        """
+        if any(name not in query_args for name in args):
+            return None
+        if not args:
+            return path
+        return f"{path}?{urlencode(sorted(args.items(multi=True)))}"
+
+    def file_for(self, key: str) -> Path:
+        """Get the file of a page."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest[2:]}.html"
+
+    def age(self, key: str) -> Optional[float]:
+        """Get the seconds since a page was written, None if it was not."""
+        try:
+            written = self.file_for(key).stat().st_mtime
+        except OSError:
+            return None
+        return max(time.time() - written, 0.0)
+
+    def store(self, key: str, html: bytes):
+        """
+        Write a page, replacing it atomically for concurrent readers.
+
+        Raises:
+            OSError: If the page cannot be written, such as on a full disk
+        """
+        path = self.file_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}"
+        )
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(html)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_INTERVAL == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Remove the least recently written pages beyond `max_pages`."""
+        pages = []
+        if self.directory.is_dir():
+            for shard in self.directory.iterdir():
+                if shard.is_dir():
+                    pages.extend(_pages_in(shard))
+        pages.sort()
+        for _, path in pages[: max(len(pages) - self.max_pages, 0)]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def claim(self, key: str) -> bool:
+        """Claim the regeneration of a page, False if one is running."""
+        with self._lock:
+            if key in self._regenerating:
+                return False
+            self._regenerating.add(key)
+            return True
+
+    def release(self, key: str):
+        """Mark the regeneration of a page as finished."""
+        with self._lock:
+            self._regenerating.discard(key)
+
+    def clear(self):
+        """Remove all pages."""
+        if self.directory.is_dir():
+            for shard in self.directory.iterdir():
+                if shard.is_dir():
+                    shutil.rmtree(shard, ignore_errors=True)
+
+
+def _pages_in(shard: Path) -> Iterator[Tuple[float, Path]]:
+    """List the (modification time, path) of the pages in a shard."""
+    for path in shard.iterdir():
+        if path.name.startswith("."):
+            continue  # Page being written
+        try:
+            yield path.stat().st_mtime, path
+        except OSError:
+            continue
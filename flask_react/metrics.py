@@ -0,0 +1,326 @@
+"""
+Render metrics for Flask-React extension.
+Collects per-component render statistics when performance monitoring is on.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+# Phases of a render as timed by ssr_server.js
+NODE_PHASES = ("load", "render", "serialize")
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Components beyond the limit are counted under this name
+OTHER_COMPONENTS = "__other__"
+
+# Per-component counters exported to Prometheus: metric, help and attribute
+_COUNTERS = (
+    ("flask_react_render_errors_total", "Failed renders", "errors"),
+    ("flask_react_cache_hits_total", "Rendered HTML cache hits", "cache_hits"),
+    ("flask_react_cache_misses_total", "Rendered HTML cache misses", "cache_misses"),
+    (
+        "flask_react_request_bytes_total",
+        "Bytes of render requests sent to Node.js",
+        "request_bytes_total",
+    ),
+    ("flask_react_html_bytes_total", "Bytes of rendered HTML", "html_bytes_total"),
+)
+
+
+def percentile(ordered: List[float], quantile: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(quantile * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class _ComponentMetrics:
+    """Counters and recent latencies of one component."""
+
+    def __init__(self, window: int):
+        self.renders = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.seconds_total = 0.0
+        self.latencies: deque = deque(maxlen=window)
+        self.request_bytes_total = 0
+        self.request_bytes_max = 0
+        self.request_samples = 0
+        self.html_bytes_total = 0
+        self.html_bytes_max = 0
+        self.node_ms_total = dict.fromkeys(NODE_PHASES, 0.0)
+        self.node_samples = dict.fromkeys(NODE_PHASES, 0)
+
+
+class RenderMetrics:
+    """Per-component render counts, latency percentiles, sizes and Node.js timings."""
+
+    def __init__(self, window: int = 1024, max_components: int = 500):
+        """
+        Initialize empty metrics.
+
+        Args:
+            window: Number of recent renders per component the latency
+                percentiles are computed over
+            max_components: Number of components tracked separately; renders
+                of any others are counted under `OTHER_COMPONENTS`, so
+                dynamic component names can't grow the metrics without bound
+        """
+        self.window = window
+        self.max_components = max_components
+        self._components: Dict[str, _ComponentMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, component_name: str) -> _ComponentMetrics:
+        """Get a component's metrics. Caller must hold the lock."""
+        metrics = self._components.get(component_name)
+        if metrics is None:
+            if len(self._components) >= self.max_components:
+                component_name = OTHER_COMPONENTS
+                metrics = self._components.get(component_name)
+            if metrics is None:
+                metrics = _ComponentMetrics(self.window)
+                self._components[component_name] = metrics
+        return metrics
+
+    def observe(
+        self, component_name: str, seconds: float, html_bytes: Optional[int] = None
+    ):
+        """
+        Record a finished render.
+
+        Args:
+            component_name: Name of the rendered component
+            seconds: Wall time of the render, including cache lookups
+            html_bytes: Size of the rendered HTML, or None if the render failed
+        """
+        with self._lock:
+            metrics = self._get(component_name)
+            metrics.renders += 1
+            metrics.seconds_total += seconds
+            metrics.latencies.append(seconds)
+            if html_bytes is None:
+                metrics.errors += 1
+                return
+            metrics.html_bytes_total += html_bytes
+            metrics.html_bytes_max = max(metrics.html_bytes_max, html_bytes)
+
+    def observe_cache(self, component_name: str, hit: bool):
+        """Record a rendered HTML cache lookup."""
+        with self._lock:
+            metrics = self._get(component_name)
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def observe_node(self, component_name: str, result: Dict[str, Any]):
+        """
+        Record the request size and phase timings reported by Node.js.
+
+        Args:
+            component_name: Name of the rendered component
+            result: Render result with `requestBytes`, `timings` holding
+                `loadMs` and `renderMs`, and `serializeMs`
+        """
+        timings = result.get("timings")
+        request_bytes = result.get("requestBytes")
+        with self._lock:
+            metrics = self._get(component_name)
+            if request_bytes is not None:
+                metrics.request_samples += 1
+                metrics.request_bytes_total += request_bytes
+                metrics.request_bytes_max = max(
+                    metrics.request_bytes_max, request_bytes
+                )
+            # Batched renders share one response, so they report no serialize time
+            reported = {
+                "load": (timings or {}).get("loadMs"),
+                "render": (timings or {}).get("renderMs"),
+                "serialize": result.get("serializeMs"),
+            }
+            for phase, ms in reported.items():
+                if ms is not None:
+                    metrics.node_samples[phase] += 1
+                    metrics.node_ms_total[phase] += ms
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get a snapshot of every component's metrics, keyed by component name."""
+        with self._lock:
+            return {
+                name: self._summarize(metrics)
+                for name, metrics in sorted(self._components.items())
+            }
+
+    @staticmethod
+    def _summarize(metrics: _ComponentMetrics) -> Dict[str, Any]:
+        """Summarize one component's metrics. Caller must hold the lock."""
+        ordered = sorted(metrics.latencies)
+        lookups = metrics.cache_hits + metrics.cache_misses
+        successes = metrics.renders - metrics.errors
+        return {
+            "renders": metrics.renders,
+            "errors": metrics.errors,
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+            "cache_hit_ratio": metrics.cache_hits / lookups if lookups else 0.0,
+            "latency_ms": {
+                "mean": (
+                    metrics.seconds_total * 1000 / metrics.renders
+                    if metrics.renders
+                    else 0.0
+                ),
+                **{
+                    f"p{int(quantile * 100)}": percentile(ordered, quantile) * 1000
+                    for quantile in QUANTILES
+                },
+            },
+            "request_bytes": {
+                "mean": (
+                    metrics.request_bytes_total / metrics.request_samples
+                    if metrics.request_samples
+                    else 0.0
+                ),
+                "max": metrics.request_bytes_max,
+            },
+            "html_bytes": {
+                "mean": metrics.html_bytes_total / successes if successes else 0.0,
+                "max": metrics.html_bytes_max,
+            },
+            "node_ms": {
+                phase: (
+                    metrics.node_ms_total[phase] / metrics.node_samples[phase]
+                    if metrics.node_samples[phase]
+                    else 0.0
+                )
+                for phase in NODE_PHASES
+            },
+        }
+
+    def reset(self):
+        """Forget all recorded metrics."""
+        with self._lock:
+            self._components.clear()
+
+    def prometheus(
+        self,
+        cache_stats: Optional[Dict[str, Any]] = None,
+        fallback_stats: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Format the metrics in the Prometheus text exposition format.
+
+        Args:
+            cache_stats: Rendered HTML cache statistics to include
+            fallback_stats: Client-side rendering fallback counts to include
+
+        Returns:
+            Metrics text, served with content type `text/plain; version=0.0.4`
+        """
+        lines: List[str] = []
+        with self._lock:
+            components = sorted(self._components.items())
+            self._latency_lines(lines, components)
+            self._counter_lines(lines, components)
+
+        if cache_stats is not None:
+            for key in ("entries", "bytes"):
+                metric = f"flask_react_cache_{key}"
+                _family(lines, metric, "gauge", f"Rendered HTML cache {key}")
+                lines.append(f"{metric} {cache_stats[key]}")
+
+        if fallback_stats is not None:
+            _fallback_lines(lines, fallback_stats)
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _latency_lines(
+        lines: List[str], components: List[Tuple[str, _ComponentMetrics]]
+    ):
+        """Add the render latency summary. Caller must hold the lock."""
+        _family(
+            lines,
+            "flask_react_render_seconds",
+            "summary",
+            "Render latency including cache lookups",
+        )
+        for name, metrics in components:
+            label = _label(name)
+            ordered = sorted(metrics.latencies)
+            for quantile in QUANTILES:
+                value = percentile(ordered, quantile)
+                lines.append(
+                    f'flask_react_render_seconds{{component="{label}",'
+                    f'quantile="{quantile}"}} {value}'
+                )
+            lines.append(
+                f'flask_react_render_seconds_sum{{component="{label}"}} '
+                f"{metrics.seconds_total}"
+            )
+            lines.append(
+                f'flask_react_render_seconds_count{{component="{label}"}} '
+                f"{metrics.renders}"
+            )
+
+    @staticmethod
+    def _counter_lines(
+        lines: List[str], components: List[Tuple[str, _ComponentMetrics]]
+    ):
+        """Add the per-component counters. Caller must hold the lock."""
+        for metric, help_text, attribute in _COUNTERS:
+            _family(lines, metric, "counter", help_text)
+            for name, metrics in components:
+                lines.append(
+                    f'{metric}{{component="{_label(name)}"}} '
+                    f"{getattr(metrics, attribute)}"
+                )
+
+        _family(
+            lines,
+            "flask_react_node_seconds_total",
+            "counter",
+            "Time Node.js spent per render phase",
+        )
+        for name, metrics in components:
+            for phase in NODE_PHASES:
+                lines.append(
+                    f'flask_react_node_seconds_total{{component="{_label(name)}",'
+                    f'phase="{phase}"}} {metrics.node_ms_total[phase] / 1000}'
+                )
+
+
+def _family(lines: List[str], name: str, kind: str, help_text: str):
+    """Add the HELP and TYPE lines of a metric family."""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _fallback_lines(lines: List[str], fallback_stats: Dict[str, Any]):
+    """Add the client-side rendering fallback counts."""
+    _family(
+        lines,
+        "flask_react_csr_fallbacks_total",
+        "counter",
+        "Placeholders served for client-side rendering instead of SSR",
+    )
+    for reason, count in fallback_stats["reasons"].items():
+        lines.append(f'flask_react_csr_fallbacks_total{{reason="{reason}"}} {count}')
+    _family(
+        lines,
+        "flask_react_circuit_open",
+        "gauge",
+        "Whether the SSR circuit breaker refuses renders",
+    )
+    circuit_open = int(fallback_stats["circuit"] != "closed")
+    lines.append(f"flask_react_circuit_open {circuit_open}")
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -3,14 +3,81 @@ Node.js-based React renderer for Flask-React extension.
 Uses Node.js subprocess to handle React SSR reliably.
 """
 
+import asyncio
+import hashlib
+import io
 import json
 import os
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from .exceptions import ComponentNotFoundError, JavaScriptEngineError, RenderError
+from .aio import AsyncNodeWorkerPool
+from .cache import CacheBackend, RenderCache
+from .index import COMPONENT_EXTENSIONS, ComponentIndex
+from .exceptions import (
+    ComponentNotFoundError,
+    JavaScriptEngineError,
+    RenderError,
+    RenderTimeoutError,
+)
+from .flight import SingleFlight
+from .metrics import RenderMetrics
+from .node_worker import (
+    Frames,
+    NodeWorkerPool,
+    WorkerLimits,
+    encode_frame,
+    read_frame,
+)
+
+
+class RenderDetails(NamedTuple):
+    """Rendered HTML and how it was produced."""
+
+    html: str
+    cached: bool
+    worker: Optional[int] = None
+
+
+class _ChunkStream:
+    """HTML chunk iterator that renders the first chunk eagerly.
+
+    Closing it, as WSGI servers do when a client disconnects, releases the
+    worker that is producing the stream.
+    """
+
+    def __init__(self, chunks: Generator[str, None, None]):
+        self._chunks = chunks
+        self._first: Optional[str] = next(chunks, None)
+
+    def __iter__(self) -> "_ChunkStream":
+        return self
+
+    def __next__(self) -> str:
+        if self._first is not None:
+            chunk, self._first = self._first, None
+            return chunk
+        return next(self._chunks)
+
+    def close(self):
+        self._chunks.close()
 
 
 class NodeRenderer:
@@ -21,24 +88,110 @@ class NodeRenderer:
         components_dir: str = "components",
         cache_enabled: bool = True,
         node_executable: str = "node",
-        timeout: int = 30,
+        timeout: float = 30,
+        persistent: bool = True,
+        pool_size: Optional[int] = None,
+        max_cache_size: int = 100,
+        max_cache_bytes: int = 32 * 1024 * 1024,
+        build_dir: Optional[str] = None,
+        babel_presets: Optional[Sequence[Any]] = None,
+        auto_reload: bool = False,
+        watch_interval: float = 1.0,
+        performance_monitoring: bool = False,
+        max_requests_per_worker: Optional[int] = None,
+        max_worker_rss_mb: Optional[int] = None,
+        max_old_space_size: Optional[int] = None,
+        component_timeouts: Optional[Dict[str, float]] = None,
+        coalesce_renders: bool = True,
+        cache_backend: Optional[CacheBackend] = None,
+        transpile_cache_dir: Optional[str] = None,
+        transpile_cache_max_bytes: int = 256 * 1024 * 1024,
     ):
         """
         Initialize the Node.js-based React renderer.
 
         Args:
             components_dir: Directory containing React components
-            cache_enabled: Whether to cache compiled components
+            cache_enabled: Whether to cache compiled components and rendered HTML
             node_executable: Path to Node.js executable
-            timeout: Timeout for Node.js processes in seconds
+            timeout: Default deadline of a render in seconds
+            persistent: Keep long-lived Node.js workers instead of starting
+                a new process for every render
+            pool_size: Number of persistent workers, defaults to the CPU count
+            max_cache_size: Maximum number of cached renders
+            max_cache_bytes: Maximum total size of cached HTML in bytes
+            build_dir: Directory of components prebuilt by `flask-react build`;
+                when set, components are loaded from it and Babel is disabled
+            babel_presets: Babel presets for runtime JSX transformation
+            auto_reload: Watch the components directory and the files
+                components import for changes
+            watch_interval: Seconds between checks for changed components
+            performance_monitoring: Record per-component render metrics
+            max_requests_per_worker: Replace a persistent worker after this
+                many requests
+            max_worker_rss_mb: Replace a persistent worker whose resident
+                memory exceeds this many MB (Linux only)
+            max_old_space_size: V8 heap limit of persistent workers in MB
+            component_timeouts: Deadlines in seconds of specific components,
+                overriding `timeout`
+            coalesce_renders: Let concurrent renders of the same component
+                and props share one Node.js call
+            cache_backend: Store of rendered HTML, such as a `FileSystemCache`
+                shared with other processes; defaults to an in-memory
+                `RenderCache` of `max_cache_size` and `max_cache_bytes`
+            transpile_cache_dir: Directory of components transpiled by Babel,
+                shared by workers and deploys; defaults to the cache of
+                @babel/register
+            transpile_cache_max_bytes: Size of the transpile cache beyond which
+                the least recently used entries are removed
         """
         self.components_dir = Path(components_dir)
+        self.build_dir = Path(build_dir) if build_dir else None
+        self.babel_presets = list(babel_presets) if babel_presets else None
+        self.transpile_cache_dir = transpile_cache_dir
+        self.transpile_cache_max_bytes = transpile_cache_max_bytes
         self.cache_enabled = cache_enabled
+        self.auto_reload = auto_reload
         self.node_executable = node_executable
         self.timeout = timeout
+        self.component_timeouts = dict(component_timeouts or {})
+        self.persistent = persistent
+        self.pool_size = pool_size
+        self.worker_limits = WorkerLimits(
+            max_requests_per_worker, max_worker_rss_mb, max_old_space_size
+        )
+        self._transport: Optional[Any] = None
+        self._async_transport: Optional[Any] = None
+        self.metrics = RenderMetrics() if performance_monitoring else None
+        self._flights = SingleFlight() if coalesce_renders else None
+
+        # Rendered HTML keyed by component, props and component source hash
+        if cache_backend is None:
+            cache_backend = RenderCache(max_cache_size, max_cache_bytes)
+        self._component_cache = cache_backend
+        # Keys of stale renders being refreshed in the background
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set["asyncio.Task[None]"] = set()
+        self._refresh_lock = threading.Lock()
+
+        # Source hashes by file, with the modification time and size they hash
+        self._hashes: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        # Project files each component imports, as reported by Node.js, and
+        # the components importing each of those files
+        self._dependencies: Dict[Path, Tuple[Path, ...]] = {}
+        self._dependents: Dict[Path, Set[Path]] = {}
+        # Versions by component, kept until the watcher reports a change
+        self._versions: Dict[Path, str] = {}
+        self._graph_lock = threading.Lock()
 
-        self._component_cache: Dict[str, str] = {}
-        self._component_mtimes: Dict[str, float] = {}
+        # Component names resolved to files once, instead of probing every render
+        if self.build_dir is not None:
+            self._index = ComponentIndex(self.build_dir, extensions=(".js",))
+        else:
+            self._index = ComponentIndex(self.components_dir)
+        if auto_reload:
+            self._index.add_listener(self._reload_changed)
+            self._index.watch(watch_interval)
 
         # Ensure Node.js is available
         self._check_node_availability()
@@ -89,6 +242,8 @@ class NodeRenderer:
         self._create_fallback_ssr_script(temp_dir)
         # Mark this as a temporary script that should be cleaned up
         self._is_temp_script = True
+        # The fallback script only supports one-shot rendering
+        self.persistent = False
 
     def _create_fallback_ssr_script(self, project_root):
         """Create a fallback SSR script if the main one isn't found."""
@@ -97,7 +252,10 @@ const React = require('react');
 const { renderToString } = require('react-dom/server');
 
 // Get cache setting from command line arguments or default to true
-const cacheEnabled = process.argv[4] === 'true' || process.argv[4] === undefined;
+const cacheEnabled = !process.argv.includes('--no-cache');
+
+// stdout carries the response, so keep component logging off it
+console.log = console.error;
 
 // Setup Babel for JSX transformation
 try {
@@ -163,29 +321,27 @@ function renderComponent(componentPath, props) {
     }
 }
 
-// Handle command line arguments
-// argv[2] = componentPath, argv[3] = propsJson, argv[4] = cacheEnabled
-if (process.argv.length >= 3) {
-    const componentPath = process.argv[2];
-    const propsJson = process.argv[3] || '{}';
-    
-    try {
-        const props = JSON.parse(propsJson);
-        const result = renderComponent(componentPath, props);
-        console.log(JSON.stringify(result));
-        process.exit(result.success ? 0 : 1);
-    } catch (parseError) {
-        console.log(JSON.stringify({
-            success: false,
-            html: null,
-            error: { 
-                message: `Invalid JSON props: ${parseError.message}`,
-                stack: parseError.stack
-            }
-        }));
-        process.exit(1);
+// Read framed requests from stdin until it is closed. Each frame is a
+// 4-byte big-endian length followed by that many bytes of UTF-8 JSON.
+const chunks = [];
+process.stdin.on('data', (chunk) => chunks.push(chunk));
+process.stdin.on('end', () => {
+    let input = Buffer.concat(chunks);
+    while (input.length >= 4 && input.length >= 4 + input.readUInt32BE(0)) {
+        const length = input.readUInt32BE(0);
+        const message = JSON.parse(input.subarray(4, 4 + length).toString('utf8'));
+        input = input.subarray(4 + length);
+
+        const result = Object.assign(
+            { id: message.id },
+            renderComponent(message.component, message.props)
+        );
+        const body = Buffer.from(JSON.stringify(result), 'utf8');
+        const header = Buffer.alloc(4);
+        header.writeUInt32BE(body.length, 0);
+        process.stdout.write(Buffer.concat([header, body]));
     }
-}
+});
 """
 
         self.ssr_script_path = project_root / "flask_react_ssr_temp.js"
@@ -193,7 +349,12 @@ if (process.argv.length >= 3) {
             f.write(ssr_script_content)
 
     def render_component(
-        self, component_name: str, props: Optional[Dict[str, Any]] = None
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
     ) -> str:
         """
         Render a React component to HTML string using Node.js.
@@ -201,87 +362,1127 @@ if (process.argv.length >= 3) {
         Args:
             component_name: Name of the component to render
             props: Props to pass to the component
+            timeout: Deadline of this render in seconds, defaults to the
+                component's configured timeout
+            max_age: Seconds cached HTML is served as fresh
+            stale_while_revalidate: Seconds after `max_age` that cached HTML
+                is still served while it is re-rendered in the background
+
+        Returns:
+            Rendered HTML string
+
+        Raises:
+            ComponentNotFoundError: If component file is not found
+            RenderTimeoutError: If the render misses its deadline
+            RenderError: If rendering fails
+        """
+        return self.render_component_details(
+            component_name, props, timeout, max_age, stale_while_revalidate
+        ).html
+
+    def render_component_details(
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+    ) -> RenderDetails:
+        """
+        Render a React component, reporting where the HTML came from.
+
+        Args:
+            component_name: Name of the component to render
+            props: Props to pass to the component
+            timeout: Deadline of this render in seconds
+            max_age: Seconds cached HTML is served as fresh
+            stale_while_revalidate: Seconds after `max_age` that cached HTML
+                is still served while it is re-rendered in the background
+
+        Returns:
+            The rendered HTML, whether it was served from the cache and the
+            process id of the Node.js worker that rendered it
+
+        Raises:
+            ComponentNotFoundError: If component file is not found
+            RenderError: If rendering fails
+        """
+        started = time.perf_counter()
+        try:
+            details = self._render_cached(
+                component_name, props or {}, timeout, max_age, stale_while_revalidate
+            )
+        except Exception:
+            self._observe(component_name, started, None)
+            raise
+        self._observe(component_name, started, details.html)
+        return details
+
+    def _render_cached(
+        self,
+        component_name: str,
+        props: Dict[str, Any],
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+    ) -> RenderDetails:
+        """Render a component unless its HTML is cached."""
+        component_file, cache_key = self._resolve(component_name, props, fetch=True)
+
+        def render() -> RenderDetails:
+            return self._render_file(component_name, component_file, props, timeout)
+
+        ttl = self._cache_ttl(max_age, stale_while_revalidate)
+        if max_age is None:
+            cached_html = self._cached_html(component_name, cache_key)
+        else:
+            cached_html, stale = self._cached_html_within(
+                component_name, cache_key, max_age, stale_while_revalidate
+            )
+            if stale:
+                self._revalidate(component_name, cache_key, render, ttl)
+        if cached_html is not None:
+            return RenderDetails(cached_html, cached=True)
+
+        if self._flights is None:
+            details = render()
+        else:
+            timeout = self._timeout_for(component_name, timeout)
+            try:
+                details = self._flights.do(
+                    self._flight_key(component_name, props, cache_key),
+                    render,
+                    timeout,
+                )
+            except TimeoutError as e:
+                raise self._render_error(e, component_name, timeout)
+        self._store(cache_key, component_name, component_file, props, details.html, ttl)
+        return details
+
+    @staticmethod
+    def _cache_ttl(
+        max_age: Optional[float], stale_while_revalidate: Optional[float]
+    ) -> Optional[float]:
+        """Get how long to keep a render, None for the cache's own TTL."""
+        if max_age is None:
+            return None
+        return max_age + (stale_while_revalidate or 0)
+
+    def _cached_html_within(
+        self,
+        component_name: str,
+        cache_key: Optional[str],
+        max_age: float,
+        stale_while_revalidate: Optional[float],
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Look up a component's rendered HTML that is fresh or may be served stale.
+
+        Returns:
+            The cached HTML or None, and whether it is stale and should be
+            re-rendered in the background
+        """
+        if cache_key is None:
+            self._count_unkeyed_miss(component_name)
+            return None, False
+        entry = self._component_cache.get_with_age(
+            cache_key, self._cache_ttl(max_age, stale_while_revalidate)
+        )
+        if self.metrics is not None:
+            self.metrics.observe_cache(component_name, entry is not None)
+        if entry is None:
+            return None, False
+        html, age = entry
+        return html, age > max_age
+
+    def _claim_refresh(self, cache_key: str) -> bool:
+        """Claim the background refresh of a key, False if one is running."""
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return False
+            self._refreshing.add(cache_key)
+            return True
+
+    def _revalidate(
+        self,
+        component_name: str,
+        cache_key: str,
+        render: Callable[[], RenderDetails],
+        ttl: Optional[float],
+    ):
+        """Re-render stale HTML in a background thread, one per key at a time."""
+        if not self._claim_refresh(cache_key):
+            return
+
+        def refresh():
+            started = time.perf_counter()
+            try:
+                details = render()
+            except Exception:
+                # The stale HTML is served until it expires or a refresh succeeds
+                self._observe(component_name, started, None)
+                return
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+            self._component_cache.set(cache_key, details.html, ttl)
+            self._observe(component_name, started, details.html)
+
+        threading.Thread(
+            target=refresh, name="flask-react-revalidate", daemon=True
+        ).start()
+
+    def cached_render(
+        self, component_name: str, props: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get a component's rendered HTML from the cache without rendering it.
+
+        Returns:
+            The cached HTML, or None if it is not cached or the component
+            does not exist
+        """
+        try:
+            _, cache_key = self._resolve(component_name, props or {})
+        except ComponentNotFoundError:
+            return None
+        return self._cached_html(component_name, cache_key)
+
+    def queue_stats(self) -> Tuple[int, float]:
+        """
+        Get how congested the persistent workers are.
+
+        Async renders are pipelined rather than queued, so those in flight
+        beyond one per worker count as waiting.
+
+        Returns:
+            The number of callers waiting for a worker and the seconds the
+            longest of them has waited so far
+        """
+        transports = [
+            transport
+            for transport in (self._transport, self._async_transport)
+            if transport is not None
+        ]
+        waiting = sum(transport.waiting for transport in transports)
+        longest_wait = max(
+            (transport.longest_wait for transport in transports), default=0.0
+        )
+        return waiting, longest_wait
+
+    def render_many(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Render several React components in a single Node.js round-trip.
+
+        Args:
+            items: Sequence of (component_name, props) pairs
+            return_exceptions: Put each failed item's exception in its place
+                in the results instead of raising the first one
+            timeout: Deadline of the whole batch in seconds, defaults to the
+                longest configured timeout of its components
+
+        Returns:
+            Rendered HTML strings in the order of `items`
+
+        Raises:
+            ComponentNotFoundError: If a component file is not found
+            RenderError: If rendering an item fails
+        """
+        started = time.perf_counter()
+        results, pending = self._plan_many(items, fetch=True)
+        if pending:
+            if self.persistent:
+                rendered = self._render_batch(pending, timeout)
+            else:
+                rendered = []
+                for _, component_name, component_file, props, _ in pending:
+                    try:
+                        rendered.append(
+                            self._render_file(
+                                component_name, component_file, props, timeout
+                            ).html
+                        )
+                    except RenderError as e:
+                        rendered.append(e)
+            self._fill_many(results, pending, rendered)
+        self._observe_many(items, started, results)
+        return self._finish_many(results, return_exceptions)
+
+    async def render_component_async(
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+    ) -> str:
+        """
+        Render a React component without blocking the event loop.
+
+        Many renders can be in flight at once; they are spread over the
+        persistent workers and pipelined on each of them.
+
+        Args:
+            component_name: Name of the component to render
+            props: Props to pass to the component
+            timeout: Deadline of this render in seconds
+            max_age: Seconds cached HTML is served as fresh
+            stale_while_revalidate: Seconds after `max_age` that cached HTML
+                is still served while it is re-rendered in a background task
 
         Returns:
             Rendered HTML string
 
+        Raises:
+            ComponentNotFoundError: If component file is not found
+            RenderTimeoutError: If the render misses its deadline
+            RenderError: If rendering fails
+        """
+        details = await self.render_component_details_async(
+            component_name, props, timeout, max_age, stale_while_revalidate
+        )
+        return details.html
+
+    async def render_component_details_async(
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+    ) -> RenderDetails:
+        """Awaitable version of `render_component_details`."""
+        if not self.persistent:
+            # One-shot processes block, keep them off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.render_component_details,
+                component_name,
+                props,
+                timeout,
+                max_age,
+                stale_while_revalidate,
+            )
+
+        started = time.perf_counter()
+        try:
+            details = await self._render_cached_async(
+                component_name, props or {}, timeout, max_age, stale_while_revalidate
+            )
+        except Exception:
+            self._observe(component_name, started, None)
+            raise
+        self._observe(component_name, started, details.html)
+        return details
+
+    async def _render_cached_async(
+        self,
+        component_name: str,
+        props: Dict[str, Any],
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+    ) -> RenderDetails:
+        """Render a component on the asyncio transport unless its HTML is cached."""
+        component_file, cache_key = self._resolve(component_name, props)
+        timeout = self._timeout_for(component_name, timeout)
+
+        async def render() -> RenderDetails:
+            return await self._render_file_async(
+                component_name, component_file, props, timeout
+            )
+
+        ttl = self._cache_ttl(max_age, stale_while_revalidate)
+        if max_age is None:
+            cached_html = self._cached_html(component_name, cache_key)
+        else:
+            cached_html, stale = self._cached_html_within(
+                component_name, cache_key, max_age, stale_while_revalidate
+            )
+            if stale:
+                self._revalidate_async(component_name, cache_key, render, ttl)
+        if cached_html is not None:
+            return RenderDetails(cached_html, cached=True)
+
+        if self._flights is None:
+            details = await render()
+        else:
+            try:
+                details = await self._flights.do_async(
+                    self._flight_key(component_name, props, cache_key),
+                    render,
+                    timeout,
+                )
+            except TimeoutError as e:
+                raise self._render_error(e, component_name, timeout)
+        self._store(cache_key, component_name, component_file, props, details.html, ttl)
+        return details
+
+    def _revalidate_async(
+        self,
+        component_name: str,
+        cache_key: str,
+        render: Callable[[], Awaitable[RenderDetails]],
+        ttl: Optional[float],
+    ):
+        """Re-render stale HTML in a task on the running loop, one per key."""
+        if not self._claim_refresh(cache_key):
+            return
+
+        async def refresh():
+            started = time.perf_counter()
+            try:
+                details = await render()
+            except Exception:
+                self._observe(component_name, started, None)
+                return
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+                self._refresh_tasks.discard(task)
+            self._component_cache.set(cache_key, details.html, ttl)
+            self._observe(component_name, started, details.html)
+
+        # Referenced until done, the loop only keeps weak references to tasks
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refresh_tasks.add(task)
+
+    async def _render_file_async(
+        self,
+        component_name: str,
+        component_file: Path,
+        props: Dict[str, Any],
+        timeout: float,
+    ) -> RenderDetails:
+        """Render a resolved component file on the asyncio transport."""
+        message = {
+            "type": "render",
+            "component": str(component_file.absolute()),
+            "props": props,
+        }
+        dependencies = self._needs_dependencies(component_file)
+        if dependencies:
+            message["dependencies"] = True
+        try:
+            result = await self._get_async_transport().request(message, timeout=timeout)
+            self._observe_node(component_name, result)
+            html = self._html_from_result(result)
+            if dependencies:
+                self._record_dependencies(component_file, result)
+        except Exception as e:
+            raise self._render_error(e, component_name, timeout)
+        return RenderDetails(html, cached=False, worker=result.get("worker"))
+
+    @staticmethod
+    def _flight_key(
+        component_name: str, props: Dict[str, Any], cache_key: Optional[str]
+    ) -> str:
+        """Identify a render for coalescing, reusing its cache key if it has one."""
+        if cache_key is not None:
+            return cache_key
+        return RenderCache.make_key(component_name, props, "")
+
+    async def render_many_async(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Render several React components in one round-trip without blocking.
+
+        Args:
+            items: Sequence of (component_name, props) pairs
+            return_exceptions: Put each failed item's exception in its place
+                in the results instead of raising the first one
+            timeout: Deadline of the whole batch in seconds
+
+        Returns:
+            Rendered HTML strings in the order of `items`
+        """
+        if not self.persistent:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.render_many, items, return_exceptions, timeout
+            )
+
+        started = time.perf_counter()
+        results, pending = self._plan_many(items)
+        if pending:
+            timeout = self._batch_timeout(pending, timeout)
+            message = self._batch_message(pending)
+            try:
+                response = await self._get_async_transport().request(
+                    message, timeout=timeout
+                )
+                rendered = self._batch_results(response, pending, message)
+            except Exception as e:
+                rendered = [self._render_error(e, timeout=timeout)] * len(pending)
+            self._fill_many(results, pending, rendered)
+        self._observe_many(items, started, results)
+        return self._finish_many(results, return_exceptions)
+
+    def _plan_many(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        fetch: bool = False,
+    ):
+        """Resolve batch items, answering what can be from the cache.
+
+        Returns the results list with cached HTML and lookup errors filled in,
+        and the (index, name, file, props, cache_key) of items left to render.
+        """
+        results: List[Any] = [None] * len(items)
+        pending: List[Tuple[int, str, Path, Dict[str, Any], Optional[str]]] = []
+
+        for index, (component_name, props) in enumerate(items):
+            try:
+                component_file, cache_key = self._resolve(
+                    component_name, props or {}, fetch
+                )
+            except ComponentNotFoundError as e:
+                results[index] = e
+                continue
+            cached_html = self._cached_html(component_name, cache_key)
+            if cached_html is not None:
+                results[index] = cached_html
+                continue
+            pending.append(
+                (index, component_name, component_file, props or {}, cache_key)
+            )
+        return results, pending
+
+    def _fill_many(self, results: List[Any], pending: List[Tuple], rendered: List[Any]):
+        """Put rendered batch items in place and cache the successful ones."""
+        for (index, name, component_file, props, cache_key), html in zip(
+            pending, rendered
+        ):
+            results[index] = html
+            if isinstance(html, str):
+                self._store(cache_key, name, component_file, props, html)
+
+    @staticmethod
+    def _finish_many(results: List[Any], return_exceptions: bool) -> List[Any]:
+        """Raise the first failed batch item unless exceptions are returned."""
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def _cached_html(
+        self, component_name: str, cache_key: Optional[str]
+    ) -> Optional[str]:
+        """Look up a component's rendered HTML, counting the lookup."""
+        if cache_key is None:
+            self._count_unkeyed_miss(component_name)
+            return None
+        html = self._component_cache.get(cache_key)
+        if self.metrics is not None:
+            self.metrics.observe_cache(component_name, html is not None)
+        return html
+
+    def _count_unkeyed_miss(self, component_name: str):
+        """Count a miss for a cached component whose key is not known yet."""
+        if self._caching():
+            self._component_cache.record_miss()
+            if self.metrics is not None:
+                self.metrics.observe_cache(component_name, False)
+
+    def _observe(self, component_name: str, started: float, html: Optional[str]):
+        """Record a finished render, or a failed one if `html` is None."""
+        if self.metrics is not None:
+            self.metrics.observe(
+                component_name,
+                time.perf_counter() - started,
+                None if html is None else len(html.encode("utf-8")),
+            )
+
+    def _observe_many(
+        self,
+        items: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        started: float,
+        results: List[Any],
+    ):
+        """Record batch items, each taking as long as the whole batch."""
+        if self.metrics is not None:
+            for (component_name, _), html in zip(items, results):
+                self._observe(
+                    component_name, started, html if isinstance(html, str) else None
+                )
+
+    def _observe_node(self, component_name: str, result: Dict[str, Any]):
+        """Record the timings Node.js reported for a render."""
+        if self.metrics is not None:
+            self.metrics.observe_node(component_name, result)
+
+    def stream_component(
+        self,
+        component_name: str,
+        props: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        Render a React component as a stream of HTML chunks.
+
+        The component is resolved and its shell rendered before this returns,
+        so errors surface here rather than halfway through a response.
+
+        Args:
+            component_name: Name of the component to render
+            props: Props to pass to the component
+            timeout: Deadline of the complete stream in seconds
+
+        Returns:
+            Iterator over HTML chunks
+
         Raises:
             ComponentNotFoundError: If component file is not found
             RenderError: If rendering fails
         """
-        # Find component file
+        started = time.perf_counter()
+        try:
+            component_file, cache_key = self._resolve(
+                component_name, props or {}, fetch=True
+            )
+            html = self._cached_html(component_name, cache_key)
+            # One-shot processes can't stream, render in a single piece
+            if html is None and not self.persistent:
+                props = props or {}
+                html = self._render_file(
+                    component_name, component_file, props, timeout
+                ).html
+                self._store(cache_key, component_name, component_file, props, html)
+        except Exception:
+            self._observe(component_name, started, None)
+            raise
+        if html is not None:
+            self._observe(component_name, started, html)
+            return iter([html])
+
+        chunks = self._stream_file(
+            component_name,
+            component_file,
+            props or {},
+            cache_key,
+            started,
+            self._timeout_for(component_name, timeout),
+        )
+        return _ChunkStream(chunks)
+
+    def _stream_file(
+        self,
+        component_name: str,
+        component_file: Path,
+        props: Dict[str, Any],
+        cache_key: Optional[str],
+        started: float,
+        timeout: float,
+    ) -> Generator[str, None, None]:
+        """Stream a resolved component file through a persistent worker."""
+        message = {
+            "type": "stream",
+            "component": str(component_file.absolute()),
+            "props": props,
+        }
+        dependencies = self._needs_dependencies(component_file)
+        if dependencies:
+            message["dependencies"] = True
+        # Keep the chunks for the cache only while they could fit in it
+        cacheable = cache_key is not None or dependencies
+        parts: Optional[List[str]] = [] if cacheable else None
+        size = html_bytes = 0
+
+        try:
+            frames = self._get_transport().stream(message, timeout=timeout)
+            for chunk in self._frame_chunks(frames, component_file, dependencies):
+                if self.metrics is not None:
+                    html_bytes += len(chunk.encode("utf-8"))
+                if parts is not None:
+                    size += len(chunk)
+                    if size > self._component_cache.max_bytes:
+                        parts = None
+                    else:
+                        parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._observe(component_name, started, None)
+            raise self._render_error(e, component_name, timeout)
+
+        if self.metrics is not None:
+            self.metrics.observe(
+                component_name, time.perf_counter() - started, html_bytes
+            )
+        if parts is not None:
+            html = "".join(parts)
+            self._store(cache_key, component_name, component_file, props, html)
+
+    def _frame_chunks(
+        self, frames: Frames, component_file: Path, dependencies: bool
+    ) -> Generator[str, None, None]:
+        """Yield the HTML chunks of streamed frames, raising on a failed frame."""
+        for frame in frames:
+            if not frame.get("success", True):
+                error_msg = frame.get("error", {}).get(
+                    "message", "Unknown rendering error"
+                )
+                raise RenderError(f"Component rendering failed: {error_msg}")
+            if dependencies and "chunk" not in frame:
+                self._record_dependencies(component_file, frame)
+            if frame.get("chunk"):
+                yield frame["chunk"]
+
+    def _resolve(
+        self, component_name: str, props: Dict[str, Any], fetch: bool = False
+    ) -> Tuple[Path, Optional[str]]:
+        """
+        Find a component's file and the cache key of its rendered HTML.
+
+        Until a render reports the component's imports there is no key. With
+        a cache shared by other processes, `fetch` asks Node.js for them
+        first so this process can use renders the others stored.
+        """
         component_file = self._find_component_file(component_name)
         if component_file is None:
             raise ComponentNotFoundError(
                 f"Component '{component_name}' not found in {self.components_dir}"
             )
 
+        fetch = fetch and self._component_cache.name != "memory"
         try:
-            # Prepare command line arguments
-            component_path = str(component_file.absolute())
-            props_json = json.dumps(props or {})
-            cache_enabled = str(self.cache_enabled).lower()
-
-            # Run Node.js SSR script with command line arguments
-            # Set working directory to project root so Node.js can find dependencies
-            project_root = Path(__file__).parent.parent
-            process = subprocess.run(
-                [
-                    self.node_executable,
-                    str(self.ssr_script_path),
-                    component_path,
-                    props_json,
-                    cache_enabled,
-                ],
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                timeout=self.timeout,
-                cwd=str(project_root),  # Set working directory
+            cache_key = self._cache_key(component_name, component_file, props, fetch)
+        except FileNotFoundError:
+            # Deleted since it was indexed
+            self._index.refresh()
+            raise ComponentNotFoundError(
+                f"Component '{component_name}' not found in {self.components_dir}"
             )
+        return component_file, cache_key
+
+    def _caching(self) -> bool:
+        """Check whether rendered HTML is cached."""
+        return self.cache_enabled and self._component_cache.max_entries > 0
+
+    def _cache_key(
+        self,
+        component_name: str,
+        component_file: Path,
+        props: Dict[str, Any],
+        fetch: bool = False,
+    ) -> Optional[str]:
+        """Build the cache key of a render, None while its imports are unknown."""
+        if not self._caching():
+            return None
+        version = self._component_version(component_file, fetch)
+        if version is None:
+            return None
+        return RenderCache.make_key(component_name, props, version)
+
+    def _store(
+        self,
+        cache_key: Optional[str],
+        component_name: str,
+        component_file: Path,
+        props: Dict[str, Any],
+        html: str,
+        ttl: Optional[float] = None,
+    ):
+        """Cache rendered HTML, keyed now if the render reported its imports."""
+        if cache_key is None:
+            try:
+                cache_key = self._cache_key(component_name, component_file, props)
+            except OSError:
+                return
+        if cache_key is not None:
+            self._component_cache.set(cache_key, html, ttl)
+
+    def _needs_dependencies(self, component_file: Path) -> bool:
+        """Check whether a render should report the component's imports."""
+        # They make up the cache key and are watched for changes
+        return (
+            self._caching() or self.auto_reload
+        ) and component_file not in self._dependencies
+
+    def _component_version(
+        self, component_file: Path, fetch: bool = False
+    ) -> Optional[str]:
+        """
+        Identify the current version of a component and everything it imports.
+
+        The version hashes the content of the component's file and of the
+        project files it imports, directly or not, so processes and hosts
+        sharing a cache agree on it whatever the files' modification times.
+        It is computed once, when the workers have loaded the component, and
+        kept until the watcher evicts a changed file from them: without
+        `auto_reload` the workers keep rendering the modules they loaded, so
+        edits must not change the key their HTML is cached under.
+
+        Args:
+            component_file: Component's file
+            fetch: Ask Node.js for imports no render reported yet
+
+        Returns:
+            The version, or None while the imports are unknown
+        """
+        with self._graph_lock:
+            version = self._versions.get(component_file)
+        if version is not None:
+            return version
+
+        own_hash = self._file_hash(component_file)
+        dependencies = self._component_dependencies(component_file, fetch)
+        if dependencies is None:
+            return None
+        digest = hashlib.sha256(own_hash.encode("ascii"))
+        for dependency in dependencies:
+            try:
+                digest.update(self._file_hash(dependency).encode("ascii"))
+            except OSError:
+                digest.update(b"missing")
+        version = digest.hexdigest()[:16]
+        with self._graph_lock:
+            # Unless the watcher dropped the imports while hashing
+            if self._dependencies.get(component_file) is dependencies:
+                self._versions[component_file] = version
+        return version
 
-            stdout = process.stdout
-            stderr = process.stderr
+    def _file_hash(self, path: Path) -> str:
+        """Hash a file's content, only re-reading it when its mtime or size changes."""
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        known = self._hashes.get(path)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        file_hash = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+        self._hashes[path] = (stamp, file_hash)
+        return file_hash
 
-            if process.returncode != 0:
-                error_msg = stderr if stderr else "Unknown Node.js error"
-                # Add more debugging information
-                debug_info = f"Return code: {process.returncode}, stdout: '{stdout}', stderr: '{stderr}'"
-                raise RenderError(
-                    f"Node.js process failed: {error_msg}. Debug info: {debug_info}"
+    def _component_dependencies(
+        self, component_file: Path, fetch: bool = False
+    ) -> Optional[Tuple[Path, ...]]:
+        """Get the project files a component imports, as reported by Node.js."""
+        with self._graph_lock:
+            dependencies = self._dependencies.get(component_file)
+        if dependencies is not None or not fetch:
+            return dependencies
+
+        message = {"type": "dependencies", "component": str(component_file.absolute())}
+        try:
+            if self.persistent:
+                result = self._get_transport().request(message, timeout=self.timeout)
+            else:
+                result = self._run_once(message, self.timeout)
+        except Exception:
+            return None
+        return self._record_dependencies(component_file, result)
+
+    def _record_dependencies(
+        self, component_file: Path, result: Dict[str, Any]
+    ) -> Optional[Tuple[Path, ...]]:
+        """Record the imports reported by Node.js in the graph and its reverse index."""
+        if not result.get("success"):
+            return None
+        # The fallback script renders instead of reporting, leaving only the file
+        dependencies = tuple(Path(path) for path in result.get("dependencies") or ())
+        with self._graph_lock:
+            self._forget_dependencies(component_file)
+            self._dependencies[component_file] = dependencies
+            for dependency in dependencies:
+                self._dependents.setdefault(dependency, set()).add(component_file)
+        if self.auto_reload:
+            # Imports from outside the components directory, such as ../shared
+            self._index.track(dependencies)
+        return dependencies
+
+    def _forget_dependencies(self, component_file: Path):
+        """Drop a component and its version from the graph, with the lock held."""
+        self._versions.pop(component_file, None)
+        for dependency in self._dependencies.pop(component_file, ()):
+            importers = self._dependents.get(dependency)
+            if importers is not None:
+                importers.discard(component_file)
+                if not importers:
+                    del self._dependents[dependency]
+
+    def _render_file(
+        self,
+        component_name: str,
+        component_file: Path,
+        props: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> RenderDetails:
+        """Render a resolved component file through Node.js."""
+        timeout = self._timeout_for(component_name, timeout)
+        try:
+            component_path = str(component_file.absolute())
+            dependencies = self._needs_dependencies(component_file)
+            if self.persistent:
+                result = self._render_with_worker(
+                    component_path, props, timeout, dependencies=dependencies
+                )
+            else:
+                result = self._render_with_subprocess(
+                    component_path, props, timeout, dependencies=dependencies
                 )
+            self._observe_node(component_name, result)
+            html = self._html_from_result(result)
+            if dependencies:
+                self._record_dependencies(component_file, result)
+            return RenderDetails(html, cached=False, worker=result.get("worker"))
 
-            # Parse result
+        except Exception as e:
+            raise self._render_error(e, component_name, timeout)
+
+    def _timeout_for(
+        self, component_name: str, timeout: Optional[float] = None
+    ) -> float:
+        """Get the deadline of a render, from the call or the configuration."""
+        if timeout is not None:
+            return timeout
+        return self.component_timeouts.get(component_name, self.timeout)
+
+    def _batch_timeout(self, pending: List[Tuple], timeout: Optional[float]) -> float:
+        """Get the deadline of a batch, long enough for its slowest component."""
+        if timeout is not None:
+            return timeout
+        return max(self._timeout_for(item[1]) for item in pending)
+
+    def _render_batch(
+        self, pending: List[Tuple], timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Render resolved batch items in one message to a persistent worker."""
+        timeout = self._batch_timeout(pending, timeout)
+        message = self._batch_message(pending)
+        try:
+            response = self._get_transport().request(message, timeout=timeout)
+            return self._batch_results(response, pending, message)
+        except Exception as e:
+            return [self._render_error(e, timeout=timeout)] * len(pending)
+
+    def _batch_message(self, pending: List[Tuple]) -> Dict[str, Any]:
+        """Build the message rendering several component files at once."""
+        items = []
+        for _, _, component_file, props, _ in pending:
+            item = {"component": str(component_file.absolute()), "props": props}
+            if self._needs_dependencies(component_file):
+                item["dependencies"] = True
+            items.append(item)
+        return {"type": "render_many", "items": items}
+
+    def _batch_results(
+        self, response: Dict[str, Any], pending: List[Tuple], message: Dict[str, Any]
+    ) -> List[Any]:
+        """Turn a batch response into HTML strings and per-item errors."""
+        if not response.get("success"):
+            error_msg = response.get("error", {}).get("message", "Unknown error")
+            raise RenderError(f"Batch rendering failed: {error_msg}")
+
+        rendered: List[Any] = []
+        for (_, component_name, component_file, _, _), item, result in zip(
+            pending, message["items"], response.get("results", [])
+        ):
+            self._observe_node(component_name, result)
             try:
-                result = json.loads(stdout)
-            except json.JSONDecodeError as e:
-                raise RenderError(f"Failed to parse Node.js output: {str(e)}")
+                rendered.append(self._html_from_result(result))
+            except RenderError as e:
+                rendered.append(e)
+            else:
+                if item.get("dependencies"):
+                    self._record_dependencies(component_file, result)
+        return rendered
 
-            if not result.get("success"):
-                error_info = result.get("error", {})
-                error_msg = error_info.get("message", "Unknown rendering error")
-                raise RenderError(f"Component rendering failed: {error_msg}")
+    def _render_error(
+        self,
+        error: Exception,
+        component_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Exception:
+        """Translate a transport failure into the error reported to callers."""
+        # TimeoutError comes from waiting on another caller's coalesced render
+        if isinstance(error, (subprocess.TimeoutExpired, TimeoutError)):
+            if timeout is None:
+                timeout = self.timeout
+            return RenderTimeoutError(
+                f"Component rendering timed out after {timeout} seconds"
+            )
+        if isinstance(error, (ComponentNotFoundError, RenderError)):
+            return error
+        if component_name is None:
+            return RenderError(f"Failed to render components: {str(error)}")
+        return RenderError(
+            f"Failed to render component '{component_name}': {str(error)}"
+        )
 
-            html_result = result.get("html")
-            if html_result is None:
-                raise RenderError("No HTML content in rendering result")
-            return str(html_result)
+    @staticmethod
+    def _html_from_result(result: Dict[str, Any]) -> str:
+        """Extract rendered HTML from a Node.js result, raising its error."""
+        if not result.get("success"):
+            error_info = result.get("error", {})
+            error_msg = error_info.get("message", "Unknown rendering error")
+            raise RenderError(f"Component rendering failed: {error_msg}")
 
-        except subprocess.TimeoutExpired:
-            raise RenderError(
-                f"Component rendering timed out after {self.timeout} seconds"
+        html_result = result.get("html")
+        if html_result is None:
+            raise RenderError("No HTML content in rendering result")
+        return str(html_result)
+
+    def _script_args(self) -> List[str]:
+        """Extra ssr_server.js arguments for persistent workers."""
+        if self.build_dir is not None:
+            # Prebuilt components are plain CommonJS, so skip loading Babel
+            return ["--no-babel"]
+        args = []
+        if self.babel_presets:
+            args.extend(["--presets", json.dumps(self.babel_presets)])
+        if self.transpile_cache_dir:
+            args.extend(
+                [
+                    "--transpile-cache",
+                    str(Path(self.transpile_cache_dir).absolute()),
+                    "--transpile-cache-bytes",
+                    str(self.transpile_cache_max_bytes),
+                ]
             )
-        except Exception as e:
-            if isinstance(e, (ComponentNotFoundError, RenderError)):
-                raise
+        return args
+
+    def _create_transport(self) -> Any:
+        """Create the transport that carries messages to persistent workers."""
+        # Set working directory to project root so Node.js can find dependencies
+        return NodeWorkerPool(
+            self.ssr_script_path,
+            size=self.pool_size,
+            node_executable=self.node_executable,
+            cache_enabled=self.cache_enabled,
+            cwd=str(Path(__file__).parent.parent),
+            script_args=self._script_args(),
+            limits=self.worker_limits,
+        )
+
+    def _get_transport(self) -> Any:
+        """Get the persistent worker transport, creating it on first use."""
+        if self._transport is None:
+            self._transport = self._create_transport()
+        return self._transport
+
+    def _reload_changed(self, paths: List[Path]):
+        """Evict changed modules from warm workers and forget affected imports."""
+        message = {"type": "invalidate", "files": [str(path) for path in paths]}
+        for transport in (self._transport, self._async_transport):
+            if transport is not None:
+                transport.broadcast(message, timeout=self.timeout)
+
+        # Their versions are hashed again from the files' new content; the
+        # imports are asked for again in case the edit added or removed one.
+        # Node.js reports real paths.
+        changed = {Path(os.path.realpath(path)) for path in paths}
+        with self._graph_lock:
+            affected = {
+                component_file
+                for component_file in self._dependencies
+                if Path(os.path.realpath(component_file)) in changed
+            }
+            for path in changed:
+                affected.update(self._dependents.get(path, ()))
+            for component_file in affected:
+                self._forget_dependencies(component_file)
+
+    def _create_async_transport(self) -> Any:
+        """Create the asyncio transport used by the async render methods."""
+        return AsyncNodeWorkerPool(
+            self.ssr_script_path,
+            size=self.pool_size,
+            node_executable=self.node_executable,
+            cache_enabled=self.cache_enabled,
+            cwd=str(Path(__file__).parent.parent),
+            script_args=self._script_args(),
+            limits=self.worker_limits,
+        )
+
+    def _get_async_transport(self) -> Any:
+        """Get the asyncio transport, creating it on first use."""
+        if self._async_transport is None:
+            self._async_transport = self._create_async_transport()
+        return self._async_transport
+
+    def _render_with_worker(
+        self,
+        component_path: str,
+        props: Dict[str, Any],
+        timeout: Optional[float] = None,
+        dependencies: bool = False,
+    ) -> Dict[str, Any]:
+        """Render a component on an idle persistent Node.js worker."""
+        message = {"type": "render", "component": component_path, "props": props}
+        if dependencies:
+            message["dependencies"] = True
+        return self._get_transport().request(message, timeout=timeout or self.timeout)
+
+    def _render_with_subprocess(
+        self,
+        component_path: str,
+        props: Dict[str, Any],
+        timeout: Optional[float] = None,
+        dependencies: bool = False,
+    ) -> Dict[str, Any]:
+        """Render a component in a new Node.js process."""
+        # Props travel as a framed message on stdin rather than in argv,
+        # which the OS limits to a few hundred KB
+        message = {"type": "render", "component": component_path, "props": props}
+        if dependencies:
+            message["dependencies"] = True
+        return self._run_once(message, timeout)
+
+    def _run_once(
+        self, message: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send one message to a new Node.js process and read its response."""
+        args = [self.node_executable, str(self.ssr_script_path), "--worker"]
+        if not self.cache_enabled:
+            args.append("--no-cache")
+        args.extend(self._script_args())
+
+        # Set working directory to project root so Node.js can find dependencies
+        project_root = Path(__file__).parent.parent
+        process = subprocess.run(
+            args,
+            input=encode_frame(dict(message, id=1)),
+            capture_output=True,
+            timeout=timeout or self.timeout,
+            cwd=str(project_root),  # Set working directory
+        )
+
+        # Parse result
+        try:
+            result = read_frame(io.BytesIO(process.stdout))
+        except ValueError as e:
+            raise RenderError(f"Failed to parse Node.js output: {str(e)}")
+        if result is None:
+            stderr = process.stderr.decode("utf-8", errors="replace").strip()
+            error_msg = stderr or "Unknown Node.js error"
             raise RenderError(
-                f"Failed to render component '{component_name}': {str(e)}"
+                f"Node.js process failed: {error_msg}. "
+                f"Return code: {process.returncode}"
             )
+        return result
 
     def _find_component_file(self, component_name: str) -> Optional[Path]:
         """Find component file by name."""
+        if "/" not in component_name and os.sep not in component_name:
+            entry = self._index.get(component_name)
+            return entry.path if entry is not None else None
+
+        # Components in subdirectories are not indexed
+        if self.build_dir is not None:
+            # Prebuilt components are always compiled to .js
+            component_file = self.build_dir / f"{component_name}.js"
+            return component_file if component_file.exists() else None
+
         # Prioritize .js files first (don't need Babel), then JSX files
-        for ext in [".js", ".jsx", ".ts", ".tsx"]:
+        for ext in COMPONENT_EXTENSIONS:
             component_file = self.components_dir / f"{component_name}{ext}"
             if component_file.exists():
                 return component_file
@@ -289,41 +1490,69 @@ if (process.argv.length >= 3) {
 
     def list_components(self) -> list[str]:
         """List all available components."""
-        if not self.components_dir.exists():
-            return []
-
-        components = []
-        extensions = ["*.jsx", "*.js", "*.ts", "*.tsx"]
-
-        for pattern in extensions:
-            for file_path in self.components_dir.glob(pattern):
-                if file_path.stem not in components:
-                    components.append(file_path.stem)
-
-        return sorted(components)
+        return self._index.names()
 
     def get_component_info(self, component_name: str) -> Dict[str, Any]:
         """Get information about a specific component."""
-        component_file = self._find_component_file(component_name)
-        if component_file is None:
+        entry = self._index.get(component_name)
+        if entry is None:
             raise ComponentNotFoundError(f"Component '{component_name}' not found")
 
-        stat = component_file.stat()
         return {
             "name": component_name,
-            "file_path": str(component_file),
-            "extension": component_file.suffix,
-            "size_bytes": stat.st_size,
-            "modified_time": stat.st_mtime,
+            "file_path": str(entry.path),
+            "extension": entry.path.suffix,
+            "size_bytes": entry.size,
+            "modified_time": entry.mtime_ns / 1e9,
         }
 
+    def component_version(self, component_name: str) -> Optional[str]:
+        """
+        Get the hash identifying the current source of a component and the
+        project files it imports.
+
+        Returns:
+            The version used in rendered HTML cache keys, or None if the
+            component does not exist or its imports are unknown
+        """
+        component_file = self._find_component_file(component_name)
+        if component_file is None:
+            return None
+        try:
+            return self._component_version(component_file, fetch=True)
+        except FileNotFoundError:
+            return None
+
     def clear_cache(self):
-        """Clear component cache (Node.js handles its own caching)."""
+        """Clear the rendered HTML cache (Node.js handles its own module caching)."""
         self._component_cache.clear()
-        self._component_mtimes.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get rendered HTML cache usage, including hit and miss counters.
+
+        `coalesced` counts renders that shared a concurrent identical render.
+        """
+        stats = self._component_cache.stats()
+        stats["coalesced"] = self._flights.coalesced if self._flights else 0
+        return stats
+
+    def close(self):
+        """Stop the persistent Node.js workers and the file watcher."""
+        self._index.stop()
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._async_transport is not None:
+            self._async_transport.close()
+            self._async_transport = None
 
     def __del__(self):
-        """Clean up temporary files."""
+        """Clean up temporary files and worker processes."""
+        try:
+            self.close()
+        except Exception:
+            pass  # Ignore cleanup errors
         try:
             if (
                 hasattr(self, "ssr_script_path")
@@ -0,0 +1,609 @@
+"""
+Persistent Node.js workers for Flask-React extension.
+Keeps ssr_server.js running and exchanges framed JSON messages over its pipes.
+"""
+
+import json
+import os
+import queue
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from .exceptions import JavaScriptEngineError, RenderError
+
+# Response frames of a single request, as yielded by the stream() methods
+Frames = Generator[Dict[str, Any], None, None]
+
+# Every frame is a 4-byte big-endian length followed by UTF-8 encoded JSON
+_FRAME_HEADER = struct.Struct(">I")
+
+# Sentinel pushed to the response queue when the worker's stdout closes
+_EOF = object()
+
+# Seconds a recycled worker gets to finish its last request before it is killed
+_DRAIN_TIMEOUT = 30
+
+
+class WaitTracker:
+    """Callers waiting for a worker or connection, and since when."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Insertion ordered, so the first entry is the longest waiting caller
+        self._started: Dict[object, float] = {}
+
+    @contextmanager
+    def wait(self) -> Iterator[None]:
+        """Count the caller as waiting for the duration of the block."""
+        token = object()
+        with self._lock:
+            self._started[token] = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                del self._started[token]
+
+    @property
+    def count(self) -> int:
+        """Number of callers currently waiting."""
+        return len(self._started)
+
+    def longest(self, skip: int = 0) -> float:
+        """
+        Seconds the longest waiting caller has waited so far, 0 if none.
+
+        Args:
+            skip: Number of the longest waiting callers to leave out
+        """
+        with self._lock:
+            for started in islice(self._started.values(), skip, None):
+                return time.monotonic() - started
+        return 0.0
+
+
+class WorkerLimits(NamedTuple):
+    """Lifecycle limits of persistent Node.js workers.
+
+    A worker that reaches `max_requests` or whose resident memory exceeds
+    `max_rss_mb` is replaced once its in-flight requests are answered.
+    `max_old_space_size` caps the V8 heap in MB.
+    """
+
+    max_requests: Optional[int] = None
+    max_rss_mb: Optional[int] = None
+    max_old_space_size: Optional[int] = None
+
+    def node_args(self) -> List[str]:
+        """Node.js options enforcing the limits."""
+        if self.max_old_space_size:
+            return [f"--max-old-space-size={self.max_old_space_size}"]
+        return []
+
+    def exceeded(self, requests: int, pid: Optional[int]) -> bool:
+        """Check whether a worker that served `requests` should be replaced."""
+        if self.max_requests and requests >= self.max_requests:
+            return True
+        if self.max_rss_mb and pid is not None:
+            rss = process_rss(pid)
+            return rss is not None and rss > self.max_rss_mb * 1024 * 1024
+        return False
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """Resident memory of a process in bytes, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "rb") as status:
+            for line in status:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encode a message as a single length-prefixed JSON frame."""
+    body = json.dumps(message).encode("utf-8")
+    return _FRAME_HEADER.pack(len(body)) + body
+
+
+def write_frame(stream: IO[bytes], message: Dict[str, Any]):
+    """Write a single length-prefixed JSON message to a binary stream."""
+    stream.write(encode_frame(message))
+    stream.flush()
+
+
+def read_frame(stream: IO[bytes]) -> Optional[Dict[str, Any]]:
+    """Read a single length-prefixed JSON message, or None at end of stream."""
+    header = stream.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        return None
+
+    (length,) = _FRAME_HEADER.unpack(header)
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body)
+
+
+def first_frame(frames: Frames) -> Dict[str, Any]:
+    """Take the single response of a non-streaming request and release the stream."""
+    try:
+        return next(frames)
+    except StopIteration:
+        raise RenderError("Node.js worker sent no response")
+    finally:
+        frames.close()
+
+
+def read_frames(
+    receive: Callable[[], Dict[str, Any]], first: Optional[Dict[str, Any]] = None
+) -> Frames:
+    """
+    Yield the frames of one response, up to and including its last frame.
+
+    Streaming renders answer with several `{"chunk": ...}` frames followed by
+    a final frame; other messages answer with a single frame.
+
+    Args:
+        receive: Waits for the next frame of the response
+        first: First frame, if it was already received
+    """
+    response = first if first is not None else receive()
+    while True:
+        yield response
+        if "chunk" not in response:
+            return
+        response = receive()
+
+
+class NodeWorker:
+    """A long-lived ssr_server.js process that renders requests sent over stdin."""
+
+    def __init__(
+        self,
+        script_path: Path,
+        node_executable: str = "node",
+        cache_enabled: bool = True,
+        cwd: Optional[str] = None,
+        worker_id: int = 0,
+        script_args: Sequence[str] = (),
+        limits: Optional[WorkerLimits] = None,
+    ):
+        """
+        Initialize the worker. The Node.js process is started on first use.
+
+        Args:
+            script_path: Path to the ssr_server.js script
+            node_executable: Path to Node.js executable
+            cache_enabled: Whether Node.js should keep required modules cached
+            cwd: Working directory for the Node.js process
+            worker_id: Identifier of this worker within its pool
+            script_args: Extra arguments for ssr_server.js
+            limits: Limits after which the process is replaced
+        """
+        self.script_path = Path(script_path)
+        self.node_executable = node_executable
+        self.cache_enabled = cache_enabled
+        self.cwd = cwd
+        self.worker_id = worker_id
+        self.script_args = list(script_args)
+        self.limits = limits or WorkerLimits()
+        # Number of processes replaced for reaching a limit
+        self.recycled = 0
+
+        self._process: Optional[subprocess.Popen] = None
+        self._requests = 0
+        self._owner_pid: Optional[int] = None
+        self._responses: "queue.Queue[Any]" = queue.Queue()
+        self._stderr: deque = deque(maxlen=100)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id of the running Node.js worker, if any."""
+        return self._process.pid if self._process is not None else None
+
+    def is_alive(self) -> bool:
+        """Check whether the Node.js process is running and owned by this process."""
+        return (
+            self._process is not None
+            and self._owner_pid == os.getpid()
+            and self._process.poll() is None
+        )
+
+    def start(self):
+        """Start the Node.js worker process."""
+        args = [self.node_executable, *self.limits.node_args()]
+        args.extend([str(self.script_path), "--worker"])
+        if not self.cache_enabled:
+            args.append("--no-cache")
+        args.extend(self.script_args)
+
+        try:
+            process = subprocess.Popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.cwd,
+            )
+        except OSError as e:
+            raise JavaScriptEngineError(f"Failed to start Node.js worker: {str(e)}")
+
+        self._process = process
+        self._requests = 0
+        self._owner_pid = os.getpid()
+        self._responses = queue.Queue()
+        self._stderr = deque(maxlen=100)
+
+        # Readers are bound to this process so a restart never mixes streams
+        threading.Thread(
+            target=self._read_responses,
+            args=(process, self._responses),
+            daemon=True,
+        ).start()
+        self._stderr_thread = threading.Thread(
+            target=self._read_stderr, args=(process, self._stderr), daemon=True
+        )
+        self._stderr_thread.start()
+
+    def stop(self):
+        """Stop the Node.js worker process."""
+        process = self._process
+        self._process = None
+
+        # After a fork the process belongs to the parent, just forget about it
+        if process is None or self._owner_pid != os.getpid():
+            return
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.kill()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def _recycle(self):
+        """Replace the process, letting the old one finish and exit on its own."""
+        process = self._process
+        self._process = None
+        self.recycled += 1
+
+        # ssr_server.js answers what it has read, then exits when stdin closes
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        threading.Thread(target=self._reap, args=(process,), daemon=True).start()
+
+        # Boot the replacement while the worker sits idle
+        try:
+            self.start()
+        except JavaScriptEngineError:
+            pass  # Retried on the next request
+
+    @staticmethod
+    def _reap(process: subprocess.Popen):
+        """Wait for a recycled process to exit, killing it if it hangs."""
+        try:
+            process.wait(timeout=_DRAIN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a message to the worker and wait for its response.
+
+        Args:
+            message: JSON-serializable message for ssr_server.js
+            timeout: Seconds to wait for the response
+
+        Returns:
+            Decoded response message
+
+        Raises:
+            subprocess.TimeoutExpired: If no response arrives in time
+            RenderError: If the worker process dies
+        """
+        return first_frame(self.stream(message, timeout))
+
+    def stream(self, message: Dict[str, Any], timeout: float) -> Frames:
+        """
+        Send a message to the worker and yield its response frames.
+
+        Streaming renders answer with several `{"chunk": ...}` frames followed
+        by a final frame with `"done": true`; other messages answer with a
+        single frame. The worker is held until the last frame is read.
+
+        Args:
+            message: JSON-serializable message for ssr_server.js
+            timeout: Seconds to wait for the complete response
+
+        Raises:
+            subprocess.TimeoutExpired: If the response does not complete in time
+            RenderError: If the worker process dies
+        """
+        with self._lock:
+            # Restart the worker if it died since the previous request
+            if not self.is_alive():
+                self.stop()
+                self.start()
+
+            process = self._process
+            responses = self._responses
+            self._next_id += 1
+            request_id = self._next_id
+
+            try:
+                write_frame(process.stdin, dict(message, id=request_id))
+            except OSError:
+                # Broken pipe: the worker is gone, report why below
+                pass
+            self._requests += 1
+
+            deadline = time.monotonic() + timeout
+            try:
+                yield from read_frames(
+                    lambda: self._receive(
+                        process, responses, request_id, deadline, timeout
+                    )
+                )
+            finally:
+                # Nothing else is in flight on this worker, so replace it now
+                if (
+                    self._process is process
+                    and self.is_alive()
+                    and self.limits.exceeded(self._requests, process.pid)
+                ):
+                    self._recycle()
+
+    def _receive(
+        self,
+        process: subprocess.Popen,
+        responses: "queue.Queue[Any]",
+        request_id: int,
+        deadline: float,
+        timeout: float,
+    ) -> Dict[str, Any]:
+        """Wait for the next response frame of a request, with the lock held."""
+        while True:
+            try:
+                response = responses.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                # The worker may be stuck in a render, replace it next time
+                self.stop()
+                raise subprocess.TimeoutExpired(process.args, timeout)
+
+            if response is _EOF:
+                raise RenderError(
+                    "Node.js worker exited unexpectedly: "
+                    f"{self._exit_details(process)}"
+                )
+            # Leftovers of an abandoned stream carry an older id
+            if response.get("id") == request_id:
+                return response
+
+    def _exit_details(self, process: subprocess.Popen) -> str:
+        """Describe why a worker process exited."""
+        try:
+            returncode = process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            returncode = None
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1)
+
+        stderr = "".join(self._stderr).strip() or "Unknown Node.js error"
+        return f"{stderr}. Return code: {returncode}"
+
+    @staticmethod
+    def _read_responses(process: subprocess.Popen, responses: "queue.Queue[Any]"):
+        """Forward response frames from the worker's stdout to a queue."""
+        try:
+            while True:
+                frame = read_frame(process.stdout)
+                if frame is None:
+                    break
+                responses.put(frame)
+        except (OSError, ValueError):
+            pass
+        finally:
+            responses.put(_EOF)
+            process.stdout.close()
+
+    @staticmethod
+    def _read_stderr(process: subprocess.Popen, lines: deque):
+        """Keep the tail of the worker's stderr for error reporting."""
+        try:
+            for line in iter(process.stderr.readline, b""):
+                lines.append(line.decode("utf-8", errors="replace"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            process.stderr.close()
+
+    def __del__(self):
+        """Stop the worker process."""
+        try:
+            self.stop()
+        except Exception:
+            pass  # Ignore cleanup errors
+
+
+class NodeWorkerPool:
+    """A fixed-size pool of NodeWorker processes with queued dispatch."""
+
+    def __init__(
+        self,
+        script_path: Path,
+        size: Optional[int] = None,
+        node_executable: str = "node",
+        cache_enabled: bool = True,
+        cwd: Optional[str] = None,
+        script_args: Sequence[str] = (),
+        limits: Optional[WorkerLimits] = None,
+    ):
+        """
+        Initialize the pool. Workers are started on first use.
+
+        Args:
+            script_path: Path to the ssr_server.js script
+            size: Number of workers, defaults to the CPU count
+            node_executable: Path to Node.js executable
+            cache_enabled: Whether Node.js should keep required modules cached
+            cwd: Working directory for the Node.js processes
+            script_args: Extra arguments for ssr_server.js
+            limits: Limits after which a worker's process is replaced
+        """
+        self.script_path = Path(script_path)
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.node_executable = node_executable
+        self.cache_enabled = cache_enabled
+        self.cwd = cwd
+        self.script_args = list(script_args)
+        self.limits = limits
+
+        self._lock = threading.Lock()
+        self._waiters = WaitTracker()
+        self._reset()
+
+    def _reset(self):
+        """Create fresh workers and an idle queue owned by this process."""
+        self._owner_pid = os.getpid()
+        self._workers: List[NodeWorker] = [
+            NodeWorker(
+                self.script_path,
+                node_executable=self.node_executable,
+                cache_enabled=self.cache_enabled,
+                cwd=self.cwd,
+                worker_id=worker_id,
+                script_args=self.script_args,
+                limits=self.limits,
+            )
+            for worker_id in range(self.size)
+        ]
+        # LIFO hands out the most recently used worker, so under light load
+        # only a few processes are started and they stay warm
+        self._idle: "queue.LifoQueue[NodeWorker]" = queue.LifoQueue()
+        for worker in reversed(self._workers):
+            self._idle.put(worker)
+
+    @property
+    def workers(self) -> List[NodeWorker]:
+        """All workers in the pool."""
+        return list(self._workers)
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently waiting for an idle worker."""
+        return self._waiters.count
+
+    @property
+    def longest_wait(self) -> float:
+        """Seconds the longest waiting caller has been waiting for a worker."""
+        return self._waiters.longest()
+
+    def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a message to an idle worker and wait for its response.
+
+        Callers queue while all workers are busy. The timeout covers both the
+        wait for a worker and the render itself.
+
+        Args:
+            message: JSON-serializable message for ssr_server.js
+            timeout: Seconds to wait for the response
+
+        Returns:
+            Decoded response message
+
+        Raises:
+            subprocess.TimeoutExpired: If no worker or response arrives in time
+            RenderError: If the worker process dies
+        """
+        return first_frame(self.stream(message, timeout))
+
+    def stream(self, message: Dict[str, Any], timeout: float) -> Frames:
+        """
+        Send a message to an idle worker and yield its response frames.
+
+        The worker stays checked out until the stream is exhausted or closed.
+        """
+        with self._lock:
+            # Workers and queue state are not usable after a fork
+            if self._owner_pid != os.getpid():
+                self._reset()
+            idle = self._idle
+
+        deadline = time.monotonic() + timeout
+        try:
+            with self._waiters.wait():
+                worker = idle.get(timeout=timeout)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(
+                [self.node_executable, str(self.script_path)], timeout
+            )
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # The wait used the whole timeout; the worker was never late, so
+            # keep it warm instead of letting the render kill it
+            idle.put(worker)
+            raise subprocess.TimeoutExpired(
+                [self.node_executable, str(self.script_path)], timeout
+            )
+
+        try:
+            yield from worker.stream(message, remaining)
+        finally:
+            idle.put(worker)
+
+    def broadcast(self, message: Dict[str, Any], timeout: float):
+        """
+        Send a message to every running worker.
+
+        Busy workers receive it after their current request. Workers that are
+        not running are skipped, they load fresh modules when they start.
+        """
+        with self._lock:
+            if self._owner_pid != os.getpid():
+                return
+            workers = list(self._workers)
+
+        for worker in workers:
+            if not worker.is_alive():
+                continue
+            try:
+                worker.request(message, timeout)
+            except (RenderError, subprocess.TimeoutExpired):
+                pass  # A replaced worker starts with fresh modules too
+
+    def close(self):
+        """Stop all worker processes."""
+        for worker in self._workers:
+            worker.stop()
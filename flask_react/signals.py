@@ -0,0 +1,34 @@
+"""
+Signals for Flask-React extension.
+Lets profilers, loggers and tracers observe renders without patching the renderer.
+"""
+
+from flask.signals import Namespace
+
+_signals = Namespace()
+
+#: Sent before `FlaskReact` renders a component, with the keyword arguments
+#: `component_name`, `props` and `props_bytes`. Every render method sends the
+#: signals; `render_many` and `render_many_async` send them for each item.
+before_render = _signals.signal("flask-react.before-render")
+
+#: Sent after a successful render, with `component_name`, `props`,
+#: `props_bytes`, `duration` in seconds, `cached`, the pid of the Node.js
+#: `worker` that rendered it (None for cache hits) and the rendered `html`.
+#: Streams send it once the last chunk was produced, and batch items with
+#: the duration of the whole batch; both leave `cached` and `worker` None.
+after_render = _signals.signal("flask-react.after-render")
+
+#: Sent when a render raises, with `component_name`, `props`, `props_bytes`,
+#: `duration` in seconds and the `exception`. The exception is re-raised.
+render_failed = _signals.signal("flask-react.render-failed")
+
+
+def has_receivers() -> bool:
+    """Check whether any render signal has a receiver connected."""
+    # Flask before 2.3 without blinker installed provides signals that cannot
+    # be connected and have no receivers attribute
+    return any(
+        getattr(signal, "receivers", None)
+        for signal in (before_render, after_render, render_failed)
+    )
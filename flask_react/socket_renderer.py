@@ -0,0 +1,383 @@
+"""
+Unix domain socket client for a shared Flask-React SSR daemon.
+Lets many Python processes render through one warm `flask-react ssr-server`.
+"""
+
+import os
+import socket
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .aio import AsyncSocketClient
+from .cache import CacheBackend
+from .exceptions import JavaScriptEngineError
+from .node_renderer import NodeRenderer
+from .node_worker import (
+    Frames,
+    WaitTracker,
+    first_frame,
+    read_frame,
+    read_frames,
+    write_frame,
+)
+
+
+def default_socket_path() -> str:
+    """
+    Get the socket path used when none is configured.
+
+    The socket is placed in `$XDG_RUNTIME_DIR/flask-react`, or in
+    `<tmpdir>/flask-react-<uid>` without one, a directory created if missing
+    that only its owner can access, so other local users cannot take the
+    path over before the daemon binds it.
+
+    Raises:
+        JavaScriptEngineError: If the directory cannot be created, or belongs
+            to another user or is accessible to others
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        directory = Path(runtime_dir) / "flask-react"
+    else:
+        directory = Path(tempfile.gettempdir()) / f"flask-react-{os.getuid()}"
+    try:
+        directory.mkdir(mode=0o700, exist_ok=True)
+        # Not followed, a link could point anywhere
+        info = directory.lstat()
+    except OSError as e:
+        raise JavaScriptEngineError(
+            f"Cannot create socket directory {directory}: {str(e)}"
+        )
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise JavaScriptEngineError(
+            f"Socket directory {directory} must be a directory only the current "
+            "user can access, or set FLASK_REACT_SOCKET_PATH"
+        )
+    return str(directory / "ssr.sock")
+
+
+class _Connection:
+    """A single framed connection to the SSR daemon."""
+
+    def __init__(self, socket_path: str, connect_timeout: float):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(connect_timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.stream: BinaryIO = sock.makefile("rwb")
+        self._next_id = 0
+
+    def send(self, message: Dict[str, Any], timeout: float) -> int:
+        """Send a message, returning the id its response frames will carry."""
+        self.sock.settimeout(timeout)
+        self._next_id += 1
+        write_frame(self.stream, dict(message, id=self._next_id))
+        return self._next_id
+
+    def receive(self, request_id: int, timeout: float) -> Dict[str, Any]:
+        """Wait for the next response frame of a request."""
+        self.sock.settimeout(timeout)
+        while True:
+            response = read_frame(self.stream)
+            if response is None:
+                raise ConnectionResetError("SSR daemon closed the connection")
+            if response.get("id") == request_id:
+                return response
+
+    def close(self):
+        """Close the connection."""
+        try:
+            self.stream.close()
+        except OSError:
+            pass  # Unsent data on a dead connection
+        finally:
+            self.sock.close()
+
+
+class SocketClient:
+    """A small pool of connections to the SSR daemon's Unix socket."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        size: Optional[int] = None,
+        connect_timeout: float = 5,
+    ):
+        """
+        Initialize the client. Connections are opened on first use.
+
+        Args:
+            socket_path: Path of the daemon's Unix domain socket, by default
+                from `default_socket_path`
+            size: Maximum number of open connections
+            connect_timeout: Seconds to wait when connecting
+        """
+        self.socket_path = str(socket_path or default_socket_path())
+        self.size = max(1, size or 4)
+        self.connect_timeout = connect_timeout
+
+        self._lock = threading.Lock()
+        self._waiters = WaitTracker()
+        self._reset()
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently waiting for a free connection."""
+        return self._waiters.count
+
+    @property
+    def longest_wait(self) -> float:
+        """Seconds the longest waiting caller has been waiting for a connection."""
+        return self._waiters.longest()
+
+    def _reset(self):
+        """Forget all connections, they are not shared with a forked parent."""
+        self._owner_pid = os.getpid()
+        self._idle: List[_Connection] = []
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _acquire(self, timeout: float) -> _Connection:
+        """Get an idle connection, opening a new one if none is idle."""
+        with self._lock:
+            # Sockets inherited over a fork would interleave both processes' frames
+            if self._owner_pid != os.getpid():
+                self._reset()
+            slots = self._slots
+
+        with self._waiters.wait():
+            acquired = slots.acquire(timeout=timeout)
+        if not acquired:
+            raise subprocess.TimeoutExpired(["ssr-server", self.socket_path], timeout)
+
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._connect()
+        except Exception:
+            slots.release()
+            raise
+
+    def _release(self, connection: _Connection):
+        """Return a healthy connection to the pool."""
+        with self._lock:
+            if self._owner_pid != os.getpid():
+                return
+            self._idle.append(connection)
+            self._slots.release()
+
+    def _discard(self, connection: _Connection):
+        """Close a broken connection and free its slot."""
+        connection.close()
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                self._slots.release()
+
+    def _connect(self) -> _Connection:
+        """Open a new connection to the daemon."""
+        try:
+            return _Connection(self.socket_path, self.connect_timeout)
+        except OSError as e:
+            raise JavaScriptEngineError(
+                f"Cannot connect to SSR server at {self.socket_path}: {str(e)}"
+            )
+
+    def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a message to the daemon and wait for its response.
+
+        A connection that was dropped, e.g. because the daemon restarted, is
+        replaced and the request retried once on a fresh connection.
+
+        Args:
+            message: JSON-serializable message for ssr_server.js
+            timeout: Seconds to wait for the response
+
+        Returns:
+            Decoded response message
+
+        Raises:
+            subprocess.TimeoutExpired: If no response arrives in time
+            JavaScriptEngineError: If the daemon cannot be reached
+        """
+        return first_frame(self.stream(message, timeout))
+
+    def stream(self, message: Dict[str, Any], timeout: float) -> Frames:
+        """
+        Send a message to the daemon and yield its response frames.
+
+        The connection stays checked out until the stream is exhausted. A
+        stream closed early leaves unread frames behind, so its connection is
+        discarded rather than reused.
+        """
+        deadline = time.monotonic() + timeout
+        # The daemon kills a worker still busy with the message after this
+        message = dict(message, timeoutMs=round(timeout * 1000))
+        for attempt in range(2):
+            connection = self._acquire(max(deadline - time.monotonic(), 0))
+            completed = False
+            try:
+                sent = self._send(connection, message, deadline, retry=not attempt)
+                if sent is None:
+                    continue
+                request_id, response = sent
+
+                def receive():
+                    return connection.receive(
+                        request_id, max(deadline - time.monotonic(), 0.001)
+                    )
+
+                for frame in read_frames(receive, first=response):
+                    # Set before yielding: a caller may stop after the last frame
+                    completed = "chunk" not in frame
+                    yield frame
+                return
+            except socket.timeout:
+                raise subprocess.TimeoutExpired(
+                    ["ssr-server", self.socket_path], timeout
+                )
+            except (OSError, ValueError) as e:
+                raise JavaScriptEngineError(
+                    f"Lost connection to SSR server at {self.socket_path}: {str(e)}"
+                )
+            finally:
+                if completed:
+                    self._release(connection)
+                else:
+                    self._discard(connection)
+
+        raise JavaScriptEngineError(f"SSR server at {self.socket_path} unavailable")
+
+    def _send(
+        self,
+        connection: "_Connection",
+        message: Dict[str, Any],
+        deadline: float,
+        retry: bool,
+    ) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Send a message and wait for its first response frame.
+
+        Returns None if the connection turned out to be stale and the message
+        can be retried on another one.
+        """
+        try:
+            request_id = connection.send(
+                message, max(deadline - time.monotonic(), 0.001)
+            )
+            response = connection.receive(
+                request_id, max(deadline - time.monotonic(), 0.001)
+            )
+        except socket.timeout:
+            raise
+        except (OSError, ValueError) as e:
+            # Nothing was received yet, so a stale connection can be retried
+            if retry:
+                return None
+            raise JavaScriptEngineError(
+                f"Lost connection to SSR server at {self.socket_path}: {str(e)}"
+            )
+        return request_id, response
+
+    def broadcast(self, message: Dict[str, Any], timeout: float):
+        """Send a message the daemon relays to all of its workers."""
+        try:
+            self.request(message, timeout)
+        except (JavaScriptEngineError, subprocess.TimeoutExpired):
+            pass  # A daemon that is down starts with fresh modules
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                for connection in self._idle:
+                    connection.close()
+            self._reset()
+
+
+class SocketRenderer(NodeRenderer):
+    """Renders React components through a shared `flask-react ssr-server` daemon."""
+
+    def __init__(
+        self,
+        components_dir: str = "components",
+        socket_path: Optional[str] = None,
+        cache_enabled: bool = True,
+        timeout: float = 30,
+        pool_size: Optional[int] = None,
+        max_cache_size: int = 100,
+        max_cache_bytes: int = 32 * 1024 * 1024,
+        build_dir: Optional[str] = None,
+        auto_reload: bool = False,
+        watch_interval: float = 1.0,
+        performance_monitoring: bool = False,
+        component_timeouts: Optional[Dict[str, float]] = None,
+        coalesce_renders: bool = True,
+        cache_backend: Optional[CacheBackend] = None,
+    ):
+        """
+        Initialize the socket renderer.
+
+        Args:
+            components_dir: Directory containing React components
+            socket_path: Path of the daemon's Unix domain socket, by default
+                from `default_socket_path`
+            cache_enabled: Whether to cache rendered components
+            timeout: Default deadline of a render in seconds
+            pool_size: Maximum number of connections to the daemon
+            max_cache_size: Maximum number of cached renders
+            max_cache_bytes: Maximum total size of cached HTML in bytes
+            build_dir: Directory of components prebuilt by `flask-react build`
+            auto_reload: Watch the components directory for changes
+            watch_interval: Seconds between checks for changed components
+            performance_monitoring: Record per-component render metrics
+            component_timeouts: Deadlines in seconds of specific components
+            coalesce_renders: Let concurrent identical renders share one call
+            cache_backend: Store of rendered HTML, in memory by default
+        """
+        self.socket_path = str(socket_path or default_socket_path())
+        super().__init__(
+            components_dir=components_dir,
+            cache_enabled=cache_enabled,
+            timeout=timeout,
+            persistent=True,
+            pool_size=pool_size,
+            max_cache_size=max_cache_size,
+            max_cache_bytes=max_cache_bytes,
+            build_dir=build_dir,
+            auto_reload=auto_reload,
+            watch_interval=watch_interval,
+            performance_monitoring=performance_monitoring,
+            component_timeouts=component_timeouts,
+            coalesce_renders=coalesce_renders,
+            cache_backend=cache_backend,
+        )
+
+    def _check_node_availability(self):
+        """Node.js runs in the daemon, nothing to check locally."""
+
+    def _create_ssr_script(self):
+        """The daemon owns the SSR script."""
+        self.ssr_script_path = Path(__file__).parent / "ssr_server.js"
+        self._is_temp_script = False
+
+    def _create_transport(self) -> SocketClient:
+        """Create the connection pool to the daemon."""
+        return SocketClient(self.socket_path, size=self.pool_size)
+
+    def _create_async_transport(self) -> AsyncSocketClient:
+        """Create the asyncio connections to the daemon."""
+        return AsyncSocketClient(self.socket_path, size=self.pool_size)
@@ -1,19 +1,225 @@
+// Worker mode keeps this process alive and reads framed requests from stdin:
+//   node ssr_server.js --worker [--no-cache]
+// Daemon mode serves the same framed requests on a Unix domain socket:
+//   node ssr_server.js --socket <path> [--workers <n>] [--no-cache]
+//       [--max-requests <n>] [--max-rss-mb <mb>]
+// A daemon worker that served --max-requests requests or outgrew --max-rss-mb
+// is replaced; it answers the requests already sent on its connections first.
+// A daemon worker still busy with a request `timeoutMs` after receiving it is
+// killed and restarted.
+// Build mode compiles components to CommonJS ahead of time:
+//   node ssr_server.js --build <outDir> --root <componentsDir> -- <files...>
+// A single render without a persistent worker is a --worker run whose stdin
+// closes after one request. Rendering from command line arguments is kept
+// for manual use, with props limited by the OS argument size:
+//   node ssr_server.js <componentPath> <propsJson> <cacheEnabled>
+// Worker, daemon and build modes accept --presets <json> to choose Babel presets,
+// worker and daemon modes accept --no-babel to load prebuilt components only.
+// Worker and daemon modes accept --transpile-cache <dir> [--transpile-cache-bytes <n>]
+// to keep transpiled components in a directory shared by workers and deploys.
+function getOption(name) {
+    const index = process.argv.indexOf(name);
+    return index >= 0 ? process.argv[index + 1] : undefined;
+}
 
-const React = require('react');
-const { renderToString } = require('react-dom/server');
+const workerMode = process.argv[2] === '--worker';
+const buildMode = process.argv[2] === '--build';
+const socketPath = getOption('--socket');
+const babelEnabled = !process.argv.includes('--no-babel');
+const babelPresets = getOption('--presets')
+    ? JSON.parse(getOption('--presets'))
+    : ['@babel/preset-react'];
+const transpileCacheDir = getOption('--transpile-cache');
+const transpileCacheBytes = Number(getOption('--transpile-cache-bytes')) || 256 * 1024 * 1024;
 
 // Get cache setting from command line arguments or default to true
-const cacheEnabled = process.argv[4] === 'true' || process.argv[4] === undefined;
+const cacheEnabled = workerMode || socketPath
+    ? !process.argv.includes('--no-cache')
+    : process.argv[4] === 'true' || process.argv[4] === undefined;
+
+const { performance } = require('perf_hooks');
+
+// React is only needed for rendering, not for compiling
+const React = buildMode ? null : require('react');
+const { renderToString, renderToPipeableStream } = buildMode ? {} : require('react-dom/server');
 
 // Setup Babel for JSX transformation
-try {
-    require('@babel/register')({
-        presets: ['@babel/preset-react'],
-        extensions: ['.js', '.jsx', '.ts', '.tsx'],
-        cache: cacheEnabled // cache configuration
-    });
-} catch (e) {
-    console.warn('Babel not available, JSX transformation disabled:', e.message);
+if (!buildMode && babelEnabled) {
+    try {
+        if (transpileCacheDir && cacheEnabled) {
+            registerTranspileCache(transpileCacheDir, transpileCacheBytes);
+        } else {
+            require('@babel/register')({
+                presets: babelPresets,
+                extensions: ['.js', '.jsx', '.ts', '.tsx'],
+                cache: cacheEnabled // cache configuration
+            });
+        }
+    } catch (e) {
+        console.warn('Babel not available, JSX transformation disabled:', e.message);
+    }
+}
+
+// Transpile components through a content-addressed cache instead of @babel/register.
+// Options are resolved like @babel/register does, reading .babelrc and
+// babel.config.js, and entries are keyed by the source, its extension, the
+// Babel version, the resolved options with the version of each preset and
+// plugin package, and the content of the config files. Every worker and every
+// deploy using the directory reuses them, and any of those changing misses.
+function registerTranspileCache(directory, maxBytes) {
+    const babel = require('@babel/core');
+    const crypto = require('crypto');
+    const fs = require('fs');
+    const Module = require('module');
+    const path = require('path');
+
+    const packages = `${path.sep}node_modules${path.sep}`;
+    const versions = new Map();
+    const configs = new Map();
+    let writes = 0;
+
+    // Version of the package a preset or plugin was resolved from
+    function packageVersion(file) {
+        if (!versions.has(file)) {
+            let version = null;
+            for (let dir = path.dirname(file); dir !== path.dirname(dir); dir = path.dirname(dir)) {
+                try {
+                    version = JSON.parse(fs.readFileSync(path.join(dir, 'package.json'), 'utf8')).version || null;
+                    break;
+                } catch (e) {
+                    // No package.json here, look further up
+                }
+            }
+            versions.set(file, version);
+        }
+        return versions.get(file);
+    }
+
+    // Content of a config file, read once per worker
+    function configContent(file) {
+        if (!file) return null;
+        if (!configs.has(file)) {
+            configs.set(file, fs.readFileSync(file, 'utf8'));
+        }
+        return configs.get(file);
+    }
+
+    function resolveOptions(filename) {
+        const partial = babel.loadPartialConfig({ filename: filename, presets: babelPresets });
+        if (partial === null) {
+            return null; // Ignored by the project's Babel config
+        }
+        // Paths differ between files and deploys; the source and extension are keyed
+        const { filename: _, cwd, root, ...options } = partial.options;
+        const setup = JSON.stringify(options, (name, value) => {
+            if (value && typeof value === 'object' && 'options' in value && 'dirname' in value) {
+                // A resolved preset or plugin
+                return {
+                    name: value.file ? value.file.request : value.name,
+                    version: value.file ? packageVersion(value.file.resolved) : null,
+                    options: value.options
+                };
+            }
+            return value;
+        });
+        return {
+            options: partial.options,
+            setup: [setup, configContent(partial.babelrc), configContent(partial.config)]
+        };
+    }
+
+    function transpile(source, filename) {
+        const resolved = resolveOptions(filename);
+        if (resolved === null) {
+            return source;
+        }
+        const key = crypto.createHash('sha256')
+            .update(`${JSON.stringify([babel.version, resolved.setup])}\0${path.extname(filename)}\0`)
+            .update(source)
+            .digest('hex');
+        const entry = path.join(directory, key.slice(0, 2), `${key.slice(2)}.js`);
+
+        let code = null;
+        try {
+            code = fs.readFileSync(entry, 'utf8');
+        } catch (e) {
+            // Not transpiled by any worker yet
+        }
+        if (code !== null) {
+            try {
+                // The modification time orders entries for pruning
+                const now = new Date();
+                fs.utimesSync(entry, now, now);
+            } catch (e) {
+                // Read-only cache, such as one baked into an image
+            }
+            return code;
+        }
+
+        code = babel.transformSync(source, resolved.options).code;
+        try {
+            // Write next to the entry and rename so other workers never read a partial one
+            fs.mkdirSync(path.dirname(entry), { recursive: true });
+            const temp = `${entry}.${process.pid}.tmp`;
+            fs.writeFileSync(temp, code);
+            fs.renameSync(temp, entry);
+            if (writes++ % 64 === 0) {
+                pruneTranspileCache(directory, maxBytes);
+            }
+        } catch (e) {
+            console.warn('Transpile cache not written:', e.message);
+        }
+        return code;
+    }
+
+    const loadJavaScript = Module._extensions['.js'];
+    for (const extension of ['.js', '.jsx', '.ts', '.tsx']) {
+        Module._extensions[extension] = (module, filename) => {
+            if (filename.includes(packages)) {
+                return loadJavaScript(module, filename);
+            }
+            module._compile(transpile(fs.readFileSync(filename, 'utf8'), filename), filename);
+        };
+    }
+}
+
+// Remove the least recently used transpile cache entries beyond maxBytes
+function pruneTranspileCache(directory, maxBytes) {
+    const fs = require('fs');
+    const path = require('path');
+
+    const entries = [];
+    let total = 0;
+    for (const shard of fs.readdirSync(directory)) {
+        let names;
+        try {
+            names = fs.readdirSync(path.join(directory, shard));
+        } catch (e) {
+            continue;
+        }
+        for (const name of names) {
+            if (!name.endsWith('.js')) continue;
+            const file = path.join(directory, shard, name);
+            try {
+                const stat = fs.statSync(file);
+                entries.push({ file: file, size: stat.size, used: stat.mtimeMs });
+                total += stat.size;
+            } catch (e) {
+                // Removed by another worker
+            }
+        }
+    }
+
+    entries.sort((a, b) => a.used - b.used);
+    for (const entry of entries) {
+        if (total <= maxBytes) break;
+        try {
+            fs.unlinkSync(entry.file);
+        } catch (e) {
+            // Removed by another worker
+        }
+        total -= entry.size;
+    }
 }
 
 // Mock DOM globals for SSR
@@ -33,48 +239,564 @@ function requireComponent(componentPath) {
     }
 }
 
-function renderComponent(componentPath, props) {
-    try {
-        const ComponentModule = requireComponent(componentPath);
-        
-        // Handle different export patterns
-        let Component;
-        if (typeof ComponentModule === 'function') {
-            Component = ComponentModule;
-        } else if (ComponentModule.default && typeof ComponentModule.default === 'function') {
-            Component = ComponentModule.default;
-        } else {
-            throw new Error('Component must export a function or have a default export that is a function');
+// Evict changed files and every module that imports them, directly or not,
+// so the next render re-evaluates them while everything else stays warm
+function invalidateModules(files) {
+    const fs = require('fs');
+    const path = require('path');
+
+    const importers = new Map();
+    for (const id of Object.keys(require.cache)) {
+        for (const child of require.cache[id].children || []) {
+            if (!importers.has(child.id)) importers.set(child.id, []);
+            importers.get(child.id).push(id);
+        }
+    }
+
+    // require.cache is keyed by real paths; deleted files can't be resolved
+    const queue = files.map((file) => {
+        try {
+            return fs.realpathSync(file);
+        } catch (e) {
+            return path.resolve(file);
+        }
+    });
+    const seen = new Set();
+    const evicted = [];
+    while (queue.length) {
+        const id = queue.pop();
+        if (seen.has(id)) continue;
+        seen.add(id);
+        if (require.cache[id]) {
+            delete require.cache[id];
+            evicted.push(id);
+        }
+        queue.push(...(importers.get(id) || []));
+    }
+    return evicted;
+}
+
+// Project files a loaded component imports, directly or not, for Python to
+// include in the component's version. Packages in node_modules are left out.
+function moduleDependencies(componentPath) {
+    const path = require('path');
+    const root = require.cache[require.resolve(componentPath)];
+    const packages = `${path.sep}node_modules${path.sep}`;
+    const seen = new Set([root.id]);
+    const queue = [root];
+    const dependencies = [];
+    while (queue.length) {
+        for (const child of queue.pop().children || []) {
+            if (seen.has(child.id) || child.id.includes(packages)) continue;
+            seen.add(child.id);
+            dependencies.push(child.id);
+            queue.push(child);
         }
-        
+    }
+    return dependencies.sort();
+}
+
+function loadComponent(componentPath) {
+    const ComponentModule = requireComponent(componentPath);
+
+    // Handle different export patterns
+    if (typeof ComponentModule === 'function') {
+        return ComponentModule;
+    } else if (ComponentModule.default && typeof ComponentModule.default === 'function') {
+        return ComponentModule.default;
+    }
+    throw new Error('Component must export a function or have a default export that is a function');
+}
+
+function errorResult(componentPath, error) {
+    return {
+        success: false,
+        html: null,
+        error: {
+            message: error.message,
+            stack: error.stack,
+            component: componentPath
+        }
+    };
+}
+
+// withDependencies adds the project files the component imports to the result
+function renderComponent(componentPath, props, withDependencies) {
+    try {
+        const started = performance.now();
+        const Component = loadComponent(componentPath);
+        const loaded = performance.now();
+
         // Create React element and render
         const element = React.createElement(Component, props || {});
         const html = renderToString(element);
-        
-        return { 
-            success: true, 
-            html: html, 
-            error: null 
+
+        const result = {
+            success: true,
+            html: html,
+            error: null,
+            timings: { loadMs: loaded - started, renderMs: performance.now() - loaded }
         };
+        if (withDependencies) {
+            result.dependencies = moduleDependencies(componentPath);
+        }
+        return result;
     } catch (error) {
-        return {
-            success: false,
-            html: null,
-            error: { 
-                message: error.message, 
-                stack: error.stack,
-                component: componentPath
+        return errorResult(componentPath, error);
+    }
+}
+
+// Stream HTML as React produces it: one {id, chunk} frame per chunk, then a final result
+function streamComponent(message, write) {
+    const { Writable } = require('stream');
+    const { StringDecoder } = require('string_decoder');
+
+    return new Promise((resolve) => {
+        const finish = (result) => resolve(Object.assign({ id: message.id, done: true }, result));
+        // Chunk boundaries may split multi-byte characters
+        const decoder = new StringDecoder('utf8');
+        const sendChunk = (text) => {
+            if (text) {
+                write(encodeFrame({ id: message.id, chunk: text }));
             }
         };
+
+        const output = new Writable({
+            write(chunk, encoding, callback) {
+                sendChunk(decoder.write(chunk));
+                callback();
+            },
+            final(callback) {
+                sendChunk(decoder.end());
+                callback();
+            }
+        });
+        // Errors after the shell leave holes in HTML already sent, so the
+        // final frame reports the first one instead of success
+        let streamError = null;
+        output.on('finish', () => {
+            if (streamError) {
+                finish(errorResult(message.component, streamError));
+                return;
+            }
+            const result = { success: true, html: null, error: null };
+            if (message.dependencies) {
+                result.dependencies = moduleDependencies(message.component);
+            }
+            finish(result);
+        });
+
+        try {
+            const element = React.createElement(loadComponent(message.component), message.props || {});
+            const stream = renderToPipeableStream(element, {
+                onShellReady() {
+                    stream.pipe(output);
+                },
+                onShellError(error) {
+                    finish(errorResult(message.component, error));
+                },
+                onError(error) {
+                    console.error(`Error while streaming ${message.component}:`, error);
+                    streamError = streamError || error;
+                }
+            });
+        } catch (error) {
+            finish(errorResult(message.component, error));
+        }
+    });
+}
+
+// Frames are a 4-byte big-endian length followed by that many bytes of UTF-8 JSON
+function encodeFrame(message) {
+    const started = performance.now();
+    let json = JSON.stringify(message);
+    if (message.timings) {
+        // Serializing can only be timed once it is done, so append its time
+        json = `${json.slice(0, -1)},"serializeMs":${performance.now() - started}}`;
+    }
+    const body = Buffer.from(json, 'utf8');
+    const header = Buffer.alloc(4);
+    header.writeUInt32BE(body.length, 0);
+    return Buffer.concat([header, body]);
+}
+
+function createFrameReader(onFrame) {
+    let chunks = [];
+    let size = 0;
+    let expected = -1;
+
+    return (chunk) => {
+        chunks.push(chunk);
+        size += chunk.length;
+
+        while (true) {
+            if (expected < 0) {
+                if (size < 4) return;
+                const head = Buffer.concat(chunks, size);
+                expected = head.readUInt32BE(0);
+                chunks = [head.subarray(4)];
+                size -= 4;
+            }
+            if (size < expected) return;
+
+            // Join the pending chunks once per frame, not once per chunk
+            const data = chunks.length === 1 ? chunks[0] : Buffer.concat(chunks, size);
+            const rest = data.subarray(expected);
+            const body = data.subarray(0, expected);
+            chunks = rest.length ? [rest] : [];
+            size = rest.length;
+            expected = -1;
+            onFrame(body);
+        }
+    };
+}
+
+function handleMessage(message, write, size) {
+    switch (message.type) {
+        case 'render':
+            return Object.assign(
+                { id: message.id, requestBytes: size, worker: process.pid },
+                renderComponent(message.component, message.props, message.dependencies)
+            );
+        case 'render_many':
+            return {
+                id: message.id,
+                success: true,
+                results: (message.items || []).map(
+                    (item) => renderComponent(item.component, item.props, item.dependencies)
+                ),
+                error: null
+            };
+        case 'stream':
+            return streamComponent(message, write);
+        case 'invalidate':
+            // Daemon workers each have their own module cache, the primary relays to all
+            if (require('cluster').isWorker) {
+                process.send({ type: 'invalidate', files: message.files || [] });
+                return { id: message.id, success: true, evicted: null, error: null };
+            }
+            return {
+                id: message.id,
+                success: true,
+                evicted: invalidateModules(message.files || []),
+                error: null
+            };
+        case 'dependencies':
+            // Imports of a component no render reported yet, loading it if needed
+            try {
+                loadComponent(message.component);
+                return {
+                    id: message.id,
+                    success: true,
+                    dependencies: moduleDependencies(message.component),
+                    error: null
+                };
+            } catch (error) {
+                return Object.assign({ id: message.id }, errorResult(message.component, error));
+            }
+        case 'ping':
+            return { id: message.id, success: true, html: null, error: null };
+        default:
+            return {
+                id: message.id,
+                success: false,
+                html: null,
+                error: { message: `Unknown message type: ${message.type}` }
+            };
     }
 }
 
-// Handle command line arguments
-// argv[2] = componentPath, argv[3] = propsJson, argv[4] = cacheEnabled
-if (process.argv.length >= 3) {
+// Serve framed requests from a readable stream, answering with write(frame).
+// hooks.onStart(message, receivedAt) runs before a request is handled and
+// hooks.onHandled(message) after it was answered.
+function serveFrames(input, write, hooks = {}) {
+    // Requests are handled strictly in arrival order
+    let pending = Promise.resolve();
+
+    input.on('data', createFrameReader((body) => {
+        const receivedAt = performance.now();
+        let message;
+        try {
+            message = JSON.parse(body.toString('utf8'));
+        } catch (parseError) {
+            write(encodeFrame({
+                id: null,
+                success: false,
+                html: null,
+                error: { message: `Invalid JSON message: ${parseError.message}` }
+            }));
+            return;
+        }
+        pending = pending
+            .then(() => {
+                if (hooks.onStart) hooks.onStart(message, receivedAt);
+                return handleMessage(message, write, body.length);
+            })
+            .then((response) => write(encodeFrame(response)), (error) => write(encodeFrame({
+                id: message.id,
+                success: false,
+                html: null,
+                error: { message: error.message, stack: error.stack }
+            })))
+            .then(() => hooks.onHandled && hooks.onHandled(message));
+    }));
+
+    return () => pending;
+}
+
+function startWorker() {
+    // stdout carries the protocol, so keep component logging off it
+    console.log = console.error;
+    console.info = console.error;
+    console.debug = console.error;
+
+    const drain = serveFrames(process.stdin, (frame) => process.stdout.write(frame));
+
+    // The parent closed our stdin: finish outstanding work, flush and exit
+    process.stdin.on('end', () => drain().then(() => {
+        process.stdout.write('', () => process.exit(0));
+    }));
+}
+
+function startDaemon() {
+    const cluster = require('cluster');
+    const fs = require('fs');
+    const net = require('net');
+    const os = require('os');
+
+    const isPrimary = cluster.isPrimary === undefined ? cluster.isMaster : cluster.isPrimary;
+    if (isPrimary) {
+        const workerCount = parseInt(getOption('--workers'), 10) || os.cpus().length;
+        let shuttingDown = false;
+        // Workers that asked to be replaced, their exit needs no restart
+        const retired = new Set();
+        // Kill timers of the requests each worker is busy with, by worker id
+        const deadlines = new Map();
+
+        // Remove a stale socket left behind by a previous run
+        try {
+            fs.unlinkSync(socketPath);
+        } catch (e) {
+            if (e.code !== 'ENOENT') throw e;
+        }
+
+        for (let i = 0; i < workerCount; i++) {
+            cluster.fork();
+        }
+        cluster.on('exit', (worker, code, signal) => {
+            for (const timer of (deadlines.get(worker.id) || new Map()).values()) {
+                clearTimeout(timer);
+            }
+            deadlines.delete(worker.id);
+            if (retired.delete(worker.id)) {
+                return;
+            }
+            if (!shuttingDown) {
+                console.error(`SSR worker ${worker.process.pid} exited (${signal || code}), restarting`);
+                cluster.fork();
+            }
+        });
+
+        const shutdown = () => {
+            shuttingDown = true;
+            for (const id in cluster.workers) {
+                cluster.workers[id].kill();
+            }
+            try {
+                fs.unlinkSync(socketPath);
+            } catch (e) {
+                // Already gone
+            }
+            process.exit(0);
+        };
+        process.on('SIGINT', shutdown);
+        process.on('SIGTERM', shutdown);
+
+        cluster.on('message', (sender, message) => {
+            if (message && message.type === 'invalidate') {
+                for (const id in cluster.workers) {
+                    cluster.workers[id].send(message);
+                }
+            } else if (message && message.type === 'deadline') {
+                // A worker stuck in a render can't answer, so it is killed
+                // from here and restarted by the exit handler
+                const timers = deadlines.get(sender.id) || new Map();
+                deadlines.set(sender.id, timers);
+                clearTimeout(timers.get(message.request));
+                timers.delete(message.request);
+                if (message.ms !== null) {
+                    timers.set(message.request, setTimeout(() => {
+                        console.error(`SSR worker ${sender.process.pid} missed a render deadline, killing it`);
+                        sender.process.kill('SIGKILL');
+                    }, message.ms));
+                }
+            } else if (message && message.type === 'retire' && !shuttingDown) {
+                // The old worker keeps listening until its replacement does, the
+                // primary drops the shared socket once no worker listens on it
+                retired.add(sender.id);
+                cluster.fork().once('listening', () => {
+                    if (sender.isConnected()) {
+                        sender.send({ type: 'replaced' });
+                    }
+                });
+            }
+        });
+
+        console.log(`SSR server listening on ${socketPath} with ${workerCount} workers`);
+        return;
+    }
+
+    process.on('message', (message) => {
+        if (message && message.type === 'invalidate') {
+            invalidateModules(message.files);
+        } else if (message && message.type === 'replaced') {
+            stopServing();
+        }
+    });
+
+    // Time a stuck render gets past its client's deadline before the kill
+    const DEADLINE_GRACE_MS = 500;
+    const maxRequests = parseInt(getOption('--max-requests'), 10) || 0;
+    const maxRssBytes = (parseInt(getOption('--max-rss-mb'), 10) || 0) * 1024 * 1024;
+    const connections = new Map();
+    let handled = 0;
+    let retiring = false;
+    let stopping = false;
+
+    // End a connection once every request read from it has been answered.
+    // Clients retry a request whose connection closed before it was answered.
+    const endWhenIdle = (connection, drain) => {
+        const pending = drain();
+        pending.then(() => {
+            if (drain() === pending) {
+                connection.end();
+            } else {
+                endWhenIdle(connection, drain);
+            }
+        });
+    };
+
+    // Ask the primary for a replacement, serving as usual until it listens
+    const retire = () => {
+        retiring = true;
+        process.send({ type: 'retire' });
+        // Clients that keep sending must not hold the worker forever
+        setTimeout(() => process.exit(0), 30000).unref();
+    };
+
+    const stopServing = () => {
+        stopping = true;
+        server.close(() => process.exit(0));
+        for (const [connection, drain] of connections) {
+            endWhenIdle(connection, drain);
+        }
+    };
+
+    // Report each deadline to the primary, which outlives a stuck event loop.
+    // The grace lets the client time out first and report it as such.
+    let nextRequest = 0;
+    const requestIds = new WeakMap();
+    const watchDeadline = (message, receivedAt) => {
+        if (message && message.timeoutMs) {
+            const request = ++nextRequest;
+            requestIds.set(message, request);
+            const remaining = message.timeoutMs - (performance.now() - receivedAt);
+            process.send({ type: 'deadline', request, ms: Math.max(remaining, 0) + DEADLINE_GRACE_MS });
+        }
+    };
+
+    const onHandled = (message) => {
+        const request = requestIds.get(message);
+        if (request !== undefined) {
+            process.send({ type: 'deadline', request, ms: null });
+        }
+        checkLimits();
+    };
+
+    const checkLimits = () => {
+        handled += 1;
+        if (retiring) {
+            return;
+        }
+        if ((maxRequests && handled >= maxRequests)
+            || (maxRssBytes && process.memoryUsage.rss() > maxRssBytes)) {
+            retire();
+        }
+    };
+
+    // Cluster workers share the listening socket owned by the primary
+    const server = net.createServer((connection) => {
+        const drain = serveFrames(connection, (frame) => connection.write(frame), {
+            onStart: watchDeadline,
+            onHandled
+        });
+        connections.set(connection, drain);
+        connection.on('close', () => connections.delete(connection));
+        connection.on('error', () => connection.destroy());
+        if (stopping) {
+            endWhenIdle(connection, drain);
+        }
+    }).listen(socketPath);
+}
+
+function buildComponents(outDir, sourceRoot, files) {
+    const babel = require('@babel/core');
+    const fs = require('fs');
+    const path = require('path');
+
+    // Convert ES module syntax too when the transform is installed (it ships with preset-env)
+    let plugins = [];
+    try {
+        plugins = [require.resolve('@babel/plugin-transform-modules-commonjs')];
+    } catch (e) {
+        // Components written in CommonJS need no module transform
+    }
+
+    const results = { compiled: [], errors: [] };
+    for (const file of files) {
+        try {
+            const relative = path.relative(sourceRoot, file);
+            const target = path.join(outDir, relative.replace(/\.(jsx?|tsx?)$/, '.js'));
+            const { code } = babel.transformFileSync(file, {
+                presets: babelPresets,
+                plugins: plugins,
+                babelrc: false,
+                configFile: false,
+                sourceType: 'unambiguous'
+            });
+
+            // Write next to the target and rename so workers never load a partial file
+            fs.mkdirSync(path.dirname(target), { recursive: true });
+            const temp = `${target}.${process.pid}.tmp`;
+            fs.writeFileSync(temp, code);
+            fs.renameSync(temp, target);
+            results.compiled.push(file);
+        } catch (error) {
+            results.errors.push({ file: file, message: error.message });
+        }
+    }
+
+    process.stdout.write(JSON.stringify(results));
+    process.exit(results.errors.length ? 1 : 0);
+}
+
+if (workerMode) {
+    startWorker();
+} else if (buildMode) {
+    const separator = process.argv.indexOf('--');
+    buildComponents(
+        process.argv[3],
+        getOption('--root'),
+        separator >= 0 ? process.argv.slice(separator + 1) : []
+    );
+} else if (socketPath) {
+    startDaemon();
+} else if (process.argv.length >= 3) {
+    // Handle command line arguments
+    // argv[2] = componentPath, argv[3] = propsJson, argv[4] = cacheEnabled
     const componentPath = process.argv[2];
     const propsJson = process.argv[3] || '{}';
-    
+
     try {
         const props = JSON.parse(propsJson);
         const result = renderComponent(componentPath, props);
@@ -84,7 +806,7 @@ if (process.argv.length >= 3) {
         console.log(JSON.stringify({
             success: false,
             html: null,
-            error: { 
+            error: {
                 message: `Invalid JSON props: ${parseError.message}`,
                 stack: parseError.stack
             }
@@ -2,20 +2,94 @@
 Tests for Flask-React extension with Node.js-based rendering.
 """
 
+import asyncio
+import json
 import os
+import socket
 import subprocess
 import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
-from flask import Flask
-
-from flask_react import FlaskReact, NodeRenderer
+from flask import Flask, request, url_for
+
+from flask_react import FlaskReact, NodeRenderer, SocketRenderer
+from flask_react.aio import AsyncNodeWorkerPool, AsyncSocketClient
+from flask_react.build import build_components
+from flask_react.cache import (
+    CacheBackend,
+    FileSystemCache,
+    RenderCache,
+    SQLiteCache,
+    create_cache_backend,
+)
+from flask_react.export import collect_urls, export_pages, output_path
+from flask_react.fallback import CircuitBreaker, render_placeholder
+from flask_react.flight import SingleFlight
+from flask_react.index import ComponentIndex
+from flask_react.metrics import OTHER_COMPONENTS, RenderMetrics
 from flask_react.exceptions import (
+    ComponentCompileError,
     ComponentNotFoundError,
     JavaScriptEngineError,
     RenderError,
+    RenderTimeoutError,
+)
+from flask_react import signals
+from flask_react.node_worker import (
+    NodeWorkerPool,
+    WorkerLimits,
+    process_rss,
+    read_frame,
+    write_frame,
 )
+from flask_react.socket_renderer import SocketClient, default_socket_path
+
+# Minimal stand-in for ssr_server.js --worker that echoes requests back after
+# an optional delay, so worker management can be tested without React
+ECHO_WORKER_SCRIPT = """
+let buffered = Buffer.alloc(0);
+process.stdin.on('data', (chunk) => {
+    buffered = Buffer.concat([buffered, chunk]);
+    while (buffered.length >= 4 && buffered.length >= 4 + buffered.readUInt32BE(0)) {
+        const length = buffered.readUInt32BE(0);
+        const message = JSON.parse(buffered.subarray(4, 4 + length).toString('utf8'));
+        buffered = buffered.subarray(4 + length);
+        const send = (reply) => {
+            const body = Buffer.from(JSON.stringify(Object.assign({ id: message.id }, reply)));
+            const header = Buffer.alloc(4);
+            header.writeUInt32BE(body.length, 0);
+            process.stdout.write(Buffer.concat([header, body]));
+        };
+        const reply = () => {
+            if (message.type === 'stream') {
+                message.props.chunks.forEach((chunk) => send({ chunk: chunk }));
+                send({ success: true, done: true, html: null, error: null });
+            } else {
+                send({
+                    success: true,
+                    html: String(process.pid),
+                    error: null,
+                    propsSize: JSON.stringify(message.props || {}).length
+                });
+            }
+        };
+        setTimeout(reply, (message.props && message.props.delay) || 0);
+    }
+});
+"""
+
+
+def node_available():
+    """Check whether a Node.js executable is on the PATH."""
+    try:
+        subprocess.run(["node", "--version"], capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
 
 
 class TestFlaskReact:
@@ -491,6 +565,2394 @@ module.exports = TimeoutTest;
             renderer.render_component("TimeoutTest")
 
 
+class TestTemplatedProps:
+    """Test Jinja2 processing of props."""
+
+    @pytest.fixture
+    def react(self, tmp_path):
+        """An extension with a custom Jinja2 filter."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_JSON_PROPS"] = {"Chart": ["series"]}
+        app.jinja_env.filters["shout"] = lambda value: value.upper() + "!"
+        return FlaskReact(app)
+
+    def rendered_props(self, react, component_name, props, data, **kwargs):
+        """Render with the renderer patched out, returning the props it got."""
+        with patch.object(react.renderer, "render_component") as render:
+            render.return_value = ""
+            react.render_component(component_name, props, data, **kwargs)
+        return render.call_args[0][1]
+
+    def test_templates_compiled_once(self, react):
+        """Test that templated props are compiled once, with the app's filters."""
+        props = {"title": "{{ name|shout }}", "count": "{{ n }}"}
+        for n in range(3):
+            data = {"name": "<a>", "n": n}
+            rendered = self.rendered_props(react, "Card", props, data)
+            assert rendered == {"title": "<A>!", "count": n}
+        info = react._prop_template.cache_info()
+        assert (info.misses, info.hits) == (2, 4)
+
+    def test_json_props(self, react):
+        """Test declared JSON props and the parsing of undeclared ones."""
+        props = {"series": "{{ items|tojson }}", "label": "{{ n }}"}
+        data = {"items": [1, 2], "n": 3}
+
+        # Undeclared: values are parsed when they look like JSON
+        assert self.rendered_props(react, "Card", props, data) == {
+            "series": [1, 2],
+            "label": 3,
+        }
+        # Declared in the configuration: only those are parsed
+        assert self.rendered_props(react, "Chart", props, data) == {
+            "series": [1, 2],
+            "label": "3",
+        }
+        # Declared on the call
+        assert self.rendered_props(
+            react, "Chart", props, data, json_props=["label"]
+        ) == {"series": "[1, 2]", "label": 3}
+
+
+class TestNodeWorker:
+    """Test the persistent Node.js worker."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create temporary directory for components."""
+        import shutil
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        test_components_dir = os.path.join(project_root, "test_components_temp_worker")
+
+        # Create the directory
+        os.makedirs(test_components_dir, exist_ok=True)
+
+        yield test_components_dir
+
+        # Clean up after test
+        if os.path.exists(test_components_dir):
+            shutil.rmtree(test_components_dir)
+
+    def test_frame_round_trip(self):
+        """Test length-prefixed framing of messages."""
+        import io
+
+        stream = io.BytesIO()
+        write_frame(stream, {"id": 1, "props": {"name": "Flask"}})
+        write_frame(stream, {"id": 2, "props": {}})
+        stream.seek(0)
+
+        assert read_frame(stream) == {"id": 1, "props": {"name": "Flask"}}
+        assert read_frame(stream) == {"id": 2, "props": {}}
+        assert read_frame(stream) is None
+
+    def test_worker_is_reused_and_restarted(self, temp_dir):
+        """Test that renders share one worker and a dead worker is replaced."""
+        # Skip test if Node.js is not available
+        try:
+            subprocess.run(["node", "--version"], capture_output=True, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pytest.skip("Node.js not available for testing")
+
+        # Skip test if React dependencies are not available in project
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        node_modules = os.path.join(project_root, "node_modules")
+        if not os.path.exists(os.path.join(node_modules, "react")):
+            pytest.skip("React dependencies not installed - run 'npm install' first")
+
+        component_code = """const React = require('react');
+function Echo({ text }) { return React.createElement('span', {}, text); }
+module.exports = Echo;
+"""
+        with open(os.path.join(temp_dir, "Echo.jsx"), "w") as f:
+            f.write(component_code)
+
+        renderer = NodeRenderer(components_dir=temp_dir, pool_size=1)
+        try:
+            assert "first" in renderer.render_component("Echo", {"text": "first"})
+            worker = renderer._transport.workers[0]
+            pid = worker.pid
+            assert "second" in renderer.render_component("Echo", {"text": "second"})
+            assert worker.pid == pid
+
+            # Kill the worker, the next render should start a new one
+            worker.stop()
+            assert "third" in renderer.render_component("Echo", {"text": "third"})
+            assert worker.pid != pid
+        finally:
+            renderer.close()
+
+
+class TestNodeWorkerPool:
+    """Test dispatch across a pool of persistent workers."""
+
+    @pytest.fixture
+    def echo_script(self, tmp_path):
+        """Write the echo worker script."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        return script
+
+    def test_concurrent_requests_use_separate_workers(self, echo_script):
+        """Test that concurrent requests are spread over idle workers."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = NodeWorkerPool(echo_script, size=2)
+        message = {"type": "render", "props": {"delay": 300}}
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(pool.request, message, 10) for _ in range(4)]
+                pids = {future.result()["html"] for future in futures}
+
+            # Four requests, but never more than two processes
+            assert len(pids) == 2
+        finally:
+            pool.close()
+
+    def test_idle_worker_is_reused(self, echo_script):
+        """Test that sequential requests keep using the same warm worker."""
+        pool = NodeWorkerPool(echo_script, size=4)
+        try:
+            pids = {pool.request({"type": "ping"}, 10)["html"] for _ in range(5)}
+            assert len(pids) == 1
+            assert sum(worker.is_alive() for worker in pool.workers) == 1
+        finally:
+            pool.close()
+
+    def test_stream_frames(self, echo_script):
+        """Test streaming several frames and reusing the worker afterwards."""
+        pool = NodeWorkerPool(echo_script, size=1)
+        message = {"type": "stream", "props": {"chunks": ["<div>", "</div>"]}}
+        try:
+            frames = list(pool.stream(message, 10))
+            assert [frame.get("chunk") for frame in frames] == ["<div>", "</div>", None]
+            assert frames[-1]["done"] is True
+
+            # Abandon a stream halfway, the worker must still answer correctly
+            stream = pool.stream(message, 10)
+            next(stream)
+            stream.close()
+            assert pool.request({"type": "ping"}, 10)["success"] is True
+        finally:
+            pool.close()
+
+    def test_queued_request_times_out(self, echo_script):
+        """Test that callers waiting for a busy pool give up at the timeout."""
+        import threading
+
+        pool = NodeWorkerPool(echo_script, size=1)
+        busy = threading.Thread(
+            target=pool.request,
+            args=({"type": "render", "props": {"delay": 1000}}, 10),
+        )
+        try:
+            busy.start()
+            time.sleep(0.2)
+            with pytest.raises(subprocess.TimeoutExpired):
+                pool.request({"type": "ping"}, 0.1)
+            busy.join()
+        finally:
+            pool.close()
+
+    def test_queue_wait_timeout_keeps_worker(self, echo_script):
+        """Test that a worker freed after a caller's deadline is not restarted."""
+        pool = NodeWorkerPool(echo_script, size=1)
+        try:
+            pid = pool.request({"type": "ping"}, 10)["html"]
+            get = pool._idle.get
+
+            def get_late(timeout=None):
+                # The busy worker is only released once the wait has timed out
+                time.sleep(timeout)
+                return get(timeout=timeout)
+
+            with patch.object(pool._idle, "get", side_effect=get_late):
+                with pytest.raises(subprocess.TimeoutExpired):
+                    pool.request({"type": "ping"}, 0.1)
+            assert pool.request({"type": "ping"}, 10)["html"] == pid
+        finally:
+            pool.close()
+
+
+class TestWorkerLimits:
+    """Test recycling of workers that reach their limits."""
+
+    @pytest.fixture
+    def echo_script(self, tmp_path):
+        """Write the echo worker script."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        return script
+
+    def test_recycled_after_max_requests(self, echo_script):
+        """Test that a worker is replaced after its last allowed request."""
+        limits = WorkerLimits(max_requests=3, max_old_space_size=64)
+        pool = NodeWorkerPool(echo_script, size=1, limits=limits)
+        try:
+            pids = [pool.request({"type": "ping"}, 10)["html"] for _ in range(7)]
+            worker = pool.workers[0]
+            assert "--max-old-space-size=64" in worker._process.args
+        finally:
+            pool.close()
+
+        assert pids[:3] == [pids[0]] * 3
+        assert pids[3:6] == [pids[3]] * 3
+        assert len(set(pids)) == 3
+        assert worker.recycled == 2
+
+    def test_async_worker_drains_in_flight_requests(self, echo_script):
+        """Test that pipelined requests survive their worker being recycled."""
+        pool = AsyncNodeWorkerPool(
+            echo_script, size=1, limits=WorkerLimits(max_requests=2)
+        )
+        message = {"type": "render", "props": {"delay": 200}}
+
+        async def render_all():
+            return await asyncio.gather(*(pool.request(message, 10) for _ in range(6)))
+
+        try:
+            responses = asyncio.run(render_all())
+            worker = pool.workers[0]
+        finally:
+            pool.close()
+
+        assert all(response["success"] for response in responses)
+        assert len({response["html"] for response in responses}) == 3
+        assert worker.recycled == 2
+
+    def test_recycled_above_rss_ceiling(self, echo_script):
+        """Test the resident memory ceiling read from /proc."""
+        if process_rss(os.getpid()) is None:
+            pytest.skip("/proc is not available")
+
+        pool = NodeWorkerPool(echo_script, size=1, limits=WorkerLimits(max_rss_mb=1))
+        try:
+            pids = {pool.request({"type": "ping"}, 10)["html"] for _ in range(3)}
+        finally:
+            pool.close()
+        assert len(pids) == 3
+
+
+class TestRenderDeadlines:
+    """Test per-render deadlines."""
+
+    @pytest.fixture
+    def renderer(self, tmp_path):
+        """A renderer whose workers run the echo script."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        (tmp_path / "Slow.js").write_text("")
+        (tmp_path / "Fast.js").write_text("")
+        renderer = NodeRenderer(
+            components_dir=str(tmp_path),
+            cache_enabled=False,
+            pool_size=1,
+            component_timeouts={"Slow": 0.2},
+        )
+        renderer.ssr_script_path = script
+        yield renderer
+        renderer._get_transport().close()
+        if renderer._async_transport is not None:
+            renderer._async_transport.close()
+
+    def test_per_call_timeout_replaces_worker(self, renderer):
+        """Test that a missed deadline fails at once and replaces the worker."""
+        pid = renderer.render_component("Fast")
+
+        start = time.monotonic()
+        with pytest.raises(RenderTimeoutError, match="after 0.2 seconds"):
+            renderer.render_component("Fast", {"delay": 5000}, timeout=0.2)
+        assert time.monotonic() - start < 2
+
+        assert renderer.render_component("Fast") != pid
+
+    def test_component_timeouts(self, renderer):
+        """Test that configured component deadlines apply to their renders."""
+        with pytest.raises(RenderTimeoutError):
+            renderer.render_component("Slow", {"delay": 5000})
+        # Other components keep the default deadline
+        assert renderer.render_component("Fast", {"delay": 300})
+        # An explicit deadline wins over the configured one
+        assert renderer.render_component("Slow", {"delay": 300}, timeout=5)
+
+    def test_async_timeout(self, renderer):
+        """Test deadlines of async renders."""
+        with pytest.raises(RenderTimeoutError):
+            asyncio.run(
+                renderer.render_component_async("Fast", {"delay": 5000}, timeout=0.2)
+            )
+        assert asyncio.run(renderer.render_component_async("Fast"))
+
+    def test_config(self, tmp_path):
+        """Test that the extension passes component deadlines to the renderer."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_COMPONENT_TIMEOUTS"] = {"Chart": 0.5}
+        react = FlaskReact(app)
+        assert react.renderer.component_timeouts == {"Chart": 0.5}
+        assert issubclass(RenderTimeoutError, RenderError)
+
+
+class TestFallback:
+    """Test client-side rendering fallback and load shedding."""
+
+    @pytest.fixture
+    def react(self, tmp_path):
+        """An extension with the fallback turned on."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("")
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_CSR_FALLBACK"] = True
+        app.config["FLASK_REACT_FALLBACK_QUEUE_DEPTH"] = 2
+        app.config["FLASK_REACT_FALLBACK_QUEUE_WAIT"] = 0.5
+        app.config["FLASK_REACT_CIRCUIT_BREAKER_THRESHOLD"] = 2
+        app.config["FLASK_REACT_CIRCUIT_BREAKER_RESET"] = 0.1
+        return FlaskReact(app)
+
+    def test_placeholder(self):
+        """Test that placeholders carry the component name and escaped props."""
+        import html
+
+        props = {"title": '"<b>" & more'}
+        placeholder = render_placeholder("Card", props)
+        assert placeholder.startswith('<div data-react-component="Card" ')
+        encoded = placeholder.split('data-react-props="')[1].split('"')[0]
+        assert json.loads(html.unescape(encoded)) == props
+
+    def test_circuit_breaker(self):
+        """Test that the breaker opens, lets one trial through and closes."""
+        breaker = CircuitBreaker(threshold=2, reset_timeout=0.1)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        time.sleep(0.15)
+        assert breaker.allow()
+        assert not breaker.allow()  # Only one trial at a time
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        time.sleep(0.15)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_sheds_on_queue_depth_and_wait(self, react):
+        """Test that a congested worker queue is answered with placeholders."""
+        with patch.object(react.renderer, "render_component") as render:
+            render.return_value = "<div>ssr</div>"
+            with patch.object(react.renderer, "queue_stats", return_value=(3, 0.0)):
+                assert "data-react-component" in react.render_component("Card")
+            with patch.object(react.renderer, "queue_stats", return_value=(1, 0.8)):
+                assert "data-react-component" in react.render_component("Card")
+            assert react.render_component("Card") == "<div>ssr</div>"
+            assert render.call_count == 1
+
+        reasons = react.stats()["fallback"]["reasons"]
+        assert reasons["queue_depth"] == 1
+        assert reasons["queue_wait"] == 1
+
+    def test_sheds_cached_components_with_their_html(self, react):
+        """Test that cached HTML is still served while shedding."""
+        with patch.object(react.renderer, "cached_render", return_value="<p>c</p>"):
+            with patch.object(react.renderer, "queue_stats", return_value=(3, 0.0)):
+                assert react.render_component("Card") == "<p>c</p>"
+        assert react.stats()["fallback"]["total"] == 0
+
+    def test_failures_open_the_breaker(self, react):
+        """Test that failed renders fall back and stop reaching Node.js."""
+        with patch.object(react.renderer, "render_component") as render:
+            render.side_effect = RenderError("boom")
+            for _ in range(3):
+                assert "data-react-component" in react.render_component("Card")
+            assert render.call_count == 2
+
+            time.sleep(0.15)
+            render.side_effect = None
+            render.return_value = "<div>ssr</div>"
+            assert react.render_component("Card") == "<div>ssr</div>"
+
+        stats = react.stats()["fallback"]
+        assert stats["reasons"]["render_error"] == 2
+        assert stats["reasons"]["circuit_open"] == 1
+        assert stats["circuit"] == "closed"
+
+    def test_pool_reports_waiting_callers(self, tmp_path):
+        """Test the queue depth and wait time reported by the worker pool."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+        import threading
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        pool = NodeWorkerPool(script, size=1)
+        message = {"type": "render", "props": {"delay": 600}}
+        threads = [
+            threading.Thread(target=pool.request, args=(message, 10)) for _ in range(2)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+                time.sleep(0.2)
+            assert pool.waiting == 1
+            assert pool.longest_wait >= 0.1
+            for thread in threads:
+                thread.join()
+            assert (pool.waiting, pool.longest_wait) == (0, 0.0)
+        finally:
+            pool.close()
+
+
+class TestCoalescing:
+    """Test per-request memoization and single-flight render coalescing."""
+
+    @pytest.fixture
+    def renderer(self, tmp_path):
+        """An uncached renderer whose workers run the echo script."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        (tmp_path / "Card.js").write_text("")
+        renderer = NodeRenderer(
+            components_dir=str(tmp_path), cache_enabled=False, pool_size=4
+        )
+        renderer.ssr_script_path = script
+        yield renderer
+        renderer._get_transport().close()
+        if renderer._async_transport is not None:
+            renderer._async_transport.close()
+
+    def test_concurrent_renders_share_one_call(self, renderer):
+        """Test that identical renders in flight together make one Node.js call."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            same = [
+                executor.submit(renderer.render_component, "Card", {"delay": 400})
+                for _ in range(4)
+            ]
+            assert len({future.result() for future in same}) == 1
+        assert renderer.cache_stats()["coalesced"] == 3
+
+        # Renders with different props are not shared
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            different = [
+                executor.submit(renderer.render_component, "Card", {"delay": 400 + i})
+                for i in range(2)
+            ]
+            assert len({future.result() for future in different}) == 2
+        assert renderer.cache_stats()["coalesced"] == 3
+
+    def test_async_renders_share_one_call(self, renderer):
+        """Test coalescing of concurrent async renders."""
+
+        async def render_all():
+            props = {"delay": 300}
+            return await asyncio.gather(
+                *(renderer.render_component_async("Card", props) for _ in range(3))
+            )
+
+        assert len(set(asyncio.run(render_all()))) == 1
+        assert renderer.cache_stats()["coalesced"] == 2
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failed shared call raises in all of its callers."""
+        import threading
+
+        flights = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise RenderError("boom")
+
+        def call():
+            try:
+                flights.do("key", fail, 5)
+            except RenderError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        follower = threading.Thread(target=call)
+        follower.start()
+        leader.join()
+        follower.join()
+
+        assert len(errors) == 2
+        assert errors[0] is errors[1]
+        assert flights.coalesced == 1
+        # The failed call is forgotten, the next caller tries again
+        assert flights.do("key", lambda: "ok", 5) == "ok"
+
+    def test_request_memo(self, tmp_path):
+        """Test that repeated renders within a request reach the renderer once."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        react = FlaskReact(app)
+        with patch.object(react.renderer, "render_component") as render:
+            render.return_value = "<nav></nav>"
+            with app.test_request_context():
+                assert react.render_component("Nav", {"page": 1}) == "<nav></nav>"
+                assert react.render_component("Nav", {"page": 1}) == "<nav></nav>"
+                react.render_component("Nav", {"page": 2})
+                assert render.call_count == 2
+            # The memo ends with the request
+            with app.test_request_context():
+                react.render_component("Nav", {"page": 1})
+                assert render.call_count == 3
+
+            app.config["FLASK_REACT_REQUEST_MEMO"] = False
+            with app.test_request_context():
+                react.render_component("Nav", {"page": 1})
+                react.render_component("Nav", {"page": 1})
+                assert render.call_count == 5
+
+    def test_coalescing_can_be_turned_off(self, tmp_path):
+        """Test that the extension passes the coalescing setting on."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_COALESCE_RENDERS"] = False
+        react = FlaskReact(app)
+        assert react.renderer._flights is None
+        assert react.renderer.cache_stats()["coalesced"] == 0
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available"
+)
+class TestSocketClient:
+    """Test the SSR daemon client."""
+
+    @pytest.fixture
+    def echo_server(self):
+        """Serve framed echo responses on a Unix socket."""
+        import socketserver
+        import threading
+
+        connections = []
+
+        class EchoHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                connections.append(self.connection)
+                while True:
+                    message = read_frame(self.rfile)
+                    if message is None:
+                        return
+                    write_frame(
+                        self.wfile,
+                        {
+                            "id": message["id"],
+                            "success": True,
+                            "html": str(os.getpid()),
+                        },
+                    )
+
+        socket_dir = tempfile.mkdtemp()
+        socket_path = os.path.join(socket_dir, "ssr.sock")
+
+        def start():
+            server = socketserver.ThreadingUnixStreamServer(socket_path, EchoHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            return server
+
+        def stop(server):
+            server.shutdown()
+            server.server_close()
+            for connection in connections:
+                connection.shutdown(socket.SHUT_RDWR)
+            os.unlink(socket_path)
+
+        server = start()
+        yield socket_path, lambda: stop(server), start
+        try:
+            stop(server)
+        except OSError:
+            pass
+
+    def test_request_round_trip(self, echo_server):
+        """Test sending a request over the socket."""
+        socket_path, _, _ = echo_server
+        client = SocketClient(socket_path, size=2)
+        try:
+            response = client.request({"type": "ping"}, 5)
+            assert response["success"] is True
+        finally:
+            client.close()
+
+    def test_reconnects_after_server_restart(self, echo_server):
+        """Test that dropped connections are replaced transparently."""
+        socket_path, stop, start = echo_server
+        client = SocketClient(socket_path, size=1)
+        try:
+            client.request({"type": "ping"}, 5)
+
+            # Drop the server together with its open connections
+            stop()
+            with pytest.raises(JavaScriptEngineError):
+                client.request({"type": "ping"}, 5)
+
+            start()
+            assert client.request({"type": "ping"}, 5)["success"] is True
+        finally:
+            client.close()
+
+    def test_async_client_multiplexes_requests(self, echo_server):
+        """Test concurrent async requests and reconnecting after a restart."""
+        socket_path, stop, start = echo_server
+        client = AsyncSocketClient(socket_path, size=2)
+
+        async def ping_all():
+            return await asyncio.gather(
+                *(client.request({"type": "ping"}, 5) for _ in range(10))
+            )
+
+        try:
+            assert all(response["success"] for response in asyncio.run(ping_all()))
+            stop()
+            start()
+            assert all(response["success"] for response in asyncio.run(ping_all()))
+        finally:
+            client.close()
+
+    def test_socket_renderer_from_config(self, tmp_path):
+        """Test selecting the socket renderer through configuration."""
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_RENDERER"] = "socket"
+        app.config["FLASK_REACT_SOCKET_PATH"] = str(tmp_path / "ssr.sock")
+
+        react = FlaskReact(app)
+        assert isinstance(react.renderer, SocketRenderer)
+        assert react.renderer.socket_path == str(tmp_path / "ssr.sock")
+
+    def test_default_socket_path_is_private(self, tmp_path, monkeypatch):
+        """Test that the default socket lives in a directory only its owner can use."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        path = default_socket_path()
+        assert path == str(tmp_path / "flask-react" / "ssr.sock")
+        assert (tmp_path / "flask-react").stat().st_mode & 0o777 == 0o700
+        assert default_socket_path() == path
+
+        (tmp_path / "flask-react").chmod(0o755)
+        with pytest.raises(JavaScriptEngineError, match="FLASK_REACT_SOCKET_PATH"):
+            default_socket_path()
+
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        monkeypatch.setattr(tempfile, "gettempdir", lambda: str(tmp_path))
+        expected = tmp_path / f"flask-react-{os.getuid()}" / "ssr.sock"
+        assert default_socket_path() == str(expected)
+
+    def test_ssr_server_resolves_paths_from_working_directory(
+        self, tmp_path, monkeypatch
+    ):
+        """Test that relative paths are resolved before moving to the project root."""
+        from flask_react import cli
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(os, "name", "posix")
+        with patch.object(os, "execvp") as execvp, patch.object(
+            os, "chdir"
+        ), patch.object(cli.subprocess, "call"):
+            cli.run_ssr_server(
+                "ssr.sock", workers=2, cache=False, transpile_cache="transpiled"
+            )
+        command = execvp.call_args[0][1]
+        assert command[command.index("--socket") + 1] == str(tmp_path / "ssr.sock")
+        assert command[command.index("--transpile-cache") + 1] == str(
+            tmp_path / "transpiled"
+        )
+        assert command[command.index("--workers") + 1] == "2"
+        assert "--no-cache" in command
+
+
+class TestComponentIndex:
+    """Test the component file index."""
+
+    def test_resolution_order_and_lookups(self, tmp_path):
+        """Test that known names resolve without rescanning the directory."""
+        (tmp_path / "Card.jsx").write_text("")
+        (tmp_path / "Card.js").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        index = ComponentIndex(tmp_path)
+
+        with patch.object(index, "refresh") as refresh:
+            assert index.get("Card").path == tmp_path / "Card.js"
+            refresh.assert_not_called()
+        assert index.names() == ["Card"]
+
+    def test_added_and_removed_files(self, tmp_path):
+        """Test that unknown names rescan and removed files drop out."""
+        index = ComponentIndex(tmp_path)
+        assert index.get("Page") is None
+
+        (tmp_path / "Page.tsx").write_text("")
+        assert index.get("Page").path == tmp_path / "Page.tsx"
+
+        (tmp_path / "Page.tsx").unlink()
+        assert index.names() == []
+
+    def test_watcher_reports_changes(self, tmp_path):
+        """Test that the polling watcher notices edits to existing files."""
+        component = tmp_path / "Card.jsx"
+        component.write_text("")
+        index = ComponentIndex(tmp_path)
+        changes = []
+        index.add_listener(changes.append)
+
+        index.watch(interval=0.05)
+        try:
+            os.utime(component, ns=(0, 10**18))
+            deadline = time.monotonic() + 5
+            while not changes and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            index.stop()
+
+        assert changes == [[component]]
+        assert index.get("Card").mtime_ns == 10**18
+
+
+class TestHotReload:
+    """Test reloading changed modules in warm workers."""
+
+    def test_watcher_tracks_imported_modules(self, tmp_path):
+        """Test that edits to modules in subdirectories are reported."""
+        (tmp_path / "Card.jsx").write_text("")
+        (tmp_path / "lib").mkdir()
+        helper = tmp_path / "lib" / "format.js"
+        helper.write_text("")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("")
+
+        index = ComponentIndex(tmp_path)
+        changes = []
+        index.add_listener(changes.append)
+        index.watch(interval=60)
+        try:
+            os.utime(helper, ns=(0, 10**18))
+            os.utime(tmp_path / "node_modules" / "dep.js", ns=(0, 10**18))
+            index.refresh()
+        finally:
+            index.stop()
+
+        assert changes == [[helper]]
+        assert index.names() == ["Card"]
+
+    def test_watcher_tracks_imports_outside_directory(self, tmp_path):
+        """Test that imported files outside the directory are reported once tracked."""
+        components = tmp_path / "components"
+        components.mkdir()
+        component = components / "Card.jsx"
+        component.write_text("")
+        shared = tmp_path / "shared.js"
+        shared.write_text("")
+
+        index = ComponentIndex(components)
+        changes = []
+        index.add_listener(changes.append)
+        index.watch(interval=60)
+        try:
+            index.track([shared, component])
+            os.utime(shared, ns=(0, 10**18))
+            index.refresh()
+        finally:
+            index.stop()
+
+        assert changes == [[shared]]
+
+    def test_reload_watches_imports_outside_components(self, tmp_path):
+        """Test that files imported from outside the components directory are watched."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        components = tmp_path / "components"
+        components.mkdir()
+        (components / "Card.jsx").write_text("require('../shared');")
+        shared = tmp_path / "shared.js"
+        shared.write_text("")
+        renderer = NodeRenderer(
+            components_dir=str(components),
+            cache_enabled=False,
+            auto_reload=True,
+            watch_interval=60,
+        )
+        result = {
+            "success": True,
+            "html": "<div/>",
+            "dependencies": [os.path.realpath(shared)],
+        }
+        changes = []
+        renderer._index.add_listener(changes.append)
+        try:
+            with patch.object(
+                renderer, "_render_with_worker", return_value=result
+            ) as render:
+                renderer.render_component("Card")
+            assert render.call_args.kwargs["dependencies"] is True
+
+            os.utime(shared, ns=(0, 10**18))
+            renderer._index.refresh()
+        finally:
+            renderer.close()
+
+        assert changes == [[Path(os.path.realpath(shared))]]
+
+    def test_broadcast_reaches_running_workers_only(self, tmp_path):
+        """Test that broadcasting does not start idle workers."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        pool = NodeWorkerPool(script, size=3)
+        try:
+            pool.request({"type": "ping"}, 10)
+            pool.broadcast({"type": "invalidate", "files": []}, 10)
+            assert sum(worker.is_alive() for worker in pool.workers) == 1
+        finally:
+            pool.close()
+
+    def test_change_forgets_imports_and_notifies_workers(self, tmp_path):
+        """Test that a change drops its importers' graphs and invalidates modules."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "lib").mkdir()
+        helper = tmp_path / "lib" / "format.js"
+        helper.write_text("module.exports = 1;")
+        (tmp_path / "Card.jsx").write_text("")
+        (tmp_path / "Badge.jsx").write_text("")
+        renderer = NodeRenderer(components_dir=str(tmp_path))
+        with patch.object(renderer, "_render_with_worker") as render:
+            render.return_value = {
+                "success": True,
+                "html": "<div/>",
+                "dependencies": [os.path.realpath(helper)],
+            }
+            renderer.render_component("Card")
+            render.return_value = {"success": True, "html": "<div/>"}
+            renderer.render_component("Badge")
+        assert renderer.cache_stats()["entries"] == 2
+
+        with patch.object(renderer, "_transport") as transport:
+            renderer._reload_changed([helper])
+
+        assert list(renderer._dependencies) == [tmp_path / "Badge.jsx"]
+        assert renderer._dependents == {}
+        transport.broadcast.assert_called_once_with(
+            {"type": "invalidate", "files": [str(helper)]},
+            timeout=renderer.timeout,
+        )
+
+    def test_reload_keeps_worker_warm(self):
+        """Test that an edited import is re-evaluated in the same worker."""
+        import shutil
+
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        node_modules = os.path.join(project_root, "node_modules")
+        if not os.path.exists(os.path.join(node_modules, "react")):
+            pytest.skip("React dependencies not installed - run 'npm install' first")
+
+        temp_dir = os.path.join(project_root, "test_components_temp_reload")
+        os.makedirs(os.path.join(temp_dir, "lib"), exist_ok=True)
+        helper = os.path.join(temp_dir, "lib", "label.js")
+        with open(os.path.join(temp_dir, "Label.js"), "w") as f:
+            f.write("""const React = require('react');
+const label = require('./lib/label');
+module.exports = () => React.createElement('span', {}, label);
+""")
+        with open(helper, "w") as f:
+            f.write("module.exports = 'before';")
+
+        renderer = NodeRenderer(
+            components_dir=temp_dir, pool_size=1, auto_reload=True, watch_interval=60
+        )
+        try:
+            assert "before" in renderer.render_component("Label")
+            pid = renderer._transport.workers[0].pid
+
+            with open(helper, "w") as f:
+                f.write("module.exports = 'after!';")
+            renderer._index.refresh()
+
+            assert "after!" in renderer.render_component("Label")
+            assert renderer._transport.workers[0].pid == pid
+        finally:
+            renderer.close()
+            shutil.rmtree(temp_dir)
+
+
+class TestDependencyGraph:
+    """Test cache versions covering the files a component imports."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """A component importing a helper, and a caching renderer for it."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "lib").mkdir()
+        helper = tmp_path / "lib" / "format.js"
+        helper.write_text("module.exports = 'v1';")
+        (tmp_path / "Card.jsx").write_text("require('./lib/format');")
+        renderer = NodeRenderer(components_dir=str(tmp_path))
+        result = {
+            "success": True,
+            "html": "<div/>",
+            "dependencies": [os.path.realpath(helper)],
+        }
+        with patch.object(renderer, "_render_with_worker", return_value=result):
+            yield renderer, helper
+        renderer.close()
+
+    def test_first_render_reports_imports(self, project):
+        """Test that only renders of components with unknown imports ask for them."""
+        renderer, helper = project
+        renderer.render_component("Card", {"id": 1})
+        renderer.render_component("Card", {"id": 2})
+
+        calls = renderer._render_with_worker.call_args_list
+        assert [call.kwargs["dependencies"] for call in calls] == [True, False]
+        card = renderer._find_component_file("Card")
+        assert renderer._dependencies[card] == (Path(os.path.realpath(helper)),)
+        assert renderer._dependents[Path(os.path.realpath(helper))] == {card}
+
+    def test_first_render_counts_a_miss(self, project):
+        """Test that a render without a cache key yet is counted as a miss."""
+        renderer, _ = project
+        renderer.render_component("Card")
+        renderer.render_component("Card")
+        stats = renderer.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_import_change_invalidates_render(self, project):
+        """Test that a watched edit of an imported file changes the version."""
+        renderer, helper = project
+        renderer.render_component("Card")
+        version = renderer.component_version("Card")
+        renderer.render_component("Card")
+        assert renderer._render_with_worker.call_count == 1
+
+        # Workers keep the loaded module until the watcher evicts it, so their
+        # HTML must not be cached under the edited file's version
+        helper.write_text("module.exports = 'v2';")
+        assert renderer.component_version("Card") == version
+        renderer.render_component("Card")
+        assert renderer._render_with_worker.call_count == 1
+
+        renderer._reload_changed([helper])
+        renderer.render_component("Card")
+        assert renderer._render_with_worker.call_count == 2
+        assert renderer.component_version("Card") != version
+
+    def test_version_lookup_skips_files(self, project):
+        """Test that a known version is reused without reading any file."""
+        renderer, _ = project
+        renderer.render_component("Card")
+        version = renderer.component_version("Card")
+        with patch.object(renderer, "_file_hash", side_effect=AssertionError):
+            assert renderer.component_version("Card") == version
+            renderer.render_component("Card")
+
+    def test_version_ignores_modification_time(self, project):
+        """Test that versions only depend on content, matching across processes."""
+        renderer, helper = project
+        renderer.render_component("Card")
+        version = renderer.component_version("Card")
+
+        other = NodeRenderer(components_dir=renderer.components_dir)
+        os.utime(helper, (1, 1))
+        with patch.object(other, "_get_transport") as transport:
+            transport.return_value.request.return_value = {
+                "success": True,
+                "dependencies": [os.path.realpath(helper)],
+            }
+            assert other.component_version("Card") == version
+        message = transport.return_value.request.call_args[0][0]
+        assert message["type"] == "dependencies"
+
+    def test_unknown_imports_have_no_version(self, project):
+        """Test that a component has no version while Node.js can't report imports."""
+        renderer, _ = project
+        with patch.object(renderer, "_get_transport") as transport:
+            transport.return_value.request.side_effect = RenderError("no worker")
+            assert renderer.component_version("Card") is None
+        assert renderer._dependencies == {}
+
+
+class TestRenderCache:
+    """Test the rendered HTML cache."""
+
+    def test_key_is_canonical(self):
+        """Test that prop order does not change the cache key."""
+        key1 = RenderCache.make_key("Card", {"a": 1, "b": [1, 2]}, "v1")
+        key2 = RenderCache.make_key("Card", {"b": [1, 2], "a": 1}, "v1")
+        assert key1 == key2
+        assert key1 != RenderCache.make_key("Card", {"a": 1, "b": [1, 2]}, "v2")
+        assert key1 != RenderCache.make_key("Card", {"a": 2, "b": [1, 2]}, "v1")
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = RenderCache(max_entries=2)
+        cache.set("a", "<a/>")
+        cache.set("b", "<b/>")
+        cache.get("a")
+        cache.set("c", "<c/>")
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_eviction_by_bytes(self):
+        """Test that the total cached size stays within the byte limit."""
+        cache = RenderCache(max_entries=10, max_bytes=10)
+        cache.set("a", "x" * 6)
+        cache.set("b", "y" * 6)
+        assert "a" not in cache
+        assert cache.stats()["bytes"] == 6
+
+        # Entries larger than the whole cache are not stored
+        cache.set("c", "z" * 11)
+        assert "c" not in cache
+
+    def test_stats_and_clear(self):
+        """Test hit and miss counters and clearing."""
+        cache = RenderCache()
+        cache.set("a", "<a/>")
+        assert cache.get("a") == "<a/>"
+        assert cache.get("b") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_renderer_serves_repeated_renders_from_cache(self, tmp_path):
+        """Test that identical renders reach Node.js only once."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        component_file = tmp_path / "Card.jsx"
+        component_file.write_text("module.exports = () => null;")
+        renderer = NodeRenderer(components_dir=str(tmp_path))
+
+        with patch.object(
+            renderer,
+            "_render_with_worker",
+            return_value={"success": True, "html": "<div>card</div>"},
+        ) as render:
+            assert renderer.render_component("Card", {"id": 1}) == "<div>card</div>"
+            assert renderer.render_component("Card", {"id": 1}) == "<div>card</div>"
+            assert render.call_count == 1
+
+            # Different props miss the cache
+            renderer.render_component("Card", {"id": 2})
+            assert render.call_count == 2
+
+            # Touching the component keeps its entries, editing it invalidates
+            # them once the watcher reports it
+            stat = component_file.stat()
+            os.utime(component_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            renderer.render_component("Card", {"id": 1})
+            assert render.call_count == 2
+            component_file.write_text("module.exports = () => 'edited';")
+            renderer._reload_changed([component_file])
+            renderer.render_component("Card", {"id": 1})
+            assert render.call_count == 3
+
+        assert renderer.cache_stats()["hits"] == 2
+        renderer.clear_cache()
+        assert renderer.cache_stats()["entries"] == 0
+
+    def test_cache_disabled(self, tmp_path):
+        """Test that rendered HTML is not cached when caching is disabled."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("module.exports = () => null;")
+        renderer = NodeRenderer(components_dir=str(tmp_path), cache_enabled=False)
+
+        with patch.object(
+            renderer,
+            "_render_with_worker",
+            return_value={"success": True, "html": "<div>card</div>"},
+        ) as render:
+            renderer.render_component("Card")
+            renderer.render_component("Card")
+            assert render.call_count == 2
+
+
+class TestCacheBackends:
+    """Test the shared rendered HTML cache backends."""
+
+    @pytest.fixture(params=["filesystem", "sqlite"])
+    def shared(self, request, tmp_path):
+        """Two caches of separate processes sharing one store."""
+        return [
+            create_cache_backend(request.param, max_entries=3, directory=tmp_path)
+            for _ in range(2)
+        ]
+
+    def test_entries_are_shared(self, shared):
+        """Test that a render stored by one process is found by another."""
+        first, second = shared
+        first.set("Card:v1:a", "<div>card</div>")
+        assert second.get("Card:v1:a") == "<div>card</div>"
+        assert second.get("Card:v2:a") is None
+        assert second.stats()["entries"] == 1
+        assert (second.stats()["hits"], second.stats()["misses"]) == (1, 1)
+
+        second.clear()
+        assert first.get("Card:v1:a") is None
+
+    def test_ttl(self, shared):
+        """Test that entries expire after their TTL."""
+        first, second = shared
+        first.set("short", "<a/>", ttl=0.1)
+        first.set("long", "<b/>", ttl=60)
+        assert second.get("short") == "<a/>"
+        time.sleep(0.15)
+        assert second.get("short") is None
+        assert second.get("long") == "<b/>"
+
+    def test_limits(self, shared):
+        """Test that the oldest entries beyond the limits are removed."""
+        cache = shared[0]
+        for index in range(5):
+            cache.set(f"key{index}", "<p/>")
+        if isinstance(cache, FileSystemCache):
+            cache.prune()
+        assert cache.stats()["entries"] == 3
+        assert cache.get("key0") is None
+        assert cache.get("key4") == "<p/>"
+
+    def test_store_directory_is_private(self, tmp_path):
+        """Test that shared stores need a directory and create it owner-only."""
+        with pytest.raises(ValueError, match="needs a directory"):
+            create_cache_backend("filesystem")
+
+        cache = create_cache_backend("filesystem", directory=tmp_path / "cache")
+        assert (tmp_path / "cache").stat().st_mode & 0o777 == 0o700
+        with pytest.raises(TypeError):
+            CacheBackend()
+        cache.set("a", "<a/>")
+        cache.prune()
+        assert cache.get("a") == "<a/>"
+
+    def test_default_directory(self, tmp_path):
+        """Test that the extension keeps shared stores in the instance folder."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("")
+        app = Flask(__name__, instance_path=str(tmp_path / "instance"))
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_CACHE_BACKEND"] = "filesystem"
+        react = FlaskReact(app)
+        directory = tmp_path / "instance" / "flask-react-cache"
+        assert react.renderer._component_cache.directory == directory
+        assert directory.stat().st_mode & 0o777 == 0o700
+
+    def test_memory_ttl(self):
+        """Test the default TTL of the in-memory cache."""
+        cache = RenderCache(ttl=0.1)
+        cache.set("a", "<a/>")
+        assert cache.get("a") == "<a/>"
+        time.sleep(0.15)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_unknown_backend(self):
+        """Test that unknown backend names are rejected."""
+        with pytest.raises(ValueError, match="Unknown cache backend 'redis'"):
+            create_cache_backend("redis")
+
+    def test_config(self, tmp_path):
+        """Test that the extension renders through the configured backend."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("module.exports = () => null;")
+        apps = []
+        for _ in range(2):
+            app = Flask(__name__)
+            app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+            app.config["FLASK_REACT_CACHE_BACKEND"] = "sqlite"
+            app.config["FLASK_REACT_CACHE_DIR"] = str(tmp_path / "cache")
+            app.config["FLASK_REACT_CACHE_TTL"] = 60
+            apps.append(FlaskReact(app))
+        first, second = apps
+        assert isinstance(first.renderer._component_cache, SQLiteCache)
+        assert first.renderer._component_cache.ttl == 60
+
+        with patch.object(
+            first.renderer,
+            "_render_with_worker",
+            return_value={"success": True, "html": "<div>card</div>"},
+        ):
+            first.render_component("Card", {"id": 1})
+        # A process sharing the cache asks for the imports before looking up
+        with patch.object(second.renderer, "_render_with_worker") as render:
+            with patch.object(second.renderer, "_get_transport") as transport:
+                transport.return_value.request.return_value = {
+                    "success": True,
+                    "dependencies": [],
+                }
+                assert second.render_component("Card", {"id": 1}) == "<div>card</div>"
+            render.assert_not_called()
+        assert second.cache_stats()["backend"] == "sqlite"
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale renders while they are refreshed in the background."""
+
+    @pytest.fixture
+    def renderer(self, tmp_path):
+        """A caching renderer whose renders return numbered versions."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("module.exports = () => null;")
+        renderer = NodeRenderer(components_dir=str(tmp_path))
+        renderer.calls = 0
+        renderer.failing = False
+
+        def render(component_path, props, timeout=None, **kwargs):
+            renderer.calls += 1
+            if renderer.calls > 1:
+                time.sleep(0.2)
+            if renderer.failing:
+                raise RenderError("boom")
+            return {"success": True, "html": f"v{renderer.calls}"}
+
+        with patch.object(renderer, "_render_with_worker", side_effect=render):
+            yield renderer
+
+    def test_stale_render_is_refreshed_once(self, renderer):
+        """Test that stale HTML is served at once while one refresh runs."""
+        options = {"max_age": 0.3, "stale_while_revalidate": 5}
+        assert renderer.render_component("Card", **options) == "v1"
+        assert renderer.render_component("Card", **options) == "v1"
+        assert renderer.calls == 1
+
+        time.sleep(0.35)
+        start = time.monotonic()
+        assert renderer.render_component("Card", **options) == "v1"
+        assert renderer.render_component("Card", **options) == "v1"
+        assert time.monotonic() - start < 0.15
+
+        time.sleep(0.3)
+        assert renderer.calls == 2
+        assert renderer.render_component("Card", **options) == "v2"
+
+    def test_render_past_the_window_waits(self, renderer):
+        """Test that HTML older than the stale window is rendered again."""
+        options = {"max_age": 0.05, "stale_while_revalidate": 0.05}
+        assert renderer.render_component("Card", **options) == "v1"
+        time.sleep(0.15)
+        assert renderer.render_component("Card", **options) == "v2"
+
+    def test_failed_refresh_keeps_stale_render(self, renderer):
+        """Test that a failed refresh leaves the stale HTML in place."""
+        options = {"max_age": 0.1, "stale_while_revalidate": 5}
+        assert renderer.render_component("Card", **options) == "v1"
+        renderer.failing = True
+        time.sleep(0.15)
+        assert renderer.render_component("Card", **options) == "v1"
+        time.sleep(0.3)
+        # The next stale read retries the refresh
+        assert renderer.render_component("Card", **options) == "v1"
+        time.sleep(0.3)
+        assert renderer.calls == 3
+
+    def test_async(self, renderer):
+        """Test stale-while-revalidate of async renders."""
+        options = {"max_age": 0.3, "stale_while_revalidate": 5}
+
+        async def render_file(component_name, component_file, props, timeout):
+            return renderer._render_file(component_name, component_file, props)
+
+        async def render_all():
+            render = renderer.render_component_async
+            assert await render("Card", **options) == "v1"
+            await asyncio.sleep(0.35)
+            assert await render("Card", **options) == "v1"
+            assert await render("Card", **options) == "v1"
+            await asyncio.sleep(0.3)
+            assert await render("Card", **options) == "v2"
+
+        with patch.object(renderer, "_render_file_async", side_effect=render_file):
+            asyncio.run(render_all())
+        assert renderer.calls == 2
+
+    def test_extension_passes_options(self, tmp_path):
+        """Test that the extension hands the freshness options to the renderer."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        react = FlaskReact(app)
+        with patch.object(react.renderer, "render_component") as render:
+            react.render_component("Card", max_age=60, stale_while_revalidate=300)
+        assert render.call_args.kwargs["max_age"] == 60
+        assert render.call_args.kwargs["stale_while_revalidate"] == 300
+
+
+class TestStreaming:
+    """Test streaming responses."""
+
+    def test_react_response_streams_chunks(self, tmp_path):
+        """Test that react_response(stream=True) sends chunks as they arrive."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        from flask_react.extension import react_response
+
+        (tmp_path / "Page.jsx").write_text("")
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        react = FlaskReact(app)
+
+        def frames(message, timeout):
+            yield {"chunk": "<main>"}
+            yield {"chunk": "</main>"}
+            yield {"success": True, "done": True}
+
+        @app.route("/")
+        def page():
+            return react_response("Page", {"title": "Home"}, stream=True)
+
+        with patch.object(react.renderer, "_get_transport") as transport:
+            transport.return_value.stream.side_effect = frames
+            response = app.test_client().get("/")
+
+        assert response.is_streamed
+        assert response.data == b"<main></main>"
+        # The completed stream is cached for the next request
+        assert react.renderer.cache_stats()["entries"] == 1
+
+    def test_stream_errors_raise_before_response(self, tmp_path):
+        """Test that a failing shell raises from stream_component itself."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Page.jsx").write_text("")
+        renderer = NodeRenderer(components_dir=str(tmp_path))
+
+        def frames(message, timeout):
+            yield {"success": False, "done": True, "error": {"message": "boom"}}
+
+        with patch.object(renderer, "_get_transport") as transport:
+            transport.return_value.stream.side_effect = frames
+            with pytest.raises(RenderError, match="boom"):
+                renderer.stream_component("Page")
+
+
+class TestRenderMany:
+    """Test batched rendering."""
+
+    @pytest.fixture
+    def renderer(self, tmp_path):
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+        for name in ("Header", "Footer"):
+            (tmp_path / f"{name}.jsx").write_text("")
+        return NodeRenderer(components_dir=str(tmp_path))
+
+    def test_renders_in_one_round_trip(self, renderer):
+        """Test that all items are sent in a single message, in order."""
+        response = {
+            "success": True,
+            "results": [
+                {"success": True, "html": "<header></header>"},
+                {"success": True, "html": "<footer></footer>"},
+            ],
+        }
+        with patch.object(renderer, "_get_transport") as transport:
+            transport.return_value.request.return_value = response
+            html = renderer.render_many([("Header", {"title": "Hi"}), ("Footer", None)])
+
+        assert html == ["<header></header>", "<footer></footer>"]
+        transport.return_value.request.assert_called_once()
+        message = transport.return_value.request.call_args[0][0]
+        assert message["type"] == "render_many"
+        assert message["items"][0]["props"] == {"title": "Hi"}
+
+    def test_cached_items_are_not_sent(self, renderer):
+        """Test that only cache misses go to Node.js."""
+        response = {"success": True, "results": [{"success": True, "html": "<f/>"}]}
+        with patch.object(renderer, "_render_with_worker") as render:
+            render.return_value = {"success": True, "html": "<h/>"}
+            renderer.render_component("Header")
+        with patch.object(renderer, "_get_transport") as transport:
+            transport.return_value.request.return_value = response
+            html = renderer.render_many([("Header", {}), ("Footer", {})])
+
+        assert html == ["<h/>", "<f/>"]
+        message = transport.return_value.request.call_args[0][0]
+        assert len(message["items"]) == 1
+
+    def test_per_item_errors(self, renderer):
+        """Test that failures are reported per item."""
+        response = {
+            "success": True,
+            "results": [
+                {"success": False, "error": {"message": "boom"}},
+                {"success": True, "html": "<f/>"},
+            ],
+        }
+        items = [("Header", {}), ("Missing", {}), ("Footer", {})]
+        with patch.object(renderer, "_get_transport") as transport:
+            transport.return_value.request.return_value = response
+            results = renderer.render_many(items, return_exceptions=True)
+            with pytest.raises(RenderError, match="boom"):
+                renderer.render_many(items)
+
+        assert isinstance(results[0], RenderError)
+        assert isinstance(results[1], ComponentNotFoundError)
+        assert results[2] == "<f/>"
+
+
+class TestLargeProps:
+    """Regression tests for props far beyond the OS command line limit."""
+
+    @staticmethod
+    def large_props():
+        """About 5 MB of props, well past ARG_MAX and MAX_ARG_STRLEN."""
+        rows = [
+            {"id": i, "title": f"Product {i}", "description": "x" * 150}
+            for i in range(25000)
+        ]
+        return {"rows": rows}
+
+    def test_one_shot_props_travel_over_stdin(self, tmp_path, record_property):
+        """Test that one-shot renders send multi-MB props through the pipe."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        renderer = NodeRenderer(components_dir=str(tmp_path), persistent=False)
+        renderer.ssr_script_path = script
+
+        props = self.large_props()
+        start = time.perf_counter()
+        result = renderer._render_with_subprocess(str(tmp_path / "List.js"), props)
+        record_property("latency_ms", round((time.perf_counter() - start) * 1000, 1))
+
+        assert result["success"] is True
+        assert result["propsSize"] == len(json.dumps(props, separators=(",", ":")))
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a components directory where Node.js can resolve React."""
+        import shutil
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        test_components_dir = os.path.join(project_root, "test_components_temp_props")
+        os.makedirs(test_components_dir, exist_ok=True)
+
+        yield test_components_dir
+
+        if os.path.exists(test_components_dir):
+            shutil.rmtree(test_components_dir)
+
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_render_multi_megabyte_props(self, temp_dir, record_property, persistent):
+        """Test rendering a component with multi-MB props end to end."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        node_modules = os.path.join(project_root, "node_modules")
+        if not os.path.exists(os.path.join(node_modules, "react")):
+            pytest.skip("React dependencies not installed - run 'npm install' first")
+
+        with open(os.path.join(temp_dir, "List.js"), "w") as f:
+            f.write("""const React = require('react');
+module.exports = ({ rows }) => React.createElement('p', {}, rows.length + ' rows');
+""")
+        renderer = NodeRenderer(
+            components_dir=temp_dir, persistent=persistent, cache_enabled=False
+        )
+        try:
+            start = time.perf_counter()
+            html = renderer.render_component("List", self.large_props())
+            record_property(
+                "latency_ms", round((time.perf_counter() - start) * 1000, 1)
+            )
+            assert "25000 rows" in html
+        finally:
+            renderer.close()
+
+
+class TestAsyncRender:
+    """Test the asyncio render API."""
+
+    @pytest.fixture
+    def echo_script(self, tmp_path):
+        """Write the echo worker script."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        script = tmp_path / "echo_worker.js"
+        script.write_text(ECHO_WORKER_SCRIPT)
+        return script
+
+    def test_requests_are_pipelined(self, echo_script):
+        """Test that one worker serves many in-flight requests at once."""
+        pool = AsyncNodeWorkerPool(echo_script, size=1)
+        message = {"type": "render", "props": {"delay": 300}}
+
+        async def render_all():
+            return await asyncio.gather(*(pool.request(message, 10) for _ in range(10)))
+
+        try:
+            start = time.monotonic()
+            responses = asyncio.run(render_all())
+            assert time.monotonic() - start < 2
+            assert len({response["html"] for response in responses}) == 1
+
+            # A second event loop keeps using the same warm worker
+            pid = responses[0]["html"]
+            assert asyncio.run(pool.request({"type": "ping"}, 10))["html"] == pid
+        finally:
+            pool.close()
+
+    def test_timeout_replaces_worker(self, echo_script):
+        """Test that a timed out worker is killed and replaced."""
+        pool = AsyncNodeWorkerPool(echo_script, size=1)
+        try:
+            pid = asyncio.run(pool.request({"type": "ping"}, 10))["html"]
+            with pytest.raises(subprocess.TimeoutExpired):
+                asyncio.run(
+                    pool.request({"type": "render", "props": {"delay": 5000}}, 0.2)
+                )
+            assert asyncio.run(pool.request({"type": "ping"}, 10))["html"] != pid
+        finally:
+            pool.close()
+
+    def test_timeout_fails_only_its_request(self, echo_script):
+        """Test that a missed deadline leaves other in-flight renders alone."""
+        pool = AsyncNodeWorkerPool(echo_script, size=1)
+        slow = {"type": "render", "props": {"delay": 5000}}
+        fast = {"type": "render", "props": {"delay": 500}}
+
+        async def render_both():
+            return await asyncio.gather(
+                pool.request(slow, 0.2), pool.request(fast, 10), return_exceptions=True
+            )
+
+        try:
+            timed_out, response = asyncio.run(render_both())
+            assert isinstance(timed_out, subprocess.TimeoutExpired)
+            assert response["success"]
+
+            # New requests go to a fresh process, the old one is killed
+            pid = asyncio.run(pool.request({"type": "ping"}, 10))["html"]
+            assert pid != response["html"]
+            old_process, _ = pool.workers[0]._draining[0]
+            deadline = time.monotonic() + 5
+            while old_process.returncode is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert old_process.returncode is not None
+        finally:
+            pool.close()
+
+    def test_queue_stats_count_pipelined_requests(self, echo_script):
+        """Test that requests in flight beyond one per worker count as waiting."""
+        pool = AsyncNodeWorkerPool(echo_script, size=1)
+        message = {"type": "render", "props": {"delay": 500}}
+
+        async def measure():
+            await asyncio.sleep(0.3)
+            return pool.waiting, pool.longest_wait
+
+        async def render_and_measure():
+            renders = [pool.request(message, 10) for _ in range(3)]
+            return await asyncio.gather(measure(), *renders)
+
+        try:
+            (waiting, longest_wait), *_ = asyncio.run(render_and_measure())
+        finally:
+            pool.close()
+
+        assert waiting == 2
+        assert 0.2 < longest_wait < 2
+        assert (pool.waiting, pool.longest_wait) == (0, 0.0)
+
+    def test_render_component_async(self, tmp_path):
+        """Test async rendering through the extension and its cache."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+        from unittest.mock import AsyncMock
+
+        (tmp_path / "Card.jsx").write_text("")
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        react = FlaskReact(app)
+
+        with patch.object(react.renderer, "_get_async_transport") as transport:
+            transport.return_value.request = AsyncMock(
+                return_value={"success": True, "html": "<div>Card</div>"}
+            )
+            html = asyncio.run(react.render_component_async("Card", {"id": 1}))
+            again = asyncio.run(react.render_component_async("Card", {"id": 1}))
+
+        assert html == again == "<div>Card</div>"
+        transport.return_value.request.assert_awaited_once()
+
+
+class TestMetrics:
+    """Test render metrics."""
+
+    def test_percentiles_and_prometheus(self):
+        """Test latency percentiles, sizes and the Prometheus text format."""
+        metrics = RenderMetrics()
+        for ms in range(1, 101):
+            metrics.observe("Card", ms / 1000, 10)
+        metrics.observe("Card", 0.5, None)
+        metrics.observe_cache("Card", True)
+        metrics.observe_cache("Card", False)
+        metrics.observe_node(
+            "Card",
+            {
+                "requestBytes": 40,
+                "timings": {"loadMs": 1.0, "renderMs": 3.0},
+                "serializeMs": 0.5,
+            },
+        )
+
+        stats = metrics.stats()["Card"]
+        assert stats["renders"] == 101
+        assert stats["errors"] == 1
+        assert stats["cache_hit_ratio"] == 0.5
+        assert stats["latency_ms"]["p50"] == pytest.approx(51)
+        assert stats["latency_ms"]["p99"] == pytest.approx(100)
+        assert stats["html_bytes"] == {"mean": 10, "max": 10}
+        assert stats["request_bytes"] == {"mean": 40, "max": 40}
+        assert stats["node_ms"] == {"load": 1.0, "render": 3.0, "serialize": 0.5}
+
+        text = metrics.prometheus({"entries": 2, "bytes": 20})
+        assert 'flask_react_render_seconds_count{component="Card"} 101' in text
+        assert 'flask_react_render_errors_total{component="Card"} 1' in text
+        assert 'flask_react_node_seconds_total{component="Card",phase="load"}' in text
+        assert "flask_react_cache_entries 2" in text
+
+        metrics.reset()
+        assert metrics.stats() == {}
+
+    def test_component_limit(self):
+        """Test that components beyond the limit share one entry."""
+        metrics = RenderMetrics(max_components=2)
+        for name in ("Card", "List", "Page-1", "Page-2"):
+            metrics.observe(name, 0.01, 10)
+        metrics.observe("Card", 0.01, 10)
+
+        stats = metrics.stats()
+        assert sorted(stats) == ["Card", "List", OTHER_COMPONENTS]
+        assert stats["Card"]["renders"] == 2
+        assert stats[OTHER_COMPONENTS]["renders"] == 2
+
+    def test_renderer_records_renders(self, tmp_path):
+        """Test that renders, cache lookups and Node.js timings are recorded."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("")
+        renderer = NodeRenderer(components_dir=str(tmp_path))
+        assert renderer.metrics is None
+        renderer = NodeRenderer(
+            components_dir=str(tmp_path), performance_monitoring=True
+        )
+
+        result = {
+            "success": True,
+            "html": "<div>card</div>",
+            "requestBytes": 64,
+            "timings": {"loadMs": 2.0, "renderMs": 1.0},
+            "serializeMs": 0.1,
+        }
+        with patch.object(renderer, "_render_with_worker", return_value=result):
+            renderer.render_component("Card", {"id": 1})
+            renderer.render_component("Card", {"id": 1})
+        with pytest.raises(ComponentNotFoundError):
+            renderer.render_component("Missing")
+
+        stats = renderer.metrics.stats()
+        assert stats["Card"]["renders"] == 2
+        assert stats["Card"]["cache_hits"] == 1
+        assert stats["Card"]["html_bytes"]["max"] == len("<div>card</div>")
+        assert stats["Card"]["request_bytes"]["max"] == 64
+        assert stats["Card"]["node_ms"]["load"] == 2.0
+        assert stats["Missing"]["errors"] == 1
+
+    def test_stats_and_metrics_endpoint(self, tmp_path):
+        """Test FlaskReact.stats() and the Prometheus endpoint."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "Card.jsx").write_text("")
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_PERFORMANCE_MONITORING"] = True
+        app.config["FLASK_REACT_METRICS_ENDPOINT"] = "/metrics"
+        react = FlaskReact(app)
+
+        with patch.object(
+            react.renderer,
+            "_render_with_worker",
+            return_value={"success": True, "html": "<div>card</div>"},
+        ):
+            react.render_component("Card")
+
+        stats = react.stats()
+        assert stats["enabled"]
+        assert stats["components"]["Card"]["renders"] == 1
+        assert stats["cache"]["entries"] == 1
+
+        response = app.test_client().get("/metrics")
+        assert response.mimetype == "text/plain"
+        assert b'flask_react_render_seconds_count{component="Card"} 1' in response.data
+
+
+class TestSignals:
+    """Test the render signals."""
+
+    @pytest.fixture
+    def react(self, tmp_path):
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+        (tmp_path / "Card.jsx").write_text("")
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        return FlaskReact(app)
+
+    def test_render_signals(self, react):
+        """Test the payload of each signal, including cache hits and failures."""
+        sent = []
+
+        def receiver(name):
+            return lambda sender, **payload: sent.append((name, sender, payload))
+
+        result = {"success": True, "html": "<div>card</div>", "worker": 4242}
+        with ExitStack() as stack:
+            for name in ("before_render", "after_render", "render_failed"):
+                signal = getattr(signals, name)
+                stack.enter_context(signal.connected_to(receiver(name)))
+            with patch.object(
+                react.renderer, "_render_with_worker", return_value=result
+            ):
+                react.render_component("Card", {"id": 1})
+                react.render_component("Card", {"id": 1})
+            with pytest.raises(ComponentNotFoundError):
+                react.render_component("Missing")
+
+        assert [name for name, _, _ in sent] == [
+            "before_render",
+            "after_render",
+            "before_render",
+            "after_render",
+            "before_render",
+            "render_failed",
+        ]
+        assert all(sender is react.app for _, sender, _ in sent)
+        before, first, _, second = (payload for _, _, payload in sent[:4])
+        assert before == {
+            "component_name": "Card",
+            "props": {"id": 1},
+            "props_bytes": len('{"id": 1}'),
+        }
+        assert first["html"] == "<div>card</div>"
+        assert first["duration"] >= 0
+        assert (first["cached"], first["worker"]) == (False, 4242)
+        assert (second["cached"], second["worker"]) == (True, None)
+        assert isinstance(sent[-1][2]["exception"], ComponentNotFoundError)
+
+    def test_signals_on_every_render_path(self, react):
+        """Test that async, batched and streamed renders send the signals too."""
+        from unittest.mock import AsyncMock
+
+        from flask_react.node_renderer import RenderDetails
+
+        sent = []
+
+        def receiver(name):
+            return lambda sender, **payload: sent.append((name, payload))
+
+        renderer = react.renderer
+        with ExitStack() as stack:
+            for name in ("before_render", "after_render", "render_failed"):
+                signal = getattr(signals, name)
+                stack.enter_context(signal.connected_to(receiver(name)))
+            stack.enter_context(
+                patch.object(
+                    renderer,
+                    "render_component_details_async",
+                    AsyncMock(return_value=RenderDetails("<a/>", False, 7)),
+                )
+            )
+            render_many = stack.enter_context(
+                patch.object(
+                    renderer, "render_many", return_value=["<b/>", RenderError("no")]
+                )
+            )
+            stack.enter_context(
+                patch.object(
+                    renderer, "stream_component", return_value=iter(["<c>", "</c>"])
+                )
+            )
+
+            assert asyncio.run(react.render_component_async("A")) == "<a/>"
+            results = react.render_many([("B", None), ("C", {})], True)
+            assert results[0] == "<b/>"
+            assert "".join(react.stream_component("D")) == "<c></c>"
+
+        assert [(name, payload["component_name"]) for name, payload in sent] == [
+            ("before_render", "A"),
+            ("after_render", "A"),
+            ("before_render", "B"),
+            ("before_render", "C"),
+            ("after_render", "B"),
+            ("render_failed", "C"),
+            ("before_render", "D"),
+            ("after_render", "D"),
+        ]
+        assert sent[1][1]["worker"] == 7
+        assert sent[-1][1]["html"] == "<c></c>"
+        assert render_many.call_args.kwargs["return_exceptions"] is True
+
+    def test_no_receivers_skips_signals(self, react):
+        """Test that renders take the plain path when nothing is connected."""
+        assert not signals.has_receivers()
+        with patch.object(
+            react.renderer,
+            "_render_with_worker",
+            return_value={"success": True, "html": "<div>card</div>"},
+        ), patch.object(react, "_render_with_signals") as render_with_signals:
+            assert react.render_component("Card") == "<div>card</div>"
+        render_with_signals.assert_not_called()
+
+
+class TestBench:
+    """Test the benchmark suite."""
+
+    def test_example_props_scale(self):
+        """Test that every example component gets fixed props of the given size."""
+        from flask_react.bench import DEFAULT_COMPONENTS_DIR, make_props
+
+        for component_file in DEFAULT_COMPONENTS_DIR.glob("*.jsx"):
+            small = make_props(component_file.stem, 1)
+            large = make_props(component_file.stem, 100)
+            assert make_props(component_file.stem, 1) == small
+            assert len(json.dumps(large)) > len(json.dumps(small))
+
+    def test_run_benchmarks(self, tmp_path):
+        """Test the measurements reported for each component and mode."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+        from flask_react.bench import run_benchmarks
+
+        (tmp_path / "Card.jsx").write_text("")
+        with patch.object(
+            NodeRenderer,
+            "_render_with_worker",
+            return_value={"success": True, "html": "<div>card</div>"},
+        ):
+            report = run_benchmarks(
+                tmp_path, backends=["node"], sizes=[1, 5], iterations=3, concurrency=2
+            )
+
+        results = report["results"]
+        assert report["meta"]["sizes"] == [1, 5]
+        # Cold, then sequential and concurrent per size, with caching off and on
+        assert len(results) == 2 * (1 + 2 * 2)
+        assert {result["mode"] for result in results} == {
+            "cold",
+            "sequential",
+            "concurrent",
+        }
+        assert all(result["errors"] == 0 for result in results)
+        assert results[1]["iterations"] == 3
+        assert results[1]["props_bytes"] < results[3]["props_bytes"]
+        json.dumps(report)
+
+
+class TestBuild:
+    """Test ahead-of-time component compilation."""
+
+    def test_missing_components_dir(self, tmp_path):
+        """Test that building a missing directory fails clearly."""
+        with pytest.raises(ComponentCompileError, match="not found"):
+            build_components(str(tmp_path / "missing"), str(tmp_path / "out"))
+
+    def test_build_and_skip_unchanged(self, tmp_path):
+        """Test compiling components and skipping unchanged ones."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        if not os.path.exists(os.path.join(project_root, "node_modules", "@babel")):
+            pytest.skip("Babel not installed - run 'npm install' first")
+
+        components_dir = tmp_path / "components"
+        (components_dir / "cards").mkdir(parents=True)
+        (components_dir / "Hello.jsx").write_text(
+            "const React = require('react');\n"
+            "module.exports = function Hello() { return <div>Hello</div>; };\n"
+        )
+        (components_dir / "cards" / "Card.jsx").write_text(
+            "module.exports = function Card() { return <span />; };\n"
+        )
+        out_dir = tmp_path / "build"
+
+        result = build_components(str(components_dir), str(out_dir), jobs=2)
+        assert result["compiled"] == ["Hello.jsx", "cards/Card.jsx"]
+        assert result["errors"] == []
+        assert "<div>" not in (out_dir / "Hello.js").read_text()
+        assert (out_dir / "cards" / "Card.js").exists()
+
+        result = build_components(str(components_dir), str(out_dir))
+        assert result["compiled"] == []
+        assert sorted(result["skipped"]) == ["Hello.jsx", "cards/Card.jsx"]
+
+        (components_dir / "cards" / "Card.jsx").unlink()
+        result = build_components(str(components_dir), str(out_dir))
+        assert result["removed"] == ["cards/Card.jsx"]
+        assert not (out_dir / "cards" / "Card.js").exists()
+
+    def test_renderer_loads_prebuilt_components(self, tmp_path):
+        """Test that a build directory replaces runtime Babel."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "Card.jsx").write_text("")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "Card.js").write_text("")
+
+        renderer = NodeRenderer(
+            components_dir=str(tmp_path / "src"), build_dir=str(tmp_path / "build")
+        )
+        assert renderer._find_component_file("Card") == tmp_path / "build" / "Card.js"
+        assert renderer._script_args() == ["--no-babel"]
+
+
+class TestTranspileCache:
+    """Test the transpiled component cache shared by workers and deploys."""
+
+    def test_config(self, tmp_path):
+        """Test that the configured directory and size reach the workers."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(tmp_path)
+        app.config["FLASK_REACT_TRANSPILE_CACHE_DIR"] = str(tmp_path / "transpiled")
+        app.config["FLASK_REACT_TRANSPILE_CACHE_MAX_BYTES"] = 4096
+        react = FlaskReact(app)
+        assert react.renderer._script_args()[-4:] == [
+            "--transpile-cache",
+            str(tmp_path / "transpiled"),
+            "--transpile-cache-bytes",
+            "4096",
+        ]
+
+        # Prebuilt components need no Babel at all
+        renderer = NodeRenderer(
+            components_dir=str(tmp_path),
+            build_dir=str(tmp_path),
+            transpile_cache_dir=str(tmp_path / "transpiled"),
+        )
+        assert renderer._script_args() == ["--no-babel"]
+
+    def test_workers_reuse_transpiled_components(self, tmp_path):
+        """Test that a new process loads components transpiled by an earlier one."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        node_modules = os.path.join(project_root, "node_modules")
+        if not os.path.exists(os.path.join(node_modules, "react")):
+            pytest.skip("React dependencies not installed - run 'npm install' first")
+        if not os.path.exists(os.path.join(node_modules, "@babel")):
+            pytest.skip("Babel not installed - run 'npm install' first")
+
+        import shutil
+
+        # Inside the project so the component resolves React
+        components_dir = os.path.join(project_root, "test_components_temp_transpile")
+        os.makedirs(components_dir, exist_ok=True)
+        with open(os.path.join(components_dir, "Hello.jsx"), "w") as f:
+            f.write(
+                "const React = require('react');\n"
+                "module.exports = function Hello() { return <div>Hello</div>; };\n"
+            )
+        cache_dir = tmp_path / "transpiled"
+
+        def render(max_bytes):
+            renderer = NodeRenderer(
+                components_dir=components_dir,
+                persistent=False,
+                transpile_cache_dir=str(cache_dir),
+                transpile_cache_max_bytes=max_bytes,
+            )
+            return renderer.render_component("Hello")
+
+        try:
+            assert "Hello" in render(1024 * 1024)
+            entries = list(cache_dir.glob("*/*.js"))
+            assert len(entries) == 1
+            os.utime(entries[0], (1, 1))
+
+            assert "Hello" in render(1024 * 1024)
+            assert list(cache_dir.glob("*/*.js")) == entries
+            # Read entries count as used
+            assert entries[0].stat().st_mtime > 1
+
+            # An entry is transpiled again once pruned beyond the size limit
+            entries[0].unlink()
+            assert "Hello" in render(1)
+            assert list(cache_dir.glob("*/*.js")) == []
+
+            # Project Babel config is read like @babel/register and keys entries
+            assert "Hello" in render(1024 * 1024)
+            with open(os.path.join(components_dir, ".babelrc"), "w") as f:
+                f.write('{"comments": false}')
+            assert "Hello" in render(1024 * 1024)
+            assert len(list(cache_dir.glob("*/*.js"))) == 2
+        finally:
+            shutil.rmtree(components_dir)
+
+
+class TestExport:
+    """Test static page export."""
+
+    @pytest.fixture
+    def react(self, tmp_path):
+        """An extension whose app renders a page per component."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+
+        components_dir = tmp_path / "components"
+        components_dir.mkdir()
+        (components_dir / "Card.jsx").write_text("module.exports = () => null;")
+        (components_dir / "Nav.jsx").write_text("module.exports = () => null;")
+        app = Flask(__name__)
+        app.config["FLASK_REACT_COMPONENTS_DIR"] = str(components_dir)
+        react = FlaskReact(app)
+
+        @app.route("/")
+        def home():
+            return react.render_component("Card")
+
+        @app.route("/about")
+        def about():
+            return react.render_component("Nav")
+
+        @app.route("/blog/")
+        def blog():
+            return react.render_component("Card") + react.render_component("Nav")
+
+        @app.route("/posts/<int:post_id>")
+        def post(post_id):
+            return str(post_id)
+
+        def render(component_path, props, timeout=None, **kwargs):
+            name = os.path.basename(component_path).split(".")[0]
+            return {"success": True, "html": f"<p>{name}</p>"}
+
+        with patch.object(react.renderer, "_render_with_worker", side_effect=render):
+            yield react
+
+    def test_output_path(self):
+        """Test how URLs map to files."""
+        assert output_path("/") == "index.html"
+        assert output_path("/blog/") == "blog/index.html"
+        assert output_path("/about") == "about.html"
+        assert output_path("/about.html") == "about.html"
+        with pytest.raises(ValueError, match="query strings"):
+            output_path("/search?q=react")
+        with pytest.raises(ValueError, match="outside"):
+            output_path("/../etc/passwd")
+
+    def test_collect_urls(self, react):
+        """Test gathering URLs from paths, endpoints, generators and rules."""
+        app = react.app
+        assert collect_urls(app) == ["/", "/about", "/blog/"]
+
+        def posts():
+            return [url_for("post", post_id=i) for i in (1, 2)]
+
+        urls = collect_urls(app, ["/"], ["about", "home"], posts)
+        assert urls == ["/", "/about", "/posts/1", "/posts/2"]
+
+    def test_export_and_skip_unchanged(self, react, tmp_path):
+        """Test writing pages and re-exporting only those with changed components."""
+        import gzip
+
+        out_dir = tmp_path / "static"
+        urls = ["/", "/about", "/blog/", "/posts/1", "/missing"]
+        result = export_pages(react.app, urls, str(out_dir), jobs=3)
+        assert result["exported"] == ["/", "/about", "/blog/", "/posts/1"]
+        assert result["errors"] == [{"url": "/missing", "message": "HTTP 404"}]
+        assert (out_dir / "index.html").read_text() == "<p>Card</p>"
+        assert (out_dir / "blog" / "index.html").read_text() == "<p>Card</p><p>Nav</p>"
+        compressed = (out_dir / "about.html.gz").read_bytes()
+        assert gzip.decompress(compressed) == b"<p>Nav</p>"
+
+        # Pages without components are always exported again
+        result = export_pages(react.app, urls[:4], str(out_dir))
+        assert result["exported"] == ["/posts/1"]
+        assert result["skipped"] == ["/", "/about", "/blog/"]
+
+        components_dir = tmp_path / "components"
+        (components_dir / "Nav.jsx").write_text("module.exports = () => 'nav';")
+        react.renderer._reload_changed([components_dir / "Nav.jsx"])
+        result = export_pages(react.app, urls[:2], str(out_dir))
+        assert result["exported"] == ["/about"]
+        assert result["skipped"] == ["/"]
+        assert result["removed"] == ["/blog/", "/posts/1"]
+        assert not (out_dir / "blog" / "index.html").exists()
+        assert not (out_dir / "blog" / "index.html.gz").exists()
+
+        result = export_pages(react.app, urls[:2], str(out_dir), force=True)
+        assert result["exported"] == ["/", "/about"]
+
+    def test_non_html_responses_are_skipped(self, react, tmp_path):
+        """Test that JSON and text endpoints found among the rules are not written."""
+        app = react.app
+
+        @app.route("/api/items")
+        def items():
+            return {"items": []}
+
+        out_dir = tmp_path / "static"
+        assert "/api/items" in collect_urls(app)
+        result = export_pages(app, ["/", "/api/items"], str(out_dir))
+        assert result["exported"] == ["/"]
+        assert result["skipped"] == ["/api/items"]
+        assert result["errors"] == []
+        assert not (out_dir / "api" / "items.html").exists()
+
+    def test_export_without_signals(self, react, tmp_path):
+        """Test that every page is exported when render signals are unavailable."""
+        from flask_react import signals
+
+        out_dir = tmp_path / "static"
+        error = RuntimeError("Signalling support is unavailable")
+        with patch.object(signals.before_render, "connect", side_effect=error):
+            for _ in range(2):
+                result = export_pages(react.app, ["/", "/about"], str(out_dir))
+                assert result["exported"] == ["/", "/about"]
+                assert result["skipped"] == []
+        assert (out_dir / "index.html").read_text() == "<p>Card</p>"
+
+    def test_cli(self, react, tmp_path, monkeypatch):
+        """Test the export command."""
+        from flask_react import cli
+
+        monkeypatch.setattr(cli, "load_app", lambda import_name: react.app)
+        assert cli.export("app:app", str(tmp_path / "out"), ["/"], compress=False)
+        assert (tmp_path / "out" / "index.html").exists()
+        assert not (tmp_path / "out" / "index.html.gz").exists()
+        assert not cli.export("app:app", str(tmp_path / "out"), ["/missing"])
+
+
+class TestStaticRoute:
+    """Test incremental static regeneration of pages."""
+
+    def make_app(self, pages_dir):
+        """Build an app with static routes counting their renders."""
+        import threading
+
+        app = Flask(__name__)
+        app.config["FLASK_REACT_STATIC_PAGES_DIR"] = str(pages_dir)
+        react = FlaskReact(app)
+        app.renders = 0
+        # Cleared to hold renders, such as a background regeneration
+        app.gate = threading.Event()
+        app.gate.set()
+
+        @app.route("/products", methods=["GET", "POST"])
+        @react.static_route(revalidate=0.3, query_args=("a", "b"))
+        def products():
+            app.gate.wait(5)
+            app.renders += 1
+            return f"<p>v{app.renders} {sorted(request.args.items())}</p>"
+
+        @app.route("/about")
+        @react.static_route()
+        def about():
+            app.renders += 1
+            return f"<p>about v{app.renders}</p>"
+
+        @app.route("/gone")
+        @react.static_route()
+        def gone():
+            app.renders += 1
+            return "gone", 404
+
+        return app, react
+
+    @staticmethod
+    def wait_until(condition, timeout=5):
+        """Poll for background regeneration, which is slower on a loaded machine."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+    @pytest.fixture
+    def pages_dir(self, tmp_path):
+        """Directory of the stored pages."""
+        if not node_available():
+            pytest.skip("Node.js not available for testing")
+        return tmp_path / "pages"
+
+    def test_pages_are_stored_and_served(self, pages_dir):
+        """Test that a page is rendered once and then served from disk."""
+        app, react = self.make_app(pages_dir)
+        client = app.test_client()
+        first = client.get("/products?b=2&a=1").data
+        assert client.get("/products?a=1&b=2").data == first
+        assert app.renders == 1
+        assert client.get("/products").data != first
+        assert app.renders == 2
+
+        # Errors and non-GET requests always reach the view
+        client.get("/gone")
+        client.get("/gone")
+        client.post("/products")
+        assert app.renders == 5
+
+        # Pages survive a restart
+        assert client.get("/about").data == b"<p>about v6</p>"
+        restarted, _ = self.make_app(pages_dir)
+        assert restarted.test_client().get("/about").data == b"<p>about v6</p>"
+        assert restarted.renders == 0
+
+        react.clear_static_pages()
+        assert client.get("/about").data == b"<p>about v7</p>"
+
+    def test_stale_page_is_regenerated_once(self, pages_dir):
+        """Test that an old page is served while one background render runs."""
+        app, _ = self.make_app(pages_dir)
+        client = app.test_client()
+        assert client.get("/products").data == b"<p>v1 []</p>"
+
+        time.sleep(0.35)
+        app.gate.clear()
+        assert client.get("/products").data == b"<p>v1 []</p>"
+        assert client.get("/products").data == b"<p>v1 []</p>"
+        app.gate.set()
+        self.wait_until(lambda: app.renders == 2)
+        time.sleep(0.1)
+        assert app.renders == 2
+        self.wait_until(lambda: client.get("/products").data == b"<p>v2 []</p>")
+
+    def test_undeclared_args_are_not_stored(self, pages_dir):
+        """Test that arbitrary query strings reach the view without adding pages."""
+        app, _ = self.make_app(pages_dir)
+        client = app.test_client()
+        client.get("/products?x=1")
+        client.get("/products?x=1")
+        client.get("/about?a=1")
+        assert app.renders == 3
+        assert not pages_dir.exists()
+
+    def test_page_limit(self, tmp_path):
+        """Test that the least recently written pages beyond the limit are removed."""
+        from flask_react.isr import StaticPages
+
+        pages = StaticPages(tmp_path / "pages", max_pages=3)
+        pages.PRUNE_INTERVAL = 1
+        for i in range(5):
+            pages.store(f"/page/{i}", b"<p></p>")
+            os.utime(pages.file_for(f"/page/{i}"), (i, i))
+        assert [pages.age(f"/page/{i}") is not None for i in range(5)] == [
+            False,
+            False,
+            True,
+            True,
+            True,
+        ]
+
+    def test_store_failure_serves_page(self, pages_dir):
+        """Test that a page that cannot be stored is still answered."""
+        app, react = self.make_app(pages_dir)
+        error = OSError(28, "No space left on device")
+        with patch.object(react._static_pages, "store", side_effect=error):
+            response = app.test_client().get("/about")
+        assert response.status_code == 200
+        assert response.data == b"<p>about v1</p>"
+
+    def test_regeneration_keeps_host(self, pages_dir):
+        """Test that a regenerated page links to the host it was requested on."""
+        app = Flask(__name__)
+        app.config["FLASK_REACT_STATIC_PAGES_DIR"] = str(pages_dir)
+        react = FlaskReact(app)
+
+        @app.route("/home")
+        @react.static_route(revalidate=0)
+        def home():
+            return f"<a href='{url_for('home', _external=True)}'>{time.time()}</a>"
+
+        client = app.test_client()
+        first = client.get("/home", base_url="https://example.com").data
+        pages = []
+
+        def regenerated():
+            pages.append(client.get("/home", base_url="https://example.com").data)
+            return pages[-1] != first
+
+        self.wait_until(regenerated)
+        assert b"https://example.com/home" in pages[-1]
+
+
 class TestNodeJSEnvironment:
     """Test Node.js environment setup and detection."""
 